@@ -1,8 +1,9 @@
 """AI Solutions API endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, Any, Optional, Tuple
 from app.services.groq_service import groq_service
+from app.services.suggestion_cache import suggestion_cache
 from app.services.solution_service import SolutionService
 from app.database import db
 from app.utils.auth import get_current_user, get_access_token
@@ -10,10 +11,28 @@ from app.models.solution import SolutionCreate
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
+# Issue columns the solution prompt uses, plus the suggestion cache keys
+# (embedding as compact base64 vector_send() bytes, decoded by parse_vector)
+PROMPT_FIELDS = "id, error_type, error_message, stack_trace, code_snippet, language, severity, fingerprint, embedding:embedding_b64"
+
+
+async def _generate(issue: Dict[str, Any], user_id: str, refresh: bool) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Suggestion for an issue from the cache, or from Groq (then cached); also returns the cache tier hit"""
+    if not refresh:
+        cached = suggestion_cache.get(user_id, issue)
+        if cached:
+            return cached
+    
+    suggestion = await groq_service.generate_solution(issue)
+    if suggestion:
+        suggestion_cache.put(user_id, issue, suggestion)
+    return suggestion, None
+
 
 @router.post("/suggest-solution/{issue_id}", response_model=dict)
 async def suggest_solution(
     issue_id: str,
+    refresh: bool = Query(False, description="Generate a new suggestion instead of reusing a cached one"),
     current_user: dict = Depends(get_current_user),
     access_token: str = Depends(get_access_token)
 ):
@@ -22,7 +41,7 @@ async def suggest_solution(
     
     # Get issue details
     issue_result = user_db.table("issues")\
-        .select("*")\
+        .select(PROMPT_FIELDS)\
         .eq("id", issue_id)\
         .eq("user_id", current_user['id'])\
         .execute()
@@ -32,8 +51,8 @@ async def suggest_solution(
     
     issue = issue_result.data[0]
     
-    # Generate AI suggestion
-    suggestion = await groq_service.generate_solution(issue)
+    # Generate AI suggestion (or reuse one for the same or a near-identical issue)
+    suggestion, cache_hit = await _generate(issue, current_user['id'], refresh)
     
     if not suggestion:
         raise HTTPException(status_code=503, detail="AI service unavailable or no suggestion generated")
@@ -41,13 +60,15 @@ async def suggest_solution(
     return {
         "success": True,
         "suggestion": suggestion,
-        "issue_id": issue_id
+        "issue_id": issue_id,
+        "cache_hit": cache_hit
     }
 
 
 @router.post("/suggest-and-save/{issue_id}", response_model=dict)
 async def suggest_and_save_solution(
     issue_id: str,
+    refresh: bool = Query(False, description="Generate a new suggestion instead of reusing a cached one"),
     current_user: dict = Depends(get_current_user),
     access_token: str = Depends(get_access_token)
 ):
@@ -56,7 +77,7 @@ async def suggest_and_save_solution(
     
     # Get issue details
     issue_result = user_db.table("issues")\
-        .select("*")\
+        .select(PROMPT_FIELDS)\
         .eq("id", issue_id)\
         .eq("user_id", current_user['id'])\
         .execute()
@@ -66,12 +87,28 @@ async def suggest_and_save_solution(
     
     issue = issue_result.data[0]
     
-    # Generate AI suggestion
-    suggestion = await groq_service.generate_solution(issue)
+    # Generate AI suggestion (or reuse one for the same or a near-identical issue)
+    suggestion, cache_hit = await _generate(issue, current_user['id'], refresh)
     
     if not suggestion:
         raise HTTPException(status_code=503, detail="AI service unavailable")
     
+    # A cached suggestion may already be saved on this issue (e.g. a repeated click)
+    if cache_hit:
+        existing = user_db.table("solutions")\
+            .select("*")\
+            .eq("issue_id", issue_id)\
+            .eq("description", suggestion['description'])\
+            .limit(1)\
+            .execute()
+        if existing.data:
+            return {
+                "success": True,
+                "message": "AI solution already saved",
+                "solution": existing.data[0],
+                "cache_hit": cache_hit
+            }
+    
     # Save as solution
     solution_service = SolutionService(user_db)
     solution_data = SolutionCreate(
@@ -88,5 +125,6 @@ async def suggest_and_save_solution(
     return {
         "success": True,
         "message": "AI solution generated and saved",
-        "solution": solution
+        "solution": solution,
+        "cache_hit": cache_hit
     }
@@ -1,8 +1,11 @@
 """Analytics API endpoints"""
 
-from fastapi import APIRouter, Depends, Query
-from typing import Dict, Any, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, Any, List, Literal, Optional
+from datetime import datetime
+from app.models.issue import GroupDimensionEnum, StatusEnum
 from app.services.analytics_service import AnalyticsService
+from app.services.sketch_service import sketch_service
 from app.database import get_db, db
 from app.utils.auth import get_current_user, get_access_token
 from supabase import Client
@@ -22,6 +25,19 @@ async def get_dashboard_stats(
     return stats
 
 
+@router.get("/overview", response_model=Dict[str, Any])
+async def get_analytics_overview(
+    days: int = Query(7, ge=1, le=90, description="Number of days of trend data"),
+    current_user: dict = Depends(get_current_user),
+    access_token: str = Depends(get_access_token)
+):
+    """Get dashboard stats, trends and language distribution in one request"""
+    user_db = db.get_user_client(access_token)
+    service = AnalyticsService(user_db)
+    overview = await service.get_overview(current_user['id'], days)
+    return overview
+
+
 @router.get("/trends", response_model=List[Dict[str, Any]])
 async def get_error_trends(
     days: int = Query(7, ge=1, le=90, description="Number of days"),
@@ -45,3 +61,71 @@ async def get_language_distribution(
     service = AnalyticsService(user_db)
     distribution = await service.get_language_distribution(current_user['id'])
     return distribution
+
+
+@router.get("/breakdown", response_model=Dict[str, Any])
+async def get_breakdown(
+    dimension: GroupDimensionEnum = Query(..., description="Column to group by (tag counts an issue once per tag)"),
+    top: int = Query(10, ge=1, le=100, description="Values returned individually; the rest are summed into 'other'"),
+    status: Optional[List[StatusEnum]] = Query(None, description="Only count issues with this status (repeatable)"),
+    created_after: Optional[datetime] = Query(None, description="Only issues created at or after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only issues created at or before this time"),
+    current_user: dict = Depends(get_current_user),
+    access_token: str = Depends(get_access_token)
+):
+    """Get issue counts grouped by language, framework, environment, OS, error type, severity, status or tag"""
+    user_db = db.get_user_client(access_token)
+    service = AnalyticsService(user_db)
+    return await service.get_breakdown(
+        current_user['id'],
+        dimension,
+        top_n=top,
+        statuses=[s.value for s in status] if status else None,
+        created_after=created_after,
+        created_before=created_before
+    )
+
+
+@router.get("/approximate", response_model=Dict[str, Any])
+async def get_approximate_analytics(
+    days: int = Query(7, ge=1, le=90, description="Window in UTC days, including today"),
+    top: int = Query(10, ge=1, le=100, description="Top error types and fingerprints to return"),
+    current_user: dict = Depends(get_current_user),
+    access_token: str = Depends(get_access_token)
+):
+    """
+    Approximate occurrence analytics from streaming sketches
+    
+    Top error types and fingerprints come from Space-Saving summaries (each
+    true count lies in [min_count, count]); distinct fingerprint and
+    environment counts come from HyperLogLog. The response states the bounds.
+    """
+    user_db = db.get_user_client(access_token)
+    try:
+        return await sketch_service.summarize(user_db, current_user['id'], days, top)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read occurrence sketches: {e}")
+
+
+@router.get("/mttr", response_model=Dict[str, Any])
+async def get_mttr(
+    group_by: Optional[Literal["severity", "error_type"]] = Query(None, description="Also break down by severity or error type"),
+    current_user: dict = Depends(get_current_user),
+    access_token: str = Depends(get_access_token)
+):
+    """Get mean and p50/p90/p99 time to resolution of resolved issues"""
+    user_db = db.get_user_client(access_token)
+    service = AnalyticsService(user_db)
+    return await service.get_mttr(current_user['id'], group_by)
+
+
+@router.get("/events", response_model=List[Dict[str, Any]])
+async def get_issue_events(
+    limit: int = Query(50, ge=1, le=200),
+    current_user: dict = Depends(get_current_user),
+    access_token: str = Depends(get_access_token)
+):
+    """Get recent spike and regression events (issues that recur faster than usual or after being resolved)"""
+    user_db = db.get_user_client(access_token)
+    service = AnalyticsService(user_db)
+    return await service.get_issue_events(current_user['id'], limit)
@@ -4,6 +4,11 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Dict, Any
 from app.services.export_service import ExportService
+from app.services.ml_service import get_ml_service, MLService
+from app.services.lexical_service import lexical_service
+from app.services.search_cache import search_cache
+from app.services.analytics_cache import analytics_cache
+from app.services.columnar_cache import columnar_cache
 from app.database import get_db, db
 from app.utils.auth import get_current_user, get_access_token
 from supabase import Client
@@ -57,7 +62,8 @@ async def export_csv(
 async def import_json(
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user),
-    access_token: str = Depends(get_access_token)
+    access_token: str = Depends(get_access_token),
+    ml_service: MLService = Depends(get_ml_service)
 ):
     """Import issues from JSON file"""
     if not file.filename.endswith('.json'):
@@ -70,12 +76,16 @@ async def import_json(
         
         # Import
         user_db = db.get_user_client(access_token)
-        service = ExportService(user_db)
+        service = ExportService(user_db, ml_service)
         result = await service.import_from_json(current_user['id'], json_data)
+        lexical_service.invalidate(current_user['id'])
+        columnar_cache.invalidate(current_user['id'])
+        search_cache.bump(current_user['id'])
+        analytics_cache.invalidate(current_user['id'])
         
         return {
             "success": True,
-            "message": f"Imported {result['imported']} issues, skipped {result['skipped']}",
+            "message": f"Imported {result['imported']} issues, merged {result['merged']} duplicates, skipped {result['skipped']}",
             **result
         }
         
@@ -1,10 +1,22 @@
 """Issues API endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import List, Optional
-from app.models.issue import IssueCreate, IssueUpdate, IssueResponse
-from app.services.issue_service import IssueService
+from datetime import datetime
+from app.models.issue import (
+    IssueCreate, IssueUpdate, IssueResponse, IssueSearchFilters,
+    SearchModeEnum, SearchScopeEnum, SeverityEnum, StatusEnum
+)
+from app.services.issue_service import IssueService, issue_select
 from app.services.ml_service import get_ml_service, MLService
+from app.services.lexical_service import lexical_service
+from app.services.search_cache import search_cache
+from app.services.analytics_cache import analytics_cache
+from app.services.columnar_cache import columnar_cache
+from app.utils.fingerprint import compute_fingerprint
+from app.utils.stacktrace import frame_columns
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.vectors import to_pgvector
 from app.database import get_db, db
 from app.utils.auth import get_current_user, get_access_token
 from supabase import Client
@@ -12,6 +24,20 @@ from supabase import Client
 router = APIRouter(prefix="/issues", tags=["issues"])
 
 
+def _parse_fields(fields: Optional[str], required: tuple = ()) -> Optional[List[str]]:
+    """Validate a comma-separated sparse fieldset"""
+    if not fields:
+        return None
+    
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    names += [f for f in required if f not in names]
+    try:
+        issue_select(names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return names
+
+
 @router.post("", response_model=dict, status_code=201)
 async def create_issue(
     issue_data: IssueCreate,
@@ -32,28 +58,101 @@ async def search_issues(
     q: str = Query(..., description="Search query"),
     threshold: float = Query(0.7, ge=0, le=1, description="Similarity threshold"),
     limit: int = Query(10, ge=1, le=50, description="Max results"),
+    mode: SearchModeEnum = Query(SearchModeEnum.auto, description="semantic, lexical, fulltext, hybrid, or auto (lexical for identifier-like queries)"),
+    language: Optional[List[str]] = Query(None, description="Filter by language (repeatable)"),
+    severity: Optional[List[SeverityEnum]] = Query(None, description="Filter by severity (repeatable)"),
+    status: Optional[List[StatusEnum]] = Query(None, description="Filter by status (repeatable)"),
+    tags: Optional[List[str]] = Query(None, description="Filter by any of these tags (repeatable)"),
+    created_after: Optional[datetime] = Query(None, description="Only issues created at or after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only issues created at or before this time"),
+    ef_search: Optional[int] = Query(None, ge=10, le=1000, description="Vector index candidate list size: higher = better recall, slower"),
+    scope: SearchScopeEnum = Query(SearchScopeEnum.user, description="user: own issues; team: also issues shared with your teams"),
     current_user: dict = Depends(get_current_user),
     access_token: str = Depends(get_access_token),
     ml_service: MLService = Depends(get_ml_service)
 ):
-    """Search issues using semantic similarity"""
+    """Search issues using semantic similarity, keyword matching, or both"""
+    filters = IssueSearchFilters(
+        languages=language,
+        severities=severity,
+        statuses=status,
+        tags=tags,
+        created_after=created_after,
+        created_before=created_before
+    )
+    
     user_db = db.get_user_client(access_token)
     service = IssueService(user_db, ml_service)
-    results = await service.search_issues(q, current_user['id'], threshold, limit)
+    results = await service.search_issues(q, current_user['id'], threshold, limit, mode, filters, ef_search, scope)
     return results
 
 
+@router.get("/frames", response_model=List[dict])
+async def find_issues_by_frame(
+    signature: Optional[str] = Query(None, description="Frame signature, e.g. app.services.user:get_user"),
+    file: Optional[str] = Query(None, description="Source file name, e.g. user.py"),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: dict = Depends(get_current_user),
+    access_token: str = Depends(get_access_token),
+    ml_service: MLService = Depends(get_ml_service)
+):
+    """Find issues whose stack trace passes through a function or file"""
+    if not signature and not file:
+        raise HTTPException(status_code=400, detail="Provide a frame signature or a file")
+    
+    user_db = db.get_user_client(access_token)
+    service = IssueService(user_db, ml_service)
+    return await service.find_issues_by_frame(
+        current_user['id'],
+        signature=signature,
+        file=file,
+        limit=limit,
+        offset=offset
+    )
+
+
+@router.post("/frames/rebuild")
+async def rebuild_frame_index(
+    current_user: dict = Depends(get_current_user),
+    access_token: str = Depends(get_access_token),
+    ml_service: MLService = Depends(get_ml_service)
+):
+    """Re-parse stored stack traces into the frame index (no embedding regeneration)"""
+    user_db = db.get_user_client(access_token)
+    service = IssueService(user_db, ml_service)
+    result = await service.rebuild_frame_index(current_user['id'])
+    return {"success": True, **result}
+
+
 @router.get("", response_model=List[dict])
 async def list_issues(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status"),
     severity: Optional[str] = Query(None, description="Filter by severity"),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Rows to skip; prefer cursor for deep pages"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (id and created_at are always included)"),
     current_user: dict = Depends(get_current_user),
     access_token: str = Depends(get_access_token),
     ml_service: MLService = Depends(get_ml_service)
 ):
-    """List all issues for current user"""
+    """
+    List all issues for current user, newest first
+    
+    When more issues may follow, the X-Next-Cursor response header holds the
+    cursor for the next page. stack_trace and code_snippet are truncated
+    previews; fetch a single issue for the full text.
+    """
+    field_list = _parse_fields(fields, required=("id", "created_at"))
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
     user_db = db.get_user_client(access_token)
     service = IssueService(user_db, ml_service)
     issues = await service.list_issues(
@@ -61,14 +160,21 @@ async def list_issues(
         status=status,
         severity=severity,
         limit=limit,
-        offset=offset
+        offset=offset,
+        after=after,
+        fields=field_list
     )
+    
+    if len(issues) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(issues[-1])
+    
     return issues
 
 
 @router.get("/{issue_id}", response_model=dict)
 async def get_issue(
     issue_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
     current_user: dict = Depends(get_current_user),
     access_token: str = Depends(get_access_token),
     ml_service: MLService = Depends(get_ml_service)
@@ -76,7 +182,7 @@ async def get_issue(
     """Get issue by ID"""
     user_db = db.get_user_client(access_token)
     service = IssueService(user_db, ml_service)
-    issue = await service.get_issue(issue_id, current_user['id'])
+    issue = await service.get_issue(issue_id, current_user['id'], _parse_fields(fields))
     
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
@@ -121,6 +227,21 @@ async def delete_issue(
     return None
 
 # Batch Operations  
+@router.post("/batch/create", response_model=dict, status_code=201)
+async def batch_create_issues(
+    issues_data: List[IssueCreate],
+    current_user: dict = Depends(get_current_user),
+    access_token: str = Depends(get_access_token),
+    ml_service: MLService = Depends(get_ml_service)
+):
+    """Bulk ingest issues, merging near-identical items within the batch"""
+    if len(issues_data) > 1000:
+        raise HTTPException(status_code=400, detail="Maximum 1000 issues per batch")
+    
+    user_db = db.get_user_client(access_token)
+    service = IssueService(user_db, ml_service)
+    return await service.create_issues_batch(issues_data, current_user['id'])
+
 @router.post("/batch/update")
 async def batch_update_issues(
     issue_ids: List[str],
@@ -130,12 +251,27 @@ async def batch_update_issues(
 ):
     """Bulk update multiple issues"""
     user_db = db.get_user_client(access_token)
+    status = update_data.get('status')
+    if status and status != 'resolved':
+        # Reopened issues are timed again when next resolved
+        update_data = {**update_data, "resolved_at": None}
     updated_count = 0
     for issue_id in issue_ids:
         try:
             result = user_db.table("issues").update(update_data).eq("id", issue_id).eq("user_id", current_user['id']).execute()
-            if result.data: updated_count += 1
+            if result.data:
+                updated_count += 1
+                columnar_cache.upsert(current_user['id'], result.data[0])
         except: pass
+    if status == 'resolved' and updated_count:
+        # Stamp resolved_at and add the newly resolved issues to the MTTR stats
+        try:
+            user_db.rpc("record_resolution", {"issue_ids": issue_ids}).execute()
+        except Exception:
+            pass
+    lexical_service.invalidate(current_user['id'])
+    search_cache.bump(current_user['id'])
+    analytics_cache.invalidate(current_user['id'])
     return {"success": True, "updated": updated_count, "total": len(issue_ids)}
 
 @router.post("/batch/delete")
@@ -150,8 +286,13 @@ async def batch_delete_issues(
     for issue_id in issue_ids:
         try:
             result = user_db.table("issues").delete().eq("id", issue_id).eq("user_id", current_user['id']).execute()
-            if result.data: deleted_count += 1
+            if result.data:
+                deleted_count += 1
+                columnar_cache.remove(current_user['id'], issue_id)
         except: pass
+    lexical_service.invalidate(current_user['id'])
+    search_cache.bump(current_user['id'])
+    analytics_cache.invalidate(current_user['id'])
     return {"success": True, "deleted": deleted_count, "total": len(issue_ids)}
 
 
@@ -161,31 +302,37 @@ async def regenerate_embeddings(
     access_token: str = Depends(get_access_token),
     ml_service: MLService = Depends(get_ml_service)
 ):
-    """Regenerate embeddings for all user's issues (fixes search for old issues)"""
+    """Regenerate embeddings, fingerprints and stack frames for all user's issues (fixes search for old issues)"""
     user_db = db.get_user_client(access_token)
     
-    # Get all issues
-    result = user_db.table("issues").select("*").eq("user_id", current_user['id']).execute()
+    # Get all issues (only the columns embedding text, fingerprint and frames are derived from)
+    result = user_db.table("issues")\
+        .select("id, error_type, error_message, stack_trace, language, framework, tags")\
+        .eq("user_id", current_user['id'])\
+        .execute()
     
     if not result.data:
         return {"success": True, "updated": 0, "message": "No issues found"}
     
+    # Embed every issue in one batched encode call
+    embedding_texts = [ml_service.create_embedding_text(issue) for issue in result.data]
+    embeddings = ml_service.generate_embeddings(embedding_texts)
+    
     updated_count = 0
-    for issue in result.data:
+    for issue, embedding_text, embedding in zip(result.data, embedding_texts, embeddings):
         try:
-            # Generate embedding text and embedding
-            embedding_text = ml_service.create_embedding_text(issue)
-            embedding = ml_service.generate_embedding(embedding_text)
-            
             # Update issue with new embedding
             user_db.table("issues").update({
-                "embedding": embedding,
-                "embedding_text": embedding_text
+                "embedding": to_pgvector(embedding),
+                "embedding_text": embedding_text,
+                "fingerprint": compute_fingerprint(issue),
+                **frame_columns(issue)
             }).eq("id", issue['id']).execute()
             
             updated_count += 1
         except Exception as e:
             pass  # Skip failed issues
     
+    search_cache.bump(current_user['id'])
     return {"success": True, "updated": updated_count, "total": len(result.data)}
 
@@ -12,11 +12,63 @@ class Settings(BaseSettings):
     supabase_anon_key: str
     supabase_service_key: str
     
+    # Direct Postgres access for hot paths (asyncpg pool, RLS via request.jwt.claims)
+    database_url: str | None = None
+    direct_db_enabled: bool = False
+    direct_db_pool_min_size: int = 1
+    direct_db_pool_max_size: int = 10
+    
     # ML Configuration
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     embedding_cache_dir: str = "./model_cache"
     embedding_dimension: int = 384  # MiniLM-L6-v2 dimension
     
+    # Vector search: default hnsw.ef_search per query (None = database default)
+    vector_ef_search: int | None = None
+    
+    # Circuit breaker around match_issues: failures before opening, cool-down in seconds
+    circuit_breaker_failure_threshold: int = 3
+    circuit_breaker_reset_seconds: float = 30.0
+    
+    # Team membership cache for team-scoped search
+    team_cache_ttl_seconds: int = 300
+    
+    # Search result cache (per user, dropped on the user's next issue write)
+    search_cache_max_entries: int = 1000
+    search_cache_ttl_seconds: int = 60
+    
+    # Analytics cache: fresh for ttl, then served stale while one refresh runs
+    analytics_cache_ttl_seconds: float = 30
+    analytics_cache_max_stale_seconds: float = 600
+    
+    # Streaming occurrence sketches (approximate analytics)
+    sketch_top_k: int = 100
+    sketch_hll_precision: int = 12
+    sketch_flush_seconds: float = 60
+    
+    # Spike detection per issue: short/long rate half-lives, trigger ratio,
+    # minimum recent occurrences, tracked issues and idle eviction
+    spike_short_half_life_seconds: float = 300
+    spike_long_half_life_seconds: float = 86400
+    spike_factor: float = 5.0
+    spike_min_events: int = 5
+    spike_max_issues: int = 100000
+    spike_idle_seconds: float = 604800
+    
+    # Columnar analytics snapshots (per-user NumPy columns, LRU under a memory budget)
+    columnar_cache_enabled: bool = False
+    columnar_cache_max_mb: int = 256
+    
+    # AI suggestion cache: exact by fingerprint, semantic above the similarity threshold
+    suggestion_cache_ttl_seconds: float = 86400
+    suggestion_cache_similarity_threshold: float = 0.95
+    suggestion_cache_max_entries_per_user: int = 200
+    suggestion_cache_max_users: int = 1000
+    
+    # Lexical search (in-process BM25 indexes)
+    lexical_index_max_users: int = 100
+    lexical_index_ttl_seconds: int = 300
+    
     # LLM Configuration
     gemini_api_key: str | None = None
     groq_api_key: str | None = None
@@ -1,7 +1,16 @@
 """Supabase database client setup"""
 
 from supabase import create_client, Client
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List
+from uuid import UUID
+import asyncio
+import asyncpg
+import json
 from app.config import settings
+from app.utils.vectors import encode_vector, decode_vector_bytes, parse_vector
 import logging
 
 logger = logging.getLogger(__name__)
@@ -67,3 +76,109 @@ def get_db() -> Client:
 def get_admin_db() -> Client:
     """Dependency for getting admin database client"""
     return db.admin_client
+
+
+class DirectDatabase:
+    """
+    Optional direct Postgres access for hot query paths (asyncpg pool)
+    
+    Skips the PostgREST HTTP hop and per-request client construction. Every
+    query runs in a transaction as the "authenticated" role with the caller's
+    JWT claims set locally, so RLS policies apply exactly as through PostgREST.
+    asyncpg prepares each statement once per connection and reuses it; point
+    DATABASE_URL at the direct or session-pooler port (not a transaction pooler,
+    which cannot keep prepared statements).
+    """
+    
+    def __init__(self, dsn: str | None, min_size: int = 1, max_size: int = 10):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool: asyncpg.Pool | None = None
+        self._lock = asyncio.Lock()
+    
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection):
+        """Register codecs: jsonb as Python objects, pgvector in its binary wire format"""
+        await conn.set_type_codec("jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+        await conn.set_type_codec(
+            "vector",
+            encoder=lambda value: encode_vector(parse_vector(value)),
+            decoder=decode_vector_bytes,
+            schema="public",
+            format="binary"
+        )
+    
+    async def pool(self) -> asyncpg.Pool:
+        """Get or create the connection pool"""
+        if self._pool is None:
+            async with self._lock:
+                if self._pool is None:
+                    try:
+                        self._pool = await asyncpg.create_pool(
+                            self.dsn,
+                            min_size=self.min_size,
+                            max_size=self.max_size,
+                            init=self._init_connection
+                        )
+                        logger.info(f"✅ Direct Postgres pool initialized ({self.min_size}-{self.max_size} connections)")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to initialize direct Postgres pool: {e}")
+                        raise
+        return self._pool
+    
+    @asynccontextmanager
+    async def user_connection(self, user_id: str):
+        """
+        Connection scoped to one user's RLS context for the duration of a transaction
+        
+        Args:
+            user_id: Authenticated user ID (from the verified JWT)
+        """
+        pool = await self.pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                # Same as SET LOCAL, but parameterized
+                await conn.execute(
+                    "SELECT set_config('request.jwt.claims', $1, true), set_config('role', 'authenticated', true)",
+                    json.dumps({"sub": user_id, "role": "authenticated"})
+                )
+                yield conn
+    
+    async def fetch(self, user_id: str, query: str, *args) -> List[Dict[str, Any]]:
+        """Run a query as the user and return rows as JSON-style dicts (like PostgREST)"""
+        async with self.user_connection(user_id) as conn:
+            rows = await conn.fetch(query, *args)
+        return [{key: _json_value(value) for key, value in row.items()} for row in rows]
+    
+    async def close(self):
+        """Close the pool (application shutdown)"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+def _json_value(value: Any) -> Any:
+    """Convert asyncpg values to the types PostgREST would return"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+# Global direct database instance (used only when DIRECT_DB_ENABLED is set)
+direct_db = DirectDatabase(
+    settings.database_url,
+    min_size=settings.direct_db_pool_min_size,
+    max_size=settings.direct_db_pool_max_size
+)
+
+
+def get_direct_db() -> DirectDatabase | None:
+    """Direct database when enabled by configuration, else None (use PostgREST)"""
+    if settings.direct_db_enabled and settings.database_url:
+        return direct_db
+    return None
@@ -93,6 +93,27 @@ async def health():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics: circuit breaker states and transitions, cache hit rates, spike detection"""
+    from app.utils.circuit_breaker import breakers
+    from app.services.search_cache import search_cache
+    from app.services.analytics_cache import analytics_cache
+    from app.services.columnar_cache import columnar_cache
+    from app.services.suggestion_cache import suggestion_cache
+    from app.services.spike_detector import spike_detector
+    return {
+        "circuit_breakers": {name: breaker.snapshot() for name, breaker in breakers.items()},
+        "caches": {
+            "search": search_cache.snapshot(),
+            "analytics": analytics_cache.snapshot(),
+            "columnar": columnar_cache.snapshot(),
+            "ai_suggestions": suggestion_cache.snapshot()
+        },
+        "spike_detector": spike_detector.snapshot()
+    }
+
+
 @app.on_event("startup")
 async def startup():
     """Startup event handler"""
@@ -107,6 +128,11 @@ async def startup():
     else:
         logger.warning("⚠️  Groq API key not found - AI suggestions disabled")
     
+    from app.services.sketch_service import sketch_service
+    from app.services.spike_detector import spike_detector
+    sketch_service.start()
+    spike_detector.start()
+    
     logger.info("✅ Startup complete")
 
 
@@ -114,6 +140,14 @@ async def startup():
 async def shutdown():
     """Shutdown event handler"""
     logger.info("👋 IssueSense API shutting down...")
+    
+    from app.services.sketch_service import sketch_service
+    from app.services.spike_detector import spike_detector
+    await sketch_service.stop()
+    await spike_detector.stop()
+    
+    from app.database import direct_db
+    await direct_db.close()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 """Pydantic models for IssueSense"""
 
-from .issue import IssueCreate, IssueUpdate, IssueResponse, IssueSearch
+from .issue import IssueCreate, IssueUpdate, IssueResponse, IssueSearch, IssueSearchFilters, SearchModeEnum, SearchScopeEnum, GroupDimensionEnum
 from .solution import SolutionCreate, SolutionUpdate, SolutionResponse, SolutionFeedback
 from .comment import CommentCreate, CommentUpdate, CommentResponse
 
@@ -9,6 +9,10 @@ __all__ = [
     "IssueUpdate",
     "IssueResponse",
     "IssueSearch",
+    "IssueSearchFilters",
+    "SearchModeEnum",
+    "SearchScopeEnum",
+    "GroupDimensionEnum",
     "SolutionCreate",
     "SolutionUpdate",
     "SolutionResponse",
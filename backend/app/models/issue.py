@@ -21,6 +21,33 @@ class StatusEnum(str, Enum):
     recurring = "recurring"
 
 
+class SearchModeEnum(str, Enum):
+    """Search ranking mode"""
+    auto = "auto"
+    semantic = "semantic"
+    lexical = "lexical"
+    hybrid = "hybrid"
+    fulltext = "fulltext"
+
+
+class SearchScopeEnum(str, Enum):
+    """Which issues a search covers"""
+    user = "user"
+    team = "team"
+
+
+class GroupDimensionEnum(str, Enum):
+    """Issue columns analytics breakdowns can group by"""
+    language = "language"
+    framework = "framework"
+    environment = "environment"
+    os = "os"
+    error_type = "error_type"
+    severity = "severity"
+    status = "status"
+    tag = "tag"
+
+
 class IssueCreate(BaseModel):
     """Schema for creating a new issue"""
     error_type: str = Field(..., max_length=100, description="Type of error (e.g., TypeError)")
@@ -97,7 +124,31 @@ class IssueResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class IssueSearchFilters(BaseModel):
+    """Filters applied inside the search query (any-of within a field, all fields combined)"""
+    languages: Optional[List[str]] = None
+    severities: Optional[List[SeverityEnum]] = None
+    statuses: Optional[List[StatusEnum]] = None
+    tags: Optional[List[str]] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    
+    @field_validator('tags')
+    @classmethod
+    def validate_tags(cls, v):
+        """Normalize tags the same way IssueCreate stores them"""
+        if v is None:
+            return v
+        return [tag.lower().strip() for tag in v if tag.strip()] or None
+    
+    def is_empty(self) -> bool:
+        """True when no filter is set"""
+        return not any(self.model_dump().values())
+
+
 class IssueSearch(BaseModel):
     """Schema for search results with similarity"""
     issue: IssueResponse
-    similarity: float = Field(..., ge=0, le=1, description="Similarity score (0-1)")
+    similarity: Optional[float] = Field(None, ge=0, le=1, description="Cosine similarity (0-1); None for keyword-only matches")
+    score: Optional[float] = Field(None, description="Ranking score of keyword (BM25 / full-text) and hybrid matches")
+    match: Optional[str] = Field(None, description="semantic, lexical, fulltext or hybrid")
@@ -0,0 +1,125 @@
+"""Stale-while-revalidate cache for per-user analytics results"""
+
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from collections import OrderedDict
+import asyncio
+import logging
+import time
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsCache:
+    """
+    Caches analytics results per user and computes each one at most once at a time
+
+    fresh (younger than ttl_seconds): served from memory.
+    stale (older, but younger than max_stale_seconds): served from memory while
+        a single background task recomputes it.
+    missing, too old, or invalidated by a write: computed before returning;
+        concurrent callers for the same result share one computation (singleflight).
+
+    Writes bump a per-user version instead of deleting entries, so a computation
+    that started before a write cannot store its (pre-write) result as current.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_stale_seconds: float = 600, max_entries: int = 5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "errors": 0, "evictions": 0}
+
+    async def get(self, user_id: str, name: str, params: Tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a cached result, computing it if needed
+
+        Args:
+            user_id: Owner of the result (invalidation scope)
+            name: Result name, e.g. "dashboard"
+            params: Hashable arguments that change the result
+            compute: Coroutine factory producing the result; must raise on failure
+                so errors are never cached
+
+        Returns:
+            The (possibly stale) result
+        """
+        key = (user_id, name) + tuple(params)
+        version = self._versions.get(user_id, 0)
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[0] == version:
+            age = time.monotonic() - entry[1]
+            if age < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[2]
+            if age < self.max_stale_seconds:
+                self._entries.move_to_end(key)
+                self.stats["stale_hits"] += 1
+                if (key, version) not in self._inflight:
+                    self.stats["refreshes"] += 1
+                    self._start(key, version, compute).add_done_callback(self._log_refresh_error)
+                return entry[2]
+
+        task = self._inflight.get((key, version))
+        if task is None:
+            self.stats["misses"] += 1
+            task = self._start(key, version, compute)
+        else:
+            self.stats["coalesced"] += 1
+        # Shielded so a cancelled request does not cancel the computation other callers share
+        return await asyncio.shield(task)
+
+    def _start(self, key: Tuple, version: int, compute: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Run compute once for (key, version) and store its result if no write happened meanwhile"""
+        async def run():
+            try:
+                value = await compute()
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            finally:
+                self._inflight.pop((key, version), None)
+
+            if self._versions.get(key[0], 0) == version:
+                self._entries[key] = (version, time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+            return value
+
+        task = asyncio.create_task(run())
+        self._inflight[(key, version)] = task
+        return task
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task):
+        """Background refreshes have no caller; log failures (the stale entry stays)"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ Analytics refresh failed: {task.exception()}")
+
+    def invalidate(self, user_id: str):
+        """Drop a user's cached results from use (call after issue or solution writes)"""
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Size, counters and hit rate for metrics"""
+        lookups = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"] + self.stats["coalesced"]
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            **self.stats,
+            "hit_rate": round((self.stats["hits"] + self.stats["stale_hits"]) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global analytics cache instance
+analytics_cache = AnalyticsCache(
+    ttl_seconds=settings.analytics_cache_ttl_seconds,
+    max_stale_seconds=settings.analytics_cache_max_stale_seconds
+)
@@ -1,80 +1,154 @@
 """Analytics service for dashboard stats and insights"""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from collections import Counter
 from supabase import Client
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from app.database import DirectDatabase, get_direct_db
+from app.models.issue import GroupDimensionEnum
+from app.services.analytics_cache import analytics_cache
+from app.services.columnar_cache import CATEGORICAL_COLUMNS, ColumnarSnapshot, columnar_cache
 
 logger = logging.getLogger(__name__)
 
+# Dashboard counters aggregated in the database (direct connection only)
+_DASHBOARD_COUNTS_SQL = """
+SELECT count(*) AS total,
+    count(*) FILTER (WHERE status = 'open') AS open,
+    count(*) FILTER (WHERE status = 'resolved') AS resolved,
+    count(*) FILTER (WHERE status = 'recurring') AS recurring,
+    count(*) FILTER (WHERE severity = 'critical') AS critical,
+    count(*) FILTER (WHERE severity = 'high') AS high,
+    count(*) FILTER (WHERE severity = 'medium') AS medium,
+    count(*) FILTER (WHERE severity = 'low') AS low,
+    (
+        SELECT count(*)
+        FROM solutions s
+            JOIN issues si ON si.id = s.issue_id
+        WHERE si.user_id = $1
+    ) AS solutions
+FROM issues
+WHERE user_id = $1
+"""
+# Every overview breakdown in one scan of the user's issues (direct connection only).
+# grouping_set tells the sets apart: GROUPING() sets a bit for each column not grouped.
+# created_at is naive UTC, so its date is the UTC day whatever the session time zone.
+_OVERVIEW_SQL = """
+SELECT status, severity, error_type, lang, day, count(*) AS count,
+    GROUPING(status, severity, error_type, lang, day) AS grouping_set,
+    (
+        SELECT count(*)
+        FROM solutions s
+            JOIN issues si ON si.id = s.issue_id
+        WHERE si.user_id = $1
+    ) AS solutions
+FROM (
+    SELECT status, severity, error_type,
+        coalesce(language, 'Unknown') AS lang,
+        CASE WHEN created_at >= $2 THEN created_at::date END AS day
+    FROM issues
+    WHERE user_id = $1
+) i
+GROUP BY GROUPING SETS ((status, severity), (error_type), (lang), (day, status))
+"""
+_SOLUTION_COUNT_SQL = """
+SELECT count(*) AS count
+FROM solutions s
+    JOIN issues i ON i.id = s.issue_id
+WHERE i.user_id = $1
+"""
+_SET_STATUS_SEVERITY = 0b00111
+_SET_ERROR_TYPE = 0b11011
+_SET_LANGUAGE = 0b11101
+_SET_DAY_STATUS = 0b01110
+# resolution_stats.histogram: bucket i counts resolutions taking [2^i, 2^(i+1)) seconds
+# (bucket 0 also holds anything under a second, the last one anything longer)
+MTTR_BUCKETS = 32
+MTTR_PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Aware datetimes as naive UTC (issues.created_at has no time zone)"""
+    if value is not None and value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _histogram_quantile(histogram: List[int], q: float) -> Optional[float]:
+    """Quantile (seconds) of a log2 resolution histogram, interpolated within its bucket"""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(histogram):
+        if count and seen + count >= rank:
+            low = 0.0 if i == 0 else float(2 ** i)
+            return low + (2 ** (i + 1) - low) * (rank - seen) / count
+        seen += count
+    return float(2 ** len(histogram))
+
+
+def _resolution_summary(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge resolution_stats rows into a count, mean and percentiles (hours)"""
+    histogram = [0] * MTTR_BUCKETS
+    resolved = 0
+    total_seconds = 0.0
+    for row in rows:
+        resolved += row['resolved_count']
+        total_seconds += row['total_seconds']
+        for i, count in enumerate(row['histogram'][:MTTR_BUCKETS]):
+            histogram[i] += count
+    
+    def hours(seconds: Optional[float]) -> Optional[float]:
+        return round(seconds / 3600, 2) if seconds is not None else None
+    
+    return {
+        "resolved": resolved,
+        "mean_hours": hours(total_seconds / resolved) if resolved else None,
+        **{f"p{round(q * 100)}_hours": hours(_histogram_quantile(histogram, q)) for q in MTTR_PERCENTILES}
+    }
+
 
 class AnalyticsService:
-    """Service for analytics and insights"""
+    """
+    Service for analytics and insights
     
-    def __init__(self, db: Client):
+    Results are cached per user (stale-while-revalidate, see AnalyticsCache);
+    issue and solution writes invalidate the writer's cached results. With
+    the columnar cache enabled, issue aggregates are computed in memory from
+    the user's snapshot instead of in the database.
+    """
+    
+    def __init__(self, db: Client, direct: Optional[DirectDatabase] = None):
         self.db = db
+        self.direct = direct or get_direct_db()
+    
+    async def _snapshot(self, user_id: str) -> Optional[ColumnarSnapshot]:
+        """The user's columnar snapshot, or None to aggregate in the database"""
+        try:
+            return await columnar_cache.get(self.db, user_id, self.direct)
+        except Exception as e:
+            logger.warning(f"⚠️ Columnar snapshot unavailable, aggregating in the database: {e}")
+            return None
+    
+    async def _solution_count(self, user_id: str) -> int:
+        """Number of solutions on the user's issues"""
+        if self.direct:
+            return (await self.direct.fetch(user_id, _SOLUTION_COUNT_SQL, user_id))[0]['count']
+        
+        result = self.db.table("solutions")\
+            .select("id, issues!inner(user_id)", count="exact")\
+            .eq("issues.user_id", user_id)\
+            .limit(1)\
+            .execute()
+        return result.count or 0
     
     async def get_dashboard_stats(self, user_id: str) -> Dict[str, Any]:
         """Get overview statistics for dashboard"""
         try:
-            # Get all issues for user
-            issues_result = self.db.table("issues")\
-                .select("*")\
-                .eq("user_id", user_id)\
-                .execute()
-            
-            issues = issues_result.data
-            total_issues = len(issues)
-            
-            # Count by status
-            resolved_issues = sum(1 for i in issues if i.get('status') == 'resolved')
-            open_issues = sum(1 for i in issues if i.get('status') == 'open')
-            recurring_issues = sum(1 for i in issues if i.get('status') == 'recurring')
-            
-            # Resolution rate
-            resolution_rate = resolved_issues / total_issues if total_issues > 0 else 0.0
-            
-            # Count by severity
-            severity_counts = {
-                'critical': sum(1 for i in issues if i.get('severity') == 'critical'),
-                'high': sum(1 for i in issues if i.get('severity') == 'high'),
-                'medium': sum(1 for i in issues if i.get('severity') == 'medium'),
-                'low': sum(1 for i in issues if i.get('severity') == 'low')
-            }
-            
-            # Top error types
-            error_type_counts = {}
-            for issue in issues:
-                error_type = issue.get('error_type', 'Unknown')
-                error_type_counts[error_type] = error_type_counts.get(error_type, 0) + 1
-            
-            top_error_types = sorted(
-                [{'type': k, 'count': v} for k, v in error_type_counts.items()],
-                key=lambda x: x['count'],
-                reverse=True
-            )[:10]
-            
-            # Total solutions
-            solutions_result = self.db.table("solutions")\
-                .select("id, issue_id")\
-                .execute()
-            
-            # Filter solutions for user's issues
-            user_issue_ids = {i['id'] for i in issues}
-            user_solutions = [s for s in solutions_result.data if s['issue_id'] in user_issue_ids]
-            total_solutions = len(user_solutions)
-            
-            return {
-                "total_issues": total_issues,
-                "open_issues": open_issues,
-                "resolved_issues": resolved_issues,
-                "recurring_issues": recurring_issues,
-                "resolution_rate": round(resolution_rate, 2),
-                "total_solutions": total_solutions,
-                "issues_by_severity": severity_counts,
-                "top_error_types": top_error_types
-            }
-            
+            return await analytics_cache.get(user_id, "dashboard", (), lambda: self._dashboard_stats(user_id))
         except Exception as e:
             logger.error(f"❌ Failed to get dashboard stats: {e}")
             return {
@@ -88,84 +162,415 @@ class AnalyticsService:
                 "top_error_types": []
             }
     
-    async def get_error_trends(
+    async def _dashboard_stats(self, user_id: str) -> Dict[str, Any]:
+        """Compute dashboard stats (raises on failure so errors are not cached)"""
+        snapshot = await self._snapshot(user_id)
+        if snapshot is not None:
+            overview = self._snapshot_overview(snapshot, 0, await self._solution_count(user_id))
+            return {k: v for k, v in overview.items() if k not in ("issues_by_status", "trends", "languages")}
+        
+        if self.direct:
+            return await self._dashboard_stats_direct(user_id)
+        
+        # Get all issues for user
+        issues_result = self.db.table("issues")\
+            .select("id, status, severity")\
+            .eq("user_id", user_id)\
+            .execute()
+        
+        issues = issues_result.data
+        total_issues = len(issues)
+        
+        # Count by status
+        resolved_issues = sum(1 for i in issues if i.get('status') == 'resolved')
+        open_issues = sum(1 for i in issues if i.get('status') == 'open')
+        recurring_issues = sum(1 for i in issues if i.get('status') == 'recurring')
+        
+        # Resolution rate
+        resolution_rate = resolved_issues / total_issues if total_issues > 0 else 0.0
+        
+        # Count by severity
+        severity_counts = {
+            'critical': sum(1 for i in issues if i.get('severity') == 'critical'),
+            'high': sum(1 for i in issues if i.get('severity') == 'high'),
+            'medium': sum(1 for i in issues if i.get('severity') == 'medium'),
+            'low': sum(1 for i in issues if i.get('severity') == 'low')
+        }
+        
+        # Top error types (grouped in the database)
+        top_error_types = await self._top_error_types(user_id)
+        
+        # Total solutions (counted in the database)
+        total_solutions = await self._solution_count(user_id)
+        
+        return {
+            "total_issues": total_issues,
+            "open_issues": open_issues,
+            "resolved_issues": resolved_issues,
+            "recurring_issues": recurring_issues,
+            "resolution_rate": round(resolution_rate, 2),
+            "total_solutions": total_solutions,
+            "issues_by_severity": severity_counts,
+            "top_error_types": top_error_types
+        }
+    
+    async def _dashboard_stats_direct(self, user_id: str) -> Dict[str, Any]:
+        """Dashboard stats aggregated by Postgres instead of fetching every issue"""
+        counts = (await self.direct.fetch(user_id, _DASHBOARD_COUNTS_SQL, user_id))[0]
+        top_error_types = await self._top_error_types(user_id)
+        
+        total_issues = counts['total']
+        return {
+            "total_issues": total_issues,
+            "open_issues": counts['open'],
+            "resolved_issues": counts['resolved'],
+            "recurring_issues": counts['recurring'],
+            "resolution_rate": round(counts['resolved'] / total_issues, 2) if total_issues > 0 else 0.0,
+            "total_solutions": counts['solutions'],
+            "issues_by_severity": {k: counts[k] for k in ('critical', 'high', 'medium', 'low')},
+            "top_error_types": top_error_types
+        }
+    
+    async def _top_error_types(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most frequent error types"""
+        rows = await self._group_counts(user_id, GroupDimensionEnum.error_type.value, limit)
+        return [{'type': row['value'], 'count': row['count']} for row in rows if not row['is_other']]
+    
+    async def _group_counts(
         self,
         user_id: str,
-        days: int = 7
+        dimension: str,
+        top_n: Optional[int] = None,
+        statuses: Optional[List[str]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
-        """Get error trends over time"""
+        """
+        Grouped issue counts from the issue_group_counts database function
+        
+        Args:
+            user_id: Authenticated user ID
+            dimension: Column to group by (a GroupDimensionEnum value)
+            top_n: Values to return individually (None = all); the rest are
+                summed into one is_other row
+            statuses: Only count issues with these statuses
+            created_after: Only count issues created at or after this time
+            created_before: Only count issues created at or before this time
+        
+        Returns:
+            Rows with value, count and is_other, largest first
+        """
+        if dimension in CATEGORICAL_COLUMNS:
+            snapshot = await self._snapshot(user_id)
+            if snapshot is not None:
+                counts = snapshot.counts(dimension, snapshot.mask(statuses, created_after, created_before))
+                top = counts if top_n is None else counts[:top_n]
+                rows = [{'value': value, 'count': count, 'is_other': False} for value, count in top]
+                if len(counts) > len(top):
+                    rows.append({'value': None, 'count': sum(count for _, count in counts[len(top):]), 'is_other': True})
+                return rows
+        
+        params = {
+            'user_id_filter': user_id,
+            'dimension': dimension,
+            'top_n': top_n,
+            'status_filter': statuses or None,
+            'created_after': _utc_naive(created_after),
+            'created_before': _utc_naive(created_before)
+        }
+        
+        if self.direct:
+            args = ", ".join(f"{name} => ${i}" for i, name in enumerate(params, 1))
+            return await self.direct.fetch(user_id, f"SELECT * FROM issue_group_counts({args})", *params.values())
+        
+        params = {k: v.isoformat() if isinstance(v, datetime) else v for k, v in params.items()}
+        return self.db.rpc("issue_group_counts", params).execute().data
+    
+    async def get_breakdown(
+        self,
+        user_id: str,
+        dimension: GroupDimensionEnum,
+        top_n: int = 10,
+        statuses: Optional[List[str]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Issue counts grouped by one dimension, top N plus an "other" total
+        
+        Args:
+            user_id: Authenticated user ID
+            dimension: Column to group by
+            top_n: Values to return individually
+            statuses: Only count issues with these statuses
+            created_after: Only count issues created at or after this time
+            created_before: Only count issues created at or before this time
+        
+        Returns:
+            {"dimension", "groups": [{"value", "count"}], "other": count of the rest}
+        """
+        params = (dimension.value, top_n, tuple(sorted(statuses or ())), created_after, created_before)
+        
+        async def compute():
+            rows = await self._group_counts(user_id, dimension.value, top_n, statuses, created_after, created_before)
+            return {
+                "dimension": dimension.value,
+                "groups": [{'value': row['value'], 'count': row['count']} for row in rows if not row['is_other']],
+                "other": sum(row['count'] for row in rows if row['is_other'])
+            }
+        
         try:
-            # Get issues from last N days
-            start_date = datetime.utcnow() - timedelta(days=days)
-            
-            result = self.db.table("issues")\
-                .select("created_at, status, severity")\
+            return await analytics_cache.get(user_id, "breakdown", params, compute)
+        except Exception as e:
+            logger.error(f"❌ Failed to get {dimension.value} breakdown: {e}")
+            return {"dimension": dimension.value, "groups": [], "other": 0}
+    
+    async def get_overview(self, user_id: str, days: int = 7) -> Dict[str, Any]:
+        """
+        Dashboard stats, daily trends and language distribution in one call
+        
+        Args:
+            user_id: Authenticated user ID
+            days: Trend window in days
+        
+        Returns:
+            Dashboard stats plus "issues_by_status", "trends" and "languages"
+        """
+        try:
+            return await analytics_cache.get(user_id, "overview", (days,), lambda: self._overview(user_id, days))
+        except Exception as e:
+            logger.error(f"❌ Failed to get analytics overview: {e}")
+            return self._build_overview(Counter(), Counter(), Counter(), Counter(), 0, days)
+    
+    async def _overview(self, user_id: str, days: int) -> Dict[str, Any]:
+        """Compute the overview from one pass over the user's issues (raises on failure)"""
+        snapshot = await self._snapshot(user_id)
+        if snapshot is not None:
+            return self._snapshot_overview(snapshot, days, await self._solution_count(user_id))
+        
+        start_date = datetime.now(timezone.utc) - timedelta(days=days)
+        by_status_severity, by_error_type, by_language, by_day_status = Counter(), Counter(), Counter(), Counter()
+        
+        if self.direct:
+            rows = await self.direct.fetch(user_id, _OVERVIEW_SQL, user_id, _utc_naive(start_date))
+            for row in rows:
+                if row['grouping_set'] == _SET_STATUS_SEVERITY:
+                    by_status_severity[(row['status'], row['severity'])] = row['count']
+                elif row['grouping_set'] == _SET_ERROR_TYPE:
+                    by_error_type[row['error_type']] = row['count']
+                elif row['grouping_set'] == _SET_LANGUAGE:
+                    by_language[row['lang']] = row['count']
+                elif row['grouping_set'] == _SET_DAY_STATUS and row['day']:
+                    by_day_status[(row['day'], row['status'])] = row['count']
+            total_solutions = rows[0]['solutions'] if rows else 0
+        else:
+            issues = self.db.table("issues")\
+                .select("id, status, severity, error_type, language, created_at")\
                 .eq("user_id", user_id)\
-                .gte("created_at", start_date.isoformat())\
-                .order("created_at")\
-                .execute()
-            
-            issues = result.data
+                .execute()\
+                .data
             
-            # Group by date
-            daily_counts = {}
+            start_day = start_date.strftime('%Y-%m-%d')
             for issue in issues:
-                date_str = issue['created_at'][:10]  # Get YYYY-MM-DD
-                if date_str not in daily_counts:
-                    daily_counts[date_str] = {
-                        'date': date_str,
-                        'total': 0,
-                        'resolved': 0,
-                        'open': 0
-                    }
-                
-                daily_counts[date_str]['total'] += 1
-                if issue.get('status') == 'resolved':
-                    daily_counts[date_str]['resolved'] += 1
-                elif issue.get('status') == 'open':
-                    daily_counts[date_str]['open'] += 1
+                by_status_severity[(issue.get('status'), issue.get('severity'))] += 1
+                by_error_type[issue.get('error_type', 'Unknown')] += 1
+                by_language[issue.get('language') or 'Unknown'] += 1
+                if issue['created_at'][:10] >= start_day:
+                    by_day_status[(issue['created_at'][:10], issue.get('status'))] += 1
             
-            # Fill in missing dates with zeros
-            trend_data = []
-            for i in range(days):
-                date = (datetime.utcnow() - timedelta(days=days-i-1)).strftime('%Y-%m-%d')
-                if date in daily_counts:
-                    trend_data.append(daily_counts[date])
-                else:
-                    trend_data.append({
-                        'date': date,
-                        'total': 0,
-                        'resolved': 0,
-                        'open': 0
-                    })
-            
-            return trend_data
+            total_solutions = await self._solution_count(user_id)
+        
+        return self._build_overview(by_status_severity, by_error_type, by_language, by_day_status, total_solutions, days)
+    
+    @classmethod
+    def _snapshot_overview(cls, snapshot: ColumnarSnapshot, days: int, total_solutions: int = 0) -> Dict[str, Any]:
+        """The overview from bincounts over a columnar snapshot"""
+        start_date = datetime.now(timezone.utc) - timedelta(days=days)
+        return cls._build_overview(
+            snapshot.pair_counts("status", "severity"),
+            Counter(dict(snapshot.counts("error_type"))),
+            Counter(dict(snapshot.counts("language"))),
+            snapshot.daily_counts(start_date) if days else Counter(),
+            total_solutions,
+            days
+        )
+    
+    @staticmethod
+    def _build_overview(
+        by_status_severity: Counter,
+        by_error_type: Counter,
+        by_language: Counter,
+        by_day_status: Counter,
+        total_solutions: int,
+        days: int
+    ) -> Dict[str, Any]:
+        """Shape grouped counts into the overview response"""
+        by_status, by_severity = Counter(), Counter()
+        for (status, severity), count in by_status_severity.items():
+            by_status[status] += count
+            by_severity[severity] += count
+        
+        total_issues = sum(by_status.values())
+        
+        statuses_by_day: Dict[str, Counter] = {}
+        for (day, status), count in by_day_status.items():
+            statuses_by_day.setdefault(day, Counter())[status] += count
+        
+        trends = []
+        for i in range(days):
+            date = (datetime.utcnow() - timedelta(days=days-i-1)).strftime('%Y-%m-%d')
+            statuses = statuses_by_day.get(date, Counter())
+            trends.append({
+                'date': date,
+                'total': sum(statuses.values()),
+                'resolved': statuses.get('resolved', 0),
+                'open': statuses.get('open', 0)
+            })
+        
+        return {
+            "total_issues": total_issues,
+            "open_issues": by_status['open'],
+            "resolved_issues": by_status['resolved'],
+            "recurring_issues": by_status['recurring'],
+            "resolution_rate": round(by_status['resolved'] / total_issues, 2) if total_issues > 0 else 0.0,
+            "total_solutions": total_solutions,
+            "issues_by_severity": {k: by_severity[k] for k in ('critical', 'high', 'medium', 'low')},
+            "issues_by_status": dict(by_status),
+            "top_error_types": [{'type': k, 'count': v} for k, v in by_error_type.most_common(10)],
+            "trends": trends,
+            "languages": [{'language': k, 'count': v} for k, v in by_language.most_common()]
+        }
+    
+    async def get_mttr(self, user_id: str, group_by: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Mean and percentile time to resolution of the user's resolved issues
+        
+        Reads the per (error type, severity) aggregates that record_resolution
+        keeps up to date, so the cost does not grow with the number of issues.
+        
+        Args:
+            user_id: Authenticated user ID
+            group_by: Also break down by "severity" or "error_type"
+        
+        Returns:
+            Overall {"resolved", "mean_hours", "p50_hours", "p90_hours",
+            "p99_hours"}, per-group summaries when grouped, and the accuracy
+        """
+        async def compute():
+            result = self.db.table("resolution_stats")\
+                .select("error_type, severity, resolved_count, total_seconds, histogram")\
+                .eq("user_id", user_id)\
+                .execute()
             
+            summary = {
+                **_resolution_summary(result.data),
+                "accuracy": "mean is exact; percentiles are interpolated within power-of-two buckets (at most 2x off)"
+            }
+            if group_by:
+                groups: Dict[str, List[Dict[str, Any]]] = {}
+                for row in result.data:
+                    groups.setdefault(row[group_by], []).append(row)
+                summary["group_by"] = group_by
+                summary["groups"] = sorted(
+                    ({"value": value, **_resolution_summary(rows)} for value, rows in groups.items()),
+                    key=lambda g: g["resolved"],
+                    reverse=True
+                )
+            return summary
+        
+        try:
+            return await analytics_cache.get(user_id, "mttr", (group_by,), compute)
+        except Exception as e:
+            logger.error(f"❌ Failed to get time to resolution: {e}")
+            return {"resolved": 0, "mean_hours": None, **{f"p{round(q * 100)}_hours": None for q in MTTR_PERCENTILES}}
+    
+    async def get_issue_events(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent spike and regression events of the user's issues"""
+        try:
+            result = self.db.table("issue_events")\
+                .select("id, issue_id, kind, details, created_at")\
+                .eq("user_id", user_id)\
+                .order("created_at", desc=True)\
+                .limit(limit)\
+                .execute()
+            return result.data
+        except Exception as e:
+            logger.error(f"❌ Failed to get issue events: {e}")
+            return []
+    
+    async def get_error_trends(
+        self,
+        user_id: str,
+        days: int = 7
+    ) -> List[Dict[str, Any]]:
+        """Get error trends over time"""
+        try:
+            return await analytics_cache.get(user_id, "trends", (days,), lambda: self._error_trends(user_id, days))
         except Exception as e:
             logger.error(f"❌ Failed to get error trends: {e}")
             return []
     
+    async def _error_trends(self, user_id: str, days: int) -> List[Dict[str, Any]]:
+        """Compute daily totals for the last N days (raises on failure)"""
+        snapshot = await self._snapshot(user_id)
+        if snapshot is not None:
+            return self._snapshot_overview(snapshot, days)["trends"]
+        
+        # Get issues from last N days
+        start_date = datetime.utcnow() - timedelta(days=days)
+        
+        result = self.db.table("issues")\
+            .select("created_at, status, severity")\
+            .eq("user_id", user_id)\
+            .gte("created_at", start_date.isoformat())\
+            .order("created_at")\
+            .execute()
+        
+        issues = result.data
+        
+        # Group by date
+        daily_counts = {}
+        for issue in issues:
+            date_str = issue['created_at'][:10]  # Get YYYY-MM-DD
+            if date_str not in daily_counts:
+                daily_counts[date_str] = {
+                    'date': date_str,
+                    'total': 0,
+                    'resolved': 0,
+                    'open': 0
+                }
+            
+            daily_counts[date_str]['total'] += 1
+            if issue.get('status') == 'resolved':
+                daily_counts[date_str]['resolved'] += 1
+            elif issue.get('status') == 'open':
+                daily_counts[date_str]['open'] += 1
+        
+        # Fill in missing dates with zeros
+        trend_data = []
+        for i in range(days):
+            date = (datetime.utcnow() - timedelta(days=days-i-1)).strftime('%Y-%m-%d')
+            if date in daily_counts:
+                trend_data.append(daily_counts[date])
+            else:
+                trend_data.append({
+                    'date': date,
+                    'total': 0,
+                    'resolved': 0,
+                    'open': 0
+                })
+        
+        return trend_data
+    
     async def get_language_distribution(self, user_id: str) -> List[Dict[str, Any]]:
         """Get distribution of errors by programming language"""
         try:
-            result = self.db.table("issues")\
-                .select("language")\
-                .eq("user_id", user_id)\
-                .execute()
-            
-            # Count by language
-            language_counts = {}
-            for issue in result.data:
-                lang = issue.get('language') or 'Unknown'
-                language_counts[lang] = language_counts.get(lang, 0) + 1
-            
-            distribution = [
-                {'language': k, 'count': v}
-                for k, v in language_counts.items()
-            ]
-            
-            return sorted(distribution, key=lambda x: x['count'], reverse=True)
-            
+            return await analytics_cache.get(user_id, "languages", (), lambda: self._language_distribution(user_id))
         except Exception as e:
             logger.error(f"❌ Failed to get language distribution: {e}")
             return []
+    
+    async def _language_distribution(self, user_id: str) -> List[Dict[str, Any]]:
+        """Compute issue counts per language, largest first (raises on failure)"""
+        rows = await self._group_counts(user_id, GroupDimensionEnum.language.value)
+        return [{'language': row['value'], 'count': row['count']} for row in rows]
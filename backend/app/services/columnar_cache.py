@@ -0,0 +1,299 @@
+"""In-process columnar snapshots of users' issues for vectorized analytics"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from supabase import Client
+import asyncio
+import logging
+import time
+import numpy as np
+from app.config import settings
+from app.database import DirectDatabase
+
+logger = logging.getLogger(__name__)
+
+# Dictionary-encoded columns (NULL is stored as 'Unknown', like issue_group_counts)
+CATEGORICAL_COLUMNS = ("status", "severity", "language", "error_type")
+_SNAPSHOT_SQL = "SELECT id::text AS id, status, severity, language, error_type, created_at FROM issues WHERE user_id = $1"
+_PAGE_SIZE = 1000
+# Rough per-issue cost of the id -> row dict (key string plus table slot), for the memory budget
+_ID_BYTES = 120
+
+
+def _epoch_seconds(value: Any) -> int:
+    """Epoch seconds of created_at (naive values are UTC, as stored)"""
+    if isinstance(value, str):
+        return int(np.datetime64(value[:19], "s").astype(np.int64))
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(time.time())
+
+
+class ColumnarSnapshot:
+    """
+    One user's issues as NumPy columns: categorical codes plus creation time
+
+    Rows are addressed by issue id. Updates overwrite a row in place, deletes
+    clear its live flag and the arrays are compacted once half the rows are
+    dead. Aggregations are bincounts over the codes of live rows.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.vocab: Dict[str, List[str]] = {column: [] for column in CATEGORICAL_COLUMNS}
+        self._codes_of: Dict[str, Dict[str, int]] = {column: {} for column in CATEGORICAL_COLUMNS}
+        self.codes: Dict[str, np.ndarray] = {column: np.zeros(capacity, dtype=np.int32) for column in CATEGORICAL_COLUMNS}
+        self.created = np.zeros(capacity, dtype=np.int64)
+        self.live = np.zeros(capacity, dtype=bool)
+        self.rows: Dict[str, int] = {}
+        self.size = 0
+
+    def _code(self, column: str, value: Optional[str]) -> int:
+        value = value or "Unknown"
+        code = self._codes_of[column].get(value)
+        if code is None:
+            code = self._codes_of[column][value] = len(self.vocab[column])
+            self.vocab[column].append(value)
+        return code
+
+    def _resize(self, capacity: int):
+        for column in CATEGORICAL_COLUMNS:
+            self.codes[column] = np.resize(self.codes[column], capacity)
+        self.created = np.resize(self.created, capacity)
+        live = np.zeros(capacity, dtype=bool)
+        live[:self.size] = self.live[:self.size]
+        self.live = live
+
+    def upsert(self, issue: Dict[str, Any]):
+        """Add or overwrite an issue; columns missing from a partial row keep their value"""
+        row = self.rows.get(issue['id'])
+        if row is None:
+            if self.size == len(self.live):
+                self._resize(max(2 * self.size, 1024))
+            row = self.rows[issue['id']] = self.size
+            self.size += 1
+            self.live[row] = True
+            for column in CATEGORICAL_COLUMNS:
+                self.codes[column][row] = self._code(column, issue.get(column))
+            self.created[row] = _epoch_seconds(issue.get('created_at'))
+            return
+
+        for column in CATEGORICAL_COLUMNS:
+            if column in issue:
+                self.codes[column][row] = self._code(column, issue[column])
+        if 'created_at' in issue:
+            self.created[row] = _epoch_seconds(issue['created_at'])
+
+    def remove(self, issue_id: str):
+        """Drop an issue if present"""
+        row = self.rows.pop(issue_id, None)
+        if row is None:
+            return
+        self.live[row] = False
+        if self.size > 1024 and len(self.rows) < self.size // 2:
+            self._compact()
+
+    def _compact(self):
+        """Move live rows to the front, in their current order"""
+        keep = np.flatnonzero(self.live[:self.size])
+        position = np.full(self.size, -1, dtype=np.int64)
+        position[keep] = np.arange(len(keep))
+        for column in CATEGORICAL_COLUMNS:
+            self.codes[column][:len(keep)] = self.codes[column][keep]
+        self.created[:len(keep)] = self.created[keep]
+        self.live[:] = False
+        self.live[:len(keep)] = True
+        self.rows = {issue_id: int(position[row]) for issue_id, row in self.rows.items()}
+        self.size = len(keep)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the snapshot"""
+        arrays = sum(a.nbytes for a in self.codes.values()) + self.created.nbytes + self.live.nbytes
+        return arrays + len(self.rows) * _ID_BYTES
+
+    def mask(
+        self,
+        statuses: Optional[List[str]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ) -> np.ndarray:
+        """Live rows matching the filters (same semantics as issue_group_counts)"""
+        mask = self.live[:self.size].copy()
+        if statuses:
+            wanted = [self._codes_of["status"][s] for s in statuses if s in self._codes_of["status"]]
+            mask &= np.isin(self.codes["status"][:self.size], wanted)
+        if created_after is not None:
+            mask &= self.created[:self.size] >= _epoch_seconds(created_after)
+        if created_before is not None:
+            mask &= self.created[:self.size] <= _epoch_seconds(created_before)
+        return mask
+
+    def counts(self, column: str, mask: Optional[np.ndarray] = None) -> List[Tuple[str, int]]:
+        """(value, count) of one column over the masked rows, largest first then by value"""
+        mask = self.live[:self.size] if mask is None else mask
+        totals = np.bincount(self.codes[column][:self.size][mask], minlength=len(self.vocab[column]))
+        vocab = self.vocab[column]
+        return sorted(((vocab[c], int(totals[c])) for c in np.flatnonzero(totals)), key=lambda vc: (-vc[1], vc[0]))
+
+    def pair_counts(self, first: str, second: str) -> Counter:
+        """Counts of (first, second) value pairs over live rows"""
+        live = self.live[:self.size]
+        width = max(len(self.vocab[second]), 1)
+        combined = self.codes[first][:self.size][live].astype(np.int64) * width + self.codes[second][:self.size][live]
+        totals = np.bincount(combined)
+        return Counter({
+            (self.vocab[first][c // width], self.vocab[second][c % width]): int(totals[c])
+            for c in np.flatnonzero(totals)
+        })
+
+    def daily_counts(self, since: datetime, column: str = "status") -> Counter:
+        """Counts of (UTC day, value) for live rows created at or after since"""
+        mask = self.live[:self.size] & (self.created[:self.size] >= _epoch_seconds(since))
+        days = self.created[:self.size][mask] // 86400
+        if not len(days):
+            return Counter()
+        first_day = int(days.min())
+        width = max(len(self.vocab[column]), 1)
+        totals = np.bincount((days - first_day) * width + self.codes[column][:self.size][mask])
+        return Counter({
+            (
+                datetime.fromtimestamp((first_day + c // width) * 86400, timezone.utc).strftime('%Y-%m-%d'),
+                self.vocab[column][c % width]
+            ): int(totals[c])
+            for c in np.flatnonzero(totals)
+        })
+
+
+class ColumnarCache:
+    """
+    Per-user columnar snapshots, loaded on first use and kept current from writes
+
+    Snapshots are evicted least recently used first once their total size
+    exceeds max_bytes. Writes made while a snapshot is loading are replayed
+    onto it afterwards, so the snapshot never misses them. Disabled unless
+    COLUMNAR_CACHE_ENABLED is set: it pays off for users with many issues,
+    where every SQL aggregate would touch all their rows.
+    """
+
+    def __init__(self, enabled: bool = False, max_bytes: int = 256 * 1024 * 1024):
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self._snapshots: "OrderedDict[str, ColumnarSnapshot]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._pending_writes: Dict[str, List[Tuple[str, Any]]] = {}
+        self.stats = {"hits": 0, "loads": 0, "evictions": 0, "too_large": 0}
+
+    async def get(self, db: Client, user_id: str, direct: Optional[DirectDatabase] = None) -> Optional[ColumnarSnapshot]:
+        """
+        The user's snapshot, loading it if needed
+
+        Args:
+            db: User's client (PostgREST load, under RLS)
+            user_id: Authenticated user ID
+            direct: Direct pool, used for the load when enabled
+
+        Returns:
+            The snapshot, or None when the cache is disabled
+        """
+        if not self.enabled:
+            return None
+
+        snapshot = self._snapshots.get(user_id)
+        if snapshot is not None:
+            self._snapshots.move_to_end(user_id)
+            self.stats["hits"] += 1
+            return snapshot
+
+        task = self._loading.get(user_id)
+        if task is None:
+            task = self._loading[user_id] = asyncio.create_task(self._load(db, user_id, direct))
+        return await asyncio.shield(task)
+
+    async def _load(self, db: Client, user_id: str, direct: Optional[DirectDatabase]) -> ColumnarSnapshot:
+        """Read the user's issues into a new snapshot (raises on failure)"""
+        self._pending_writes[user_id] = []
+        try:
+            started = time.monotonic()
+            snapshot = ColumnarSnapshot()
+            if direct:
+                for issue in await direct.fetch(user_id, _SNAPSHOT_SQL, user_id):
+                    snapshot.upsert(dict(issue))
+            else:
+                # Keyset pages: PostgREST caps the rows of a single response
+                last_id = None
+                while True:
+                    query = db.table("issues")\
+                        .select("id, status, severity, language, error_type, created_at")\
+                        .eq("user_id", user_id)\
+                        .order("id")\
+                        .limit(_PAGE_SIZE)
+                    if last_id:
+                        query = query.gt("id", last_id)
+                    page = query.execute().data
+                    for issue in page:
+                        snapshot.upsert(issue)
+                    if len(page) < _PAGE_SIZE:
+                        break
+                    last_id = page[-1]['id']
+
+            for op, value in self._pending_writes.get(user_id, []):
+                snapshot.upsert(value) if op == "upsert" else snapshot.remove(value)
+            self.stats["loads"] += 1
+            logger.info(f"📊 Loaded columnar snapshot for user {user_id[:8]} ({len(snapshot.rows)} issues, {snapshot.nbytes // 1024} KB, {(time.monotonic() - started) * 1000:.0f} ms)")
+        finally:
+            replayed = self._pending_writes.pop(user_id, None)
+            self._loading.pop(user_id, None)
+
+        if replayed is None:
+            # Invalidated while loading: serve this request, but do not keep it
+            return snapshot
+        if snapshot.nbytes > self.max_bytes:
+            self.stats["too_large"] += 1
+            return snapshot
+
+        self._snapshots[user_id] = snapshot
+        while sum(s.nbytes for s in self._snapshots.values()) > self.max_bytes:
+            self._snapshots.popitem(last=False)
+            self.stats["evictions"] += 1
+        return snapshot
+
+    def upsert(self, user_id: str, issue: Dict[str, Any]):
+        """Reflect a created or updated issue in the user's snapshot"""
+        if user_id in self._pending_writes:
+            self._pending_writes[user_id].append(("upsert", issue))
+        snapshot = self._snapshots.get(user_id)
+        if snapshot is not None:
+            snapshot.upsert(issue)
+
+    def remove(self, user_id: str, issue_id: str):
+        """Reflect a deleted issue in the user's snapshot"""
+        if user_id in self._pending_writes:
+            self._pending_writes[user_id].append(("remove", issue_id))
+        snapshot = self._snapshots.get(user_id)
+        if snapshot is not None:
+            snapshot.remove(issue_id)
+
+    def invalidate(self, user_id: str):
+        """Drop a user's snapshot after writes that are not reflected row by row"""
+        self._snapshots.pop(user_id, None)
+        self._pending_writes.pop(user_id, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cached users, memory use and counters for metrics"""
+        return {
+            "enabled": self.enabled,
+            "users": len(self._snapshots),
+            "bytes": sum(s.nbytes for s in self._snapshots.values()),
+            "max_bytes": self.max_bytes,
+            **self.stats
+        }
+
+
+# Global columnar cache instance
+columnar_cache = ColumnarCache(
+    enabled=settings.columnar_cache_enabled,
+    max_bytes=settings.columnar_cache_max_mb * 1024 * 1024
+)
@@ -1,12 +1,17 @@
 """Export/Import service for data portability"""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from supabase import Client
 import logging
 import json
 import csv
 from io import StringIO
 from datetime import datetime
+from app.services.ml_service import MLService
+from app.services.issue_service import DUPLICATE_THRESHOLD, issue_select
+from app.utils.fingerprint import compute_fingerprint
+from app.utils.stacktrace import frame_columns
+from app.utils.vectors import to_pgvector
 
 logger = logging.getLogger(__name__)
 
@@ -14,15 +19,16 @@ logger = logging.getLogger(__name__)
 class ExportService:
     """Service for exporting and importing issues"""
     
-    def __init__(self, db: Client):
+    def __init__(self, db: Client, ml_service: Optional[MLService] = None):
         self.db = db
+        self.ml_service = ml_service
     
     async def export_to_json(self, user_id: str) -> Dict[str, Any]:
         """Export all user issues to JSON format"""
         try:
             # Get all issues with solutions and comments
             issues_result = self.db.table("issues")\
-                .select("*")\
+                .select(issue_select())\
                 .eq("user_id", user_id)\
                 .execute()
             
@@ -105,7 +111,7 @@ class ExportService:
             imported_count = 0
             skipped_count = 0
             
-            for issue_data in issues:
+            for issue_data in self._merge_duplicates(issues):
                 try:
                     # Remove nested data
                     solutions = issue_data.pop("solutions", [])
@@ -113,8 +119,6 @@ class ExportService:
                     
                     # Remove system fields
                     issue_data.pop("id", None)
-                    issue_data.pop("embedding", None)
-                    issue_data.pop("embedding_text", None)
                     
                     # Set user_id
                     issue_data["user_id"] = user_id
@@ -152,6 +156,7 @@ class ExportService:
             result = {
                 "imported": imported_count,
                 "skipped": skipped_count,
+                "merged": len(issues) - imported_count - skipped_count,
                 "total": len(issues)
             }
             
@@ -161,3 +166,45 @@ class ExportService:
         except Exception as e:
             logger.error(f"❌ Failed to import: {e}")
             raise
+    
+    def _merge_duplicates(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Collapse near-identical issues of an import into one issue per cluster
+        
+        Members of a cluster add their occurrences, occurrence window, solutions
+        and comments to the cluster leader. Without an ML service, issues are
+        imported unchanged and without embeddings.
+        """
+        for issue_data in issues:
+            issue_data.pop("embedding", None)
+            issue_data.pop("embedding_text", None)
+            issue_data["fingerprint"] = compute_fingerprint(issue_data)
+            issue_data.update(frame_columns(issue_data))
+        
+        if not self.ml_service or not issues:
+            return issues
+        
+        embedding_texts = [self.ml_service.create_embedding_text(i) for i in issues]
+        embeddings = self.ml_service.generate_embeddings(embedding_texts)
+        clusters = self.ml_service.cluster_duplicates(embeddings, threshold=DUPLICATE_THRESHOLD)
+        
+        merged = []
+        for cluster in clusters:
+            leader = issues[cluster[0]]
+            leader["embedding"] = to_pgvector(embeddings[cluster[0]])
+            leader["embedding_text"] = embedding_texts[cluster[0]]
+            
+            for index in cluster[1:]:
+                member = issues[index]
+                leader["occurrences"] = (leader.get("occurrences") or 1) + (member.get("occurrences") or 1)
+                for field, pick in (("first_occurred_at", min), ("last_occurred_at", max)):
+                    values = [v for v in (leader.get(field), member.get(field)) if v]
+                    if values:
+                        leader[field] = pick(values)
+                leader["solutions"] = (leader.get("solutions") or []) + (member.get("solutions") or [])
+                leader["comments"] = (leader.get("comments") or []) + (member.get("comments") or [])
+            
+            merged.append(leader)
+        
+        logger.info(f"🧮 Import of {len(issues)} issues reduced to {len(merged)} after in-batch deduplication")
+        return merged
@@ -1,21 +1,98 @@
 """Issue service for CRUD operations and semantic search"""
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from supabase import Client
 import logging
-from datetime import datetime
-from app.models.issue import IssueCreate, IssueUpdate, IssueResponse, IssueSearch
+import numpy as np
+from datetime import datetime, timezone
+from app.models.issue import IssueCreate, IssueUpdate, IssueResponse, IssueSearch, IssueSearchFilters, SearchModeEnum, SearchScopeEnum
+from app.config import settings
+from app.database import DirectDatabase, get_direct_db
 from app.services.ml_service import MLService
+from app.services.lexical_service import lexical_service, is_identifier_query
+from app.services.team_service import team_service
+from app.services.search_cache import search_cache
+from app.services.analytics_cache import analytics_cache
+from app.services.columnar_cache import columnar_cache
+from app.services.sketch_service import sketch_service
+from app.services.spike_detector import spike_detector
+from app.utils.fingerprint import compute_fingerprint
+from app.utils.vectors import to_pgvector, decode_vector, cosine_similarities
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.stacktrace import frame_columns
 
 logger = logging.getLogger(__name__)
 
+# Similarity above which a new error is counted as an occurrence of an existing issue
+DUPLICATE_THRESHOLD = 0.9
+
+# Reciprocal rank fusion constant (standard value from the RRF paper)
+RRF_K = 60
+
+# Skips match_issues while it is failing, so searches go straight to the local fallback
+match_issues_breaker = CircuitBreaker(
+    "match_issues",
+    failure_threshold=settings.circuit_breaker_failure_threshold,
+    reset_timeout=settings.circuit_breaker_reset_seconds
+)
+
+# Columns clients may receive; embedding, embedding_text and search_vector stay server-side
+ISSUE_FIELDS = (
+    "id", "user_id", "team_id",
+    "error_type", "error_message", "stack_trace",
+    "file_path", "line_number", "function_name", "code_snippet",
+    "language", "framework", "environment", "os", "dependencies",
+    "tags", "severity", "status", "occurrences", "fingerprint",
+    "stack_frames", "frame_signatures", "frame_files",
+    "first_occurred_at", "last_occurred_at", "resolved_at", "created_at", "updated_at",
+)
+_INTERNAL_FIELDS = ("embedding", "embedding_text", "search_vector")
+# Parsed frames are only shown on the detail view
+_DETAIL_FIELDS = ("stack_frames", "frame_signatures", "frame_files")
+# Long text replaced by the truncated *_preview computed columns in list views
+_PREVIEW_FIELDS = ("stack_trace", "code_snippet")
+
+
+def issue_select(fields: Optional[List[str]] = None, preview: bool = False) -> str:
+    """
+    PostgREST select list for issue rows
+    
+    Args:
+        fields: Sparse fieldset; defaults to every client column
+        preview: Truncate stack_trace and code_snippet (list views)
+        
+    Returns:
+        Select string, e.g. "id,error_type,stack_trace:stack_trace_preview"
+        
+    Raises:
+        ValueError: If a field is not a client column
+    """
+    if fields:
+        unknown = sorted(set(fields) - set(ISSUE_FIELDS))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    else:
+        fields = [f for f in ISSUE_FIELDS if not (preview and f in _DETAIL_FIELDS)]
+    
+    return ",".join(
+        f"{f}:{f}_preview" if preview and f in _PREVIEW_FIELDS else f
+        for f in fields
+    )
+
+
+def public_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop server-side ML columns from a row returned by an insert or update"""
+    return {k: v for k, v in issue.items() if k not in _INTERNAL_FIELDS}
+
 
 class IssueService:
     """Service for issue management and search"""
     
-    def __init__(self, db: Client, ml_service: MLService):
+    def __init__(self, db: Client, ml_service: MLService, direct: Optional[DirectDatabase] = None):
         self.db = db
         self.ml_service = ml_service
+        # Hot paths (vector/full-text search, fingerprint lookups) bypass PostgREST when configured
+        self.direct = direct or get_direct_db()
     
     async def create_issue(self, issue_data: IssueCreate, user_id: str) -> Dict[str, Any]:
         """
@@ -29,8 +106,24 @@ class IssueService:
             Created/updated issue with similar issues
         """
         try:
-            # Create embedding text
             issue_dict = issue_data.model_dump()
+            fingerprint = compute_fingerprint(issue_dict)
+            
+            # Exact duplicate fast path: one indexed lookup, no embedding needed
+            exact_duplicates = await self.find_by_fingerprints([fingerprint], user_id)
+            if fingerprint in exact_duplicates:
+                duplicate = exact_duplicates[fingerprint]
+                logger.info(f"🔄 Exact duplicate detected! Updating issue {duplicate['id']} (fingerprint: {fingerprint[:12]})")
+                
+                updated_issue = await self._increment_occurrences(duplicate)
+                
+                return {
+                    "issue": updated_issue,
+                    "is_duplicate": True,
+                    "similar_issues": []
+                }
+            
+            # Create embedding text
             embedding_text = self.ml_service.create_embedding_text(issue_dict)
             
             # Generate embedding
@@ -40,7 +133,7 @@ class IssueService:
             potential_duplicates = await self.find_similar_issues(
                 embedding=embedding,
                 user_id=user_id,
-                threshold=0.9,  # 90% similarity threshold for duplicates
+                threshold=DUPLICATE_THRESHOLD,
                 limit=1
             )
             
@@ -49,21 +142,7 @@ class IssueService:
                 duplicate = potential_duplicates[0]['issue']
                 logger.info(f"🔄 Duplicate detected! Updating issue {duplicate['id']} (similarity: {potential_duplicates[0]['similarity']:.2%})")
                 
-                # Update occurrence count and timestamp
-                update_data = {
-                    "occurrences": duplicate.get('occurrences', 1) + 1,
-                    "last_occurred_at": datetime.utcnow().isoformat(),
-                    "updated_at": datetime.utcnow().isoformat()
-                }
-                
-                result = self.db.table("issues").update(update_data).eq("id", duplicate['id']).execute()
-                
-                if not result.data:
-                    raise Exception("Failed to update duplicate issue")
-                
-                updated_issue = result.data[0]
-                
-                logger.info(f"✅ Updated duplicate issue: {updated_issue['id']} (occurrences: {updated_issue['occurrences']})")
+                updated_issue = await self._increment_occurrences(duplicate)
                 
                 return {
                     "issue": updated_issue,
@@ -75,8 +154,10 @@ class IssueService:
             db_issue = {
                 **issue_dict,
                 "user_id": user_id,
-                "embedding": embedding,
+                "embedding": to_pgvector(embedding),
                 "embedding_text": embedding_text,
+                "fingerprint": fingerprint,
+                **frame_columns(issue_dict),
                 "status": "open",
                 "occurrences": 1,
                 "first_occurred_at": datetime.utcnow().isoformat(),
@@ -89,7 +170,12 @@ class IssueService:
             if not result.data:
                 raise Exception("Failed to create issue")
             
-            created_issue = result.data[0]
+            created_issue = public_issue(result.data[0])
+            lexical_service.upsert(user_id, created_issue)
+            columnar_cache.upsert(user_id, created_issue)
+            sketch_service.record(user_id, created_issue)
+            search_cache.bump(user_id)
+            analytics_cache.invalidate(user_id)
             
             # Find similar issues (lower threshold for suggestions)
             similar_issues = await self.find_similar_issues(
@@ -112,128 +198,612 @@ class IssueService:
             logger.error(f"❌ Failed to create issue: {e}")
             raise
     
+    async def create_issues_batch(
+        self,
+        issues_data: List[IssueCreate],
+        user_id: str
+    ) -> Dict[str, Any]:
+        """
+        Create many issues at once, deduplicating within the batch first
+        
+        Items are grouped by fingerprint and matched against stored issues with
+        a single indexed lookup. Only the remaining groups are embedded; they
+        are clustered on their embeddings so each cluster costs one duplicate
+        lookup and produces one issue whose occurrence count is the cluster size.
+        
+        Args:
+            issues_data: Issues to ingest
+            user_id: User creating the issues
+            
+        Returns:
+            Created/updated issues with batch counts
+        """
+        try:
+            issue_dicts = [issue.model_dump() for issue in issues_data]
+            
+            # Group exact duplicates by fingerprint (first item of each group leads)
+            groups: Dict[str, List[int]] = {}
+            for index, issue_dict in enumerate(issue_dicts):
+                groups.setdefault(compute_fingerprint(issue_dict), []).append(index)
+            
+            updated_issues = []
+            exact_duplicates = await self.find_by_fingerprints(list(groups), user_id)
+            for fingerprint, duplicate in exact_duplicates.items():
+                updated_issues.append(await self._increment_occurrences(duplicate, len(groups.pop(fingerprint))))
+            
+            fingerprints = list(groups)
+            leaders = [groups[fp][0] for fp in fingerprints]
+            embedding_texts = [self.ml_service.create_embedding_text(issue_dicts[i]) for i in leaders]
+            embeddings = self.ml_service.generate_embeddings(embedding_texts)
+            
+            clusters = self.ml_service.cluster_duplicates(embeddings, threshold=DUPLICATE_THRESHOLD)
+            logger.info(f"🧮 Batch of {len(issue_dicts)} items reduced to {len(exact_duplicates)} known fingerprints and {len(clusters)} clusters")
+            
+            now = datetime.utcnow().isoformat()
+            new_issues = []
+            for cluster in clusters:
+                leader = cluster[0]
+                occurrences = sum(len(groups[fingerprints[i]]) for i in cluster)
+                
+                potential_duplicates = await self.find_similar_issues(
+                    embedding=embeddings[leader],
+                    user_id=user_id,
+                    threshold=DUPLICATE_THRESHOLD,
+                    limit=1
+                )
+                
+                if potential_duplicates:
+                    duplicate = potential_duplicates[0]['issue']
+                    updated_issues.append(await self._increment_occurrences(duplicate, occurrences))
+                    continue
+                
+                new_issues.append({
+                    **issue_dicts[leaders[leader]],
+                    "user_id": user_id,
+                    "embedding": to_pgvector(embeddings[leader]),
+                    "embedding_text": embedding_texts[leader],
+                    "fingerprint": fingerprints[leader],
+                    **frame_columns(issue_dicts[leaders[leader]]),
+                    "status": "open",
+                    "occurrences": occurrences,
+                    "first_occurred_at": now,
+                    "last_occurred_at": now
+                })
+            
+            created_issues = []
+            if new_issues:
+                result = self.db.table("issues").insert(new_issues).execute()
+                if not result.data:
+                    raise Exception("Failed to create issues")
+                created_issues = [public_issue(issue) for issue in result.data]
+                for created_issue in created_issues:
+                    lexical_service.upsert(user_id, created_issue)
+                    columnar_cache.upsert(user_id, created_issue)
+                    sketch_service.record(user_id, created_issue, created_issue.get('occurrences') or 1)
+                search_cache.bump(user_id)
+                analytics_cache.invalidate(user_id)
+            
+            logger.info(f"✅ Batch ingest: {len(created_issues)} created, {len(updated_issues)} duplicates updated")
+            
+            return {
+                "created": created_issues,
+                "updated": updated_issues,
+                "total": len(issue_dicts),
+                "clusters": len(clusters) + len(exact_duplicates)
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to create issue batch: {e}")
+            raise
+    
+    async def find_by_fingerprints(self, fingerprints: List[str], user_id: str) -> Dict[str, Dict[str, Any]]:
+        """Look up the user's issues by fingerprint, keyed by fingerprint"""
+        if not fingerprints:
+            return {}
+        
+        try:
+            matches = {}
+            if self.direct:
+                rows = await self.direct.fetch(
+                    user_id,
+                    f"SELECT {issue_select()} FROM issues WHERE user_id = $1 AND fingerprint = ANY($2::text[])",
+                    user_id,
+                    fingerprints
+                )
+                for issue in rows:
+                    matches.setdefault(issue['fingerprint'], issue)
+                return matches
+            
+            # Chunked to keep the PostgREST query string short
+            for start in range(0, len(fingerprints), 100):
+                result = self.db.table("issues")\
+                    .select(issue_select())\
+                    .eq("user_id", user_id)\
+                    .in_("fingerprint", fingerprints[start:start + 100])\
+                    .execute()
+                
+                for issue in result.data:
+                    matches.setdefault(issue['fingerprint'], issue)
+            return matches
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Fingerprint lookup failed: {e}")
+            return {}
+    
+    async def _increment_occurrences(self, issue: Dict[str, Any], count: int = 1) -> Dict[str, Any]:
+        """
+        Record additional occurrences of an existing issue
+        
+        A resolved issue that occurs again, or an issue whose rate spikes above
+        its baseline, is marked recurring in the same update.
+        """
+        update_data = {
+            "occurrences": (issue.get('occurrences') or 1) + count,
+            "last_occurred_at": datetime.utcnow().isoformat(),
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        event = spike_detector.observe(issue, count)
+        if event and issue.get('status') != 'recurring':
+            update_data["status"] = "recurring"
+            update_data["resolved_at"] = None
+        
+        result = self.db.table("issues").update(update_data).eq("id", issue['id']).execute()
+        
+        if not result.data:
+            raise Exception("Failed to update duplicate issue")
+        
+        if event:
+            spike_detector.record(event)
+        updated_issue = public_issue(result.data[0])
+        sketch_service.record(updated_issue['user_id'], updated_issue, count)
+        columnar_cache.upsert(updated_issue['user_id'], updated_issue)
+        search_cache.bump(updated_issue['user_id'])
+        analytics_cache.invalidate(updated_issue['user_id'])
+        logger.info(f"✅ Updated duplicate issue: {updated_issue['id']} (occurrences: {updated_issue['occurrences']})")
+        return updated_issue
+    
     async def find_similar_issues(
         self,
         embedding: List[float],
         user_id: str,
         threshold: float = 0.7,
         limit: int = 10,
-        exclude_id: Optional[str] = None
+        exclude_id: Optional[str] = None,
+        filters: Optional[IssueSearchFilters] = None,
+        ef_search: Optional[int] = None,
+        team_ids: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Find similar issues using vector similarity search
-        Falls back to Python-based similarity if pgvector fails
+        Falls back to Python-based similarity if pgvector fails; after repeated
+        failures a circuit breaker skips the RPC for a cool-down period
+        
+        Filters are applied inside the vector query, so a filtered search still
+        returns up to `limit` matches. ef_search sets the HNSW candidate list
+        size for this query: higher values raise recall and latency. With
+        team_ids, issues of those teams are searched in the same query.
         """
-        try:
-            # Try pgvector-based search first
-            result = self.db.rpc(
-                'match_issues',
-                {
-                    'query_embedding': embedding,
-                    'match_threshold': 1 - threshold,
-                    'match_count': limit,
-                    'user_id_filter': user_id
-                }
-            ).execute()
-            
-            similar_issues = []
-            for item in result.data:
-                if exclude_id and item['id'] == exclude_id:
-                    continue
-                similarity = 1 - item.get('distance', 1)
-                if similarity >= threshold:
-                    similar_issues.append({
-                        'issue': item,
-                        'similarity': round(similarity, 4)
-                    })
-            
-            if similar_issues:
+        ef_search = ef_search or settings.vector_ef_search
+        if match_issues_breaker.allow_request():
+            try:
+                rows = await self._rpc(
+                    'match_issues',
+                    {
+                        'query_embedding': to_pgvector(embedding),
+                        'match_threshold': 1 - threshold,
+                        'match_count': limit + (1 if exclude_id else 0),
+                        'user_id_filter': user_id,
+                        **self._filter_params(filters),
+                        **({'ef_search': ef_search} if ef_search else {}),
+                        **({'team_ids_filter': team_ids} if team_ids else {})
+                    },
+                    user_id
+                )
+                match_issues_breaker.record_success()
+                
+                # No rows is a valid answer: nothing is within the threshold
+                similar_issues = []
+                for item in rows:
+                    if exclude_id and item['id'] == exclude_id:
+                        continue
+                    similarity = 1 - item.get('distance', 1)
+                    if similarity >= threshold:
+                        similar_issues.append({
+                            'issue': item,
+                            'similarity': round(similarity, 4)
+                        })
                 return similar_issues[:limit]
                 
-        except Exception as e:
-            logger.warning(f"⚠️ pgvector search failed: {e}")
+            except Exception as e:
+                match_issues_breaker.record_failure()
+                logger.warning(f"⚠️ pgvector search failed: {e}")
+            except BaseException:
+                # Cancelled mid-call: no outcome, but free a half-open trial
+                match_issues_breaker.abandon()
+                raise
+        else:
+            logger.info("⚡ match_issues circuit open, skipping the RPC")
         
         # Fallback: Python-based similarity search
         logger.info("📊 Using Python fallback for similarity search")
         try:
-            # Fetch all user's issues with embeddings
-            result = self.db.table("issues").select("*").eq("user_id", user_id).execute()
+            # Fetch all visible issues with their embeddings as base64 vector_send() bytes
+            query = self.db.table("issues").select(issue_select(preview=True) + ",embedding:embedding_b64")
+            query = self._visible_issues(query, user_id, team_ids)
+            result = self._apply_filters(query, filters).execute()
             
             if not result.data:
                 logger.info("📊 No issues found for user")
                 return []
             
-            logger.info(f"📊 Found {len(result.data)} issues in database")
-            
-            similar_issues = []
+            candidates, vectors = [], []
             for issue in result.data:
-                if exclude_id and issue['id'] == exclude_id:
-                    continue
-                
-                issue_embedding = issue.get('embedding')
-                if not issue_embedding:
-                    logger.warning(f"⚠️ Issue {issue['id'][:8]} has no embedding")
+                encoded = issue.pop('embedding', None)
+                if (exclude_id and issue['id'] == exclude_id) or not encoded:
                     continue
-                
-                # Log embedding type for debugging
-                logger.info(f"📊 Issue {issue['id'][:8]} embedding type: {type(issue_embedding)}, length: {len(str(issue_embedding)[:50])}")
-                
-                # Compute cosine similarity in Python
-                similarity = self.ml_service.compute_similarity(embedding, issue_embedding)
-                logger.info(f"📊 Issue {issue['id'][:8]} similarity: {similarity:.4f}")
-                
-                if similarity >= threshold:
-                    similar_issues.append({
-                        'issue': issue,
-                        'similarity': round(similarity, 4)
-                    })
+                candidates.append(issue)
+                vectors.append(decode_vector(encoded))
+            
+            if not candidates:
+                return []
             
-            logger.info(f"📊 {len(similar_issues)} issues passed threshold {threshold}")
+            # One matrix product instead of a similarity call per issue
+            similarities = cosine_similarities(embedding, np.vstack(vectors))
+            similar_issues = [
+                {'issue': candidates[i], 'similarity': round(float(similarities[i]), 4)}
+                for i in np.argsort(-similarities)[:limit]
+                if similarities[i] >= threshold
+            ]
             
-            # Sort by similarity descending
-            similar_issues.sort(key=lambda x: x['similarity'], reverse=True)
-            return similar_issues[:limit]
+            logger.info(f"📊 {len(similar_issues)} of {len(candidates)} issues passed threshold {threshold}")
+            return similar_issues
             
         except Exception as e:
             logger.error(f"❌ Fallback search also failed: {e}")
             return []
     
+    @staticmethod
+    def _visible_issues(query, user_id: str, team_ids: Optional[List[str]] = None):
+        """Restrict a PostgREST query to the user's issues, plus their teams' issues when given"""
+        if team_ids:
+            return query.or_(f"user_id.eq.{user_id},team_id.in.({','.join(team_ids)})")
+        return query.eq("user_id", user_id)
+    
+    @staticmethod
+    def _filter_params(filters: Optional[IssueSearchFilters]) -> Dict[str, Any]:
+        """Search filters as match_issues / search_issues_fulltext arguments"""
+        if not filters or filters.is_empty():
+            return {}
+        
+        return {
+            'language_filter': filters.languages or None,
+            'severity_filter': [s.value for s in filters.severities] if filters.severities else None,
+            'status_filter': [s.value for s in filters.statuses] if filters.statuses else None,
+            'tags_filter': filters.tags or None,
+            'created_after': filters.created_after,
+            'created_before': filters.created_before
+        }
+    
+    async def _rpc(self, function: str, params: Dict[str, Any], user_id: str) -> List[Dict[str, Any]]:
+        """
+        Call a database function as the user
+        
+        Uses the direct pool (prepared statement, named arguments) when enabled,
+        otherwise PostgREST. Rows have the same shape either way.
+        """
+        if self.direct:
+            args = ", ".join(f"{name} => ${i}" for i, name in enumerate(params, 1))
+            values = [
+                value.astimezone(timezone.utc).replace(tzinfo=None)
+                if isinstance(value, datetime) and value.tzinfo else value
+                for value in params.values()
+            ]
+            return await self.direct.fetch(user_id, f"SELECT * FROM {function}({args})", *values)
+        
+        params = {k: v.isoformat() if isinstance(v, datetime) else v for k, v in params.items()}
+        return self.db.rpc(function, params).execute().data
+    
+    @staticmethod
+    def _apply_filters(query, filters: Optional[IssueSearchFilters]):
+        """Apply search filters to a PostgREST query on issues"""
+        if not filters:
+            return query
+        
+        if filters.languages:
+            query = query.in_("language", filters.languages)
+        if filters.severities:
+            query = query.in_("severity", [s.value for s in filters.severities])
+        if filters.statuses:
+            query = query.in_("status", [s.value for s in filters.statuses])
+        if filters.tags:
+            query = query.filter("tags", "ov", "{" + ",".join(f'"{tag}"' for tag in filters.tags) + "}")
+        if filters.created_after:
+            query = query.gte("created_at", filters.created_after.isoformat())
+        if filters.created_before:
+            query = query.lte("created_at", filters.created_before.isoformat())
+        return query
+    
     async def search_issues(
         self,
         query: str,
         user_id: str,
         threshold: float = 0.7,
-        limit: int = 10
+        limit: int = 10,
+        mode: SearchModeEnum = SearchModeEnum.auto,
+        filters: Optional[IssueSearchFilters] = None,
+        ef_search: Optional[int] = None,
+        scope: SearchScopeEnum = SearchScopeEnum.user
     ) -> List[Dict[str, Any]]:
         """
-        Search issues by natural language query
+        Search issues by natural language query or identifier
+        
+        Scope "team" also searches issues shared with the user's teams; the
+        teams are resolved once (cached) and searched in a single query.
+        
+        Modes:
+            semantic: embedding similarity only
+            lexical: BM25 over error type, message and tags (no model inference)
+            fulltext: Postgres full-text search with highlighted snippets (no model inference)
+            hybrid: both, fused with reciprocal rank fusion
+            auto: lexical for identifier-like queries, hybrid otherwise
+        
+        Results are cached per user until the user's next issue write (or the
+        cache TTL), so repeated searches skip embedding and the database.
         """
+        cache_key = search_cache.key(
+            user_id, query, threshold, limit, mode, scope, ef_search,
+            filters.model_dump_json() if filters else None
+        )
+        cached = search_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"⚡ Search cache hit: '{query}' ({len(cached)} results)")
+            return cached
+        version = search_cache.version(user_id)
+        
         try:
-            logger.info(f"🔍 Search query: '{query}' (threshold={threshold}, limit={limit})")
-            
-            # Generate embedding for query
-            query_embedding = self.ml_service.generate_embedding(query)
-            logger.info(f"📊 Generated embedding (length={len(query_embedding)}, first 3 vals: {query_embedding[:3]})")
-            
-            # Find similar issues
-            results = await self.find_similar_issues(
-                embedding=query_embedding,
-                user_id=user_id,
-                threshold=threshold,
-                limit=limit
-            )
+            if mode == SearchModeEnum.auto:
+                mode = SearchModeEnum.lexical if is_identifier_query(query) else SearchModeEnum.hybrid
+            
+            team_ids = None
+            if scope == SearchScopeEnum.team:
+                team_ids = await team_service.get_team_ids(self.db, user_id) or None
+            
+            logger.info(f"🔍 Search query: '{query}' (mode={mode.value}, scope={scope.value}, threshold={threshold}, limit={limit})")
+            
+            if mode == SearchModeEnum.lexical:
+                results = await self._lexical_search(query, user_id, limit, filters, team_ids)
+            elif mode == SearchModeEnum.fulltext:
+                results = await self._fulltext_search(query, user_id, limit, filters, team_ids)
+            elif mode == SearchModeEnum.semantic:
+                results = await self._semantic_search(query, user_id, threshold, limit, filters, ef_search, team_ids)
+            else:
+                # Over-fetch both lists so fusion has candidates beyond the final page
+                semantic = await self._semantic_search(query, user_id, threshold, limit * 2, filters, ef_search, team_ids)
+                lexical = await self._lexical_search(query, user_id, limit * 2, filters, team_ids)
+                results = self._fuse_rankings(semantic, lexical, limit)
             
             logger.info(f"✅ Search returned {len(results)} results")
+            search_cache.put(cache_key, version, results)
             return results
             
         except Exception as e:
             logger.error(f"❌ Search failed: {e}")
             raise
     
-    async def get_issue(self, issue_id: str, user_id: str) -> Optional[Dict]:
-        """Get issue by ID"""
+    async def _semantic_search(
+        self,
+        query: str,
+        user_id: str,
+        threshold: float,
+        limit: int,
+        filters: Optional[IssueSearchFilters] = None,
+        ef_search: Optional[int] = None,
+        team_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Embed the query and run vector similarity search"""
+        query_embedding = self.ml_service.generate_embedding(query)
+        
+        results = await self.find_similar_issues(
+            embedding=query_embedding,
+            user_id=user_id,
+            threshold=threshold,
+            limit=limit,
+            filters=filters,
+            ef_search=ef_search,
+            team_ids=team_ids
+        )
+        for result in results:
+            result['match'] = 'semantic'
+        return results
+    
+    async def _lexical_search(
+        self,
+        query: str,
+        user_id: str,
+        limit: int,
+        filters: Optional[IssueSearchFilters] = None,
+        team_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25 search; each hit carries its BM25 score
+        
+        BM25 scores are not comparable to cosine similarity, so similarity is
+        None and the similarity threshold does not apply. With filters, a
+        deeper candidate list is ranked and the filters are applied by the
+        issue fetch, so the page still fills up.
+        """
+        candidates = limit if not filters or filters.is_empty() else min(limit * 10, 200)
+        ranked = lexical_service.search(self.db, user_id, query, candidates, team_ids)
+        if not ranked:
+            return []
+        
+        issues = {
+            issue['id']: issue
+            for issue in await self._get_issues_by_ids([i for i, _ in ranked], user_id, filters, team_ids)
+        }
+        return [
+            {
+                'issue': issues[issue_id],
+                'similarity': None,
+                'score': round(score, 4),
+                'match': 'lexical'
+            }
+            for issue_id, score in ranked
+            if issue_id in issues
+        ][:limit]
+    
+    async def _fulltext_search(
+        self,
+        query: str,
+        user_id: str,
+        limit: int,
+        filters: Optional[IssueSearchFilters] = None,
+        team_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search through the GIN-indexed search_vector column
+        
+        Each result carries its ts_rank_cd score (similarity is None, as for
+        lexical hits) and a highlighted snippet.
+        """
+        rows = await self._rpc(
+            'search_issues_fulltext',
+            {
+                'query_text': query,
+                'user_id_filter': user_id,
+                'match_count': limit,
+                **self._filter_params(filters),
+                **({'team_ids_filter': team_ids} if team_ids else {})
+            },
+            user_id
+        )
+        
+        if not rows:
+            return []
+        
+        return [
+            {
+                'issue': {k: v for k, v in item.items() if k not in ('rank', 'snippet')},
+                'similarity': None,
+                'score': round(item['rank'], 4),
+                'snippet': item['snippet'],
+                'match': 'fulltext'
+            }
+            for item in rows
+        ]
+    
+    @staticmethod
+    def _fuse_rankings(
+        semantic: List[Dict[str, Any]],
+        lexical: List[Dict[str, Any]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge ranked lists with reciprocal rank fusion: score = sum of 1 / (RRF_K + rank)
+        
+        Results keep the vector similarity when the issue was found semantically
+        (lexical-only hits have none); score becomes the fused score.
+        """
+        fused: Dict[str, Dict[str, Any]] = {}
+        for ranking in (semantic, lexical):
+            for rank, result in enumerate(ranking, start=1):
+                issue_id = result['issue']['id']
+                entry = fused.get(issue_id)
+                if entry is None:
+                    entry = fused[issue_id] = {**result, 'score': 0.0}
+                else:
+                    entry['match'] = 'hybrid'
+                entry['score'] += 1 / (RRF_K + rank)
+        
+        results = sorted(fused.values(), key=lambda x: x['score'], reverse=True)[:limit]
+        for result in results:
+            result['score'] = round(result['score'], 6)
+        return results
+    
+    async def _get_issues_by_ids(
+        self,
+        issue_ids: List[str],
+        user_id: str,
+        filters: Optional[IssueSearchFilters] = None,
+        team_ids: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """Fetch several visible issues in one request"""
+        if not issue_ids:
+            return []
+        
+        query = self.db.table("issues").select(issue_select(preview=True)).in_("id", issue_ids)
+        query = self._visible_issues(query, user_id, team_ids)
+        return self._apply_filters(query, filters).execute().data
+    
+    async def find_issues_by_frame(
+        self,
+        user_id: str,
+        signature: Optional[str] = None,
+        file: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Find issues whose stack passes through a function or file
+        
+        Served by the GIN indexes on frame_signatures and frame_files, so no
+        stack trace text is scanned.
+        
+        Args:
+            user_id: Owner of the issues
+            signature: Frame signature ("module:function")
+            file: Source file name (e.g. "user_service.py")
+            limit: Page size
+            offset: Page start
+            
+        Returns:
+            Matching issues, most recent first
+        """
+        try:
+            query = self.db.table("issues").select(issue_select(preview=True)).eq("user_id", user_id)
+            
+            if signature:
+                query = query.contains("frame_signatures", [signature.strip()])
+            if file:
+                query = query.contains("frame_files", [file.strip().replace('\\', '/').rsplit('/', 1)[-1]])
+            
+            result = query.order("created_at", desc=True).limit(limit).offset(offset).execute()
+            return result.data
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to find issues by frame: {e}")
+            return []
+    
+    async def rebuild_frame_index(self, user_id: str) -> Dict[str, int]:
+        """Re-parse stored stack traces into frame columns and fingerprints (no embeddings)"""
+        result = self.db.table("issues")\
+            .select("id, error_type, error_message, stack_trace, language")\
+            .eq("user_id", user_id)\
+            .execute()
+        
+        updated_count = 0
+        for issue in result.data:
+            try:
+                self.db.table("issues").update({
+                    "fingerprint": compute_fingerprint(issue),
+                    **frame_columns(issue)
+                }).eq("id", issue['id']).execute()
+                updated_count += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to rebuild frames for issue {issue['id']}: {e}")
+        
+        search_cache.bump(user_id)
+        logger.info(f"✅ Rebuilt frame index for {updated_count}/{len(result.data)} issues")
+        return {"updated": updated_count, "total": len(result.data)}
+    
+    async def get_issue(self, issue_id: str, user_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        """Get issue by ID (all client columns, or only `fields`)"""
         try:
-            result = self.db.table("issues").select("*").eq("id", issue_id).eq("user_id", user_id).execute()
+            result = self.db.table("issues")\
+                .select(issue_select(fields))\
+                .eq("id", issue_id)\
+                .eq("user_id", user_id)\
+                .execute()
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"❌ Failed to get issue: {e}")
@@ -245,18 +815,48 @@ class IssueService:
         status: Optional[str] = None,
         severity: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[Tuple[str, str]] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
-        """List issues with filters"""
+        """
+        List issues with filters, newest first
+        
+        Args:
+            user_id: User ID
+            status: Optional status filter
+            severity: Optional severity filter
+            limit: Page size
+            offset: Rows to skip (ignored when paging by cursor)
+            after: (created_at, id) of the last issue of the previous page;
+                seeks past it on the index instead of skipping rows, so every
+                page costs the same and concurrent inserts don't shift pages
+            fields: Sparse fieldset; by default every client column, with
+                stack_trace and code_snippet truncated to previews
+            
+        Returns:
+            Issues ordered by (created_at, id) descending
+        """
         try:
-            query = self.db.table("issues").select("*").eq("user_id", user_id)
+            query = self.db.table("issues").select(issue_select(fields, preview=True)).eq("user_id", user_id)
             
             if status:
                 query = query.eq("status", status)
             if severity:
                 query = query.eq("severity", severity)
             
-            result = query.order("created_at", desc=True).limit(limit).offset(offset).execute()
+            if after:
+                created_at, issue_id = after
+                # The lte bound is redundant with the or_ but lets Postgres seek the index to it
+                query = query.lte("created_at", created_at)\
+                    .or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{issue_id})')
+            else:
+                query = query.offset(offset)
+            
+            result = query.order("created_at", desc=True)\
+                .order("id", desc=True)\
+                .limit(limit)\
+                .execute()
             return result.data
             
         except Exception as e:
@@ -279,28 +879,70 @@ class IssueService:
             # Prepare update data
             update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
             update_dict["updated_at"] = datetime.utcnow().isoformat()
+            resolving = update_dict.get('status') == 'resolved' and issue.get('status') != 'resolved'
+            if update_dict.get('status') not in (None, 'resolved'):
+                # Reopened: the next resolution is timed again
+                update_dict["resolved_at"] = None
             
             # If error content changed, regenerate embedding
             if any(k in update_dict for k in ['error_type', 'error_message', 'stack_trace', 'tags']):
                 merged_data = {**issue, **update_dict}
                 embedding_text = self.ml_service.create_embedding_text(merged_data)
                 embedding = self.ml_service.generate_embedding(embedding_text)
-                update_dict["embedding"] = embedding
+                update_dict["embedding"] = to_pgvector(embedding)
                 update_dict["embedding_text"] = embedding_text
+                update_dict["fingerprint"] = compute_fingerprint(merged_data)
+                update_dict.update(frame_columns(merged_data))
             
             # Update in database
             result = self.db.table("issues").update(update_dict).eq("id", issue_id).eq("user_id", user_id).execute()
             
-            return result.data[0] if result.data else None
+            if not result.data:
+                return None
+            
+            updated_issue = public_issue(result.data[0])
+            if resolving:
+                resolved = await self.record_resolutions([issue_id], user_id)
+                updated_issue['resolved_at'] = resolved.get(issue_id, updated_issue.get('resolved_at'))
+            lexical_service.upsert(user_id, updated_issue)
+            columnar_cache.upsert(user_id, updated_issue)
+            search_cache.bump(user_id)
+            analytics_cache.invalidate(user_id)
+            return updated_issue
             
         except Exception as e:
             logger.error(f"❌ Failed to update issue: {e}")
             return None
     
+    async def record_resolutions(self, issue_ids: List[str], user_id: str) -> Dict[str, Any]:
+        """
+        Stamp resolved_at on newly resolved issues and add them to the MTTR stats
+        
+        Issues that are not resolved, or were already recorded, are skipped, so
+        this is safe to call for any set of issues.
+        
+        Args:
+            issue_ids: Issues whose status was just set to resolved
+            user_id: Owner of the issues
+            
+        Returns:
+            resolved_at of each recorded issue, by issue ID
+        """
+        try:
+            rows = await self._rpc("record_resolution", {"issue_ids": issue_ids}, user_id)
+            return {str(row['issue_id']): row['resolved_at'] for row in rows}
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to record resolution of {len(issue_ids)} issues: {e}")
+            return {}
+    
     async def delete_issue(self, issue_id: str, user_id: str) -> bool:
         """Delete an issue"""
         try:
             result = self.db.table("issues").delete().eq("id", issue_id).eq("user_id", user_id).execute()
+            lexical_service.remove(user_id, issue_id)
+            columnar_cache.remove(user_id, issue_id)
+            search_cache.bump(user_id)
+            analytics_cache.invalidate(user_id)
             return len(result.data) > 0
         except Exception as e:
             logger.error(f"❌ Failed to delete issue: {e}")
@@ -0,0 +1,213 @@
+"""Lexical (BM25) search over issue identifiers, messages and tags"""
+
+from typing import List, Dict, Any, Tuple, Optional
+from collections import OrderedDict
+from supabase import Client
+import logging
+import math
+import re
+import time
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = 1000
+_WORD = re.compile(r"[A-Za-z0-9_]+")
+_CAMEL_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z]|\d|\b)|[A-Z]?[a-z]+|[A-Z]+|\d+")
+# Identifier-like: CamelCase, snake_case, dotted names, error codes (E11000, ECONNREFUSED, 0x80004005)
+_IDENTIFIER = re.compile(
+    r"^(?:(?:[A-Za-z_$][\w$]*[.:])+[A-Za-z_$][\w$]*"
+    r"|[a-z]+[A-Z]\w*|[A-Z][a-z0-9]+[A-Z]\w*|\w*_\w*|[A-Z][A-Z0-9_]{2,}|[A-Za-z]+\d+\w*|0x[0-9A-Fa-f]+|\d{3,})$"
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lexical terms
+
+    Identifiers are kept whole and also split into their camelCase/snake_case
+    parts, so "NullPointerException" matches both itself and "null pointer".
+    """
+    terms = []
+    for word in _WORD.findall(text or ""):
+        terms.append(word.lower())
+        parts = [p.lower() for piece in word.split('_') for p in _CAMEL_PART.findall(piece)]
+        if len(parts) > 1:
+            terms.extend(parts)
+    return terms
+
+
+def is_identifier_query(query: str) -> bool:
+    """True when every word of a short query looks like an identifier or error code"""
+    words = query.split()
+    return 0 < len(words) <= 3 and all(_IDENTIFIER.match(w.strip("'\"()[],")) for w in words)
+
+
+class LexicalIndex:
+    """In-memory BM25 index over one user's issues"""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_terms: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.total_length = 0
+        self.built_at = time.monotonic()
+
+    @staticmethod
+    def issue_terms(issue: Dict[str, Any]) -> List[str]:
+        """Terms indexed for an issue; the error type counts twice as it is the strongest signal"""
+        error_type = tokenize(issue.get('error_type') or '')
+        return (
+            error_type * 2
+            + tokenize(issue.get('error_message') or '')
+            + tokenize(' '.join(issue.get('tags') or []))
+        )
+
+    def upsert(self, issue: Dict[str, Any]):
+        """Add or replace an issue"""
+        self.remove(issue['id'])
+
+        counts: Dict[str, int] = {}
+        for term in self.issue_terms(issue):
+            counts[term] = counts.get(term, 0) + 1
+
+        self.doc_terms[issue['id']] = counts
+        self.doc_lengths[issue['id']] = sum(counts.values())
+        self.total_length += self.doc_lengths[issue['id']]
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[issue['id']] = tf
+
+    def remove(self, issue_id: str):
+        """Remove an issue if present"""
+        counts = self.doc_terms.pop(issue_id, None)
+        if counts is None:
+            return
+
+        self.total_length -= self.doc_lengths.pop(issue_id)
+        for term in counts:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(issue_id, None)
+                if not posting:
+                    del self.postings[term]
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank issues by BM25 score
+
+        Returns:
+            (issue_id, score) pairs, best first
+        """
+        n_docs = len(self.doc_terms)
+        if n_docs == 0:
+            return []
+
+        avg_length = self.total_length / n_docs
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+
+            idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for issue_id, tf in posting.items():
+                norm = tf + self.K1 * (1 - self.B + self.B * self.doc_lengths[issue_id] / avg_length)
+                scores[issue_id] = scores.get(issue_id, 0.0) + idf * tf * (self.K1 + 1) / norm
+
+        return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+
+class LexicalService:
+    """Per-user lexical indexes, built lazily and kept up to date on writes"""
+
+    def __init__(self, max_users: int = 100, ttl_seconds: int = 300):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._indexes: "OrderedDict[str, LexicalIndex]" = OrderedDict()
+
+    def get_index(self, db: Client, user_id: str, team_ids: Optional[List[str]] = None) -> LexicalIndex:
+        """
+        Get the user's index, (re)building it when missing or older than the TTL
+
+        With team_ids, a separate index also covering the teams' issues is used;
+        it is refreshed by TTL only, since teammates' writes are not observed here.
+        """
+        key = f"team:{user_id}" if team_ids else user_id
+        index = self._indexes.get(key)
+        if index is not None and time.monotonic() - index.built_at < self.ttl_seconds:
+            self._indexes.move_to_end(key)
+            return index
+
+        index = LexicalIndex()
+        indexed = 0
+        # Keyset pages: PostgREST caps the rows of a single response
+        last_id = None
+        while True:
+            query = db.table("issues")\
+                .select("id, error_type, error_message, tags")\
+                .order("id")\
+                .limit(_PAGE_SIZE)
+            if team_ids:
+                query = query.or_(f"user_id.eq.{user_id},team_id.in.({','.join(team_ids)})")
+            else:
+                query = query.eq("user_id", user_id)
+            if last_id:
+                query = query.gt("id", last_id)
+            page = query.execute().data
+            for issue in page:
+                index.upsert(issue)
+            indexed += len(page)
+            if len(page) < _PAGE_SIZE:
+                break
+            last_id = page[-1]['id']
+
+        self._indexes[key] = index
+        self._indexes.move_to_end(key)
+        while len(self._indexes) > self.max_users:
+            self._indexes.popitem(last=False)
+
+        logger.info(f"📚 Built lexical index for user {user_id[:8]} ({indexed} issues)")
+        return index
+
+    def search(
+        self,
+        db: Client,
+        user_id: str,
+        query: str,
+        limit: int = 10,
+        team_ids: Optional[List[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """BM25 search over the user's issues (and their teams' when team_ids is given)"""
+        return self.get_index(db, user_id, team_ids).search(query, limit)
+
+    def upsert(self, user_id: str, issue: Dict[str, Any]):
+        """Reflect a created or updated issue in already built indexes"""
+        for key in (user_id, f"team:{user_id}"):
+            index = self._indexes.get(key)
+            if index is not None:
+                index.upsert(issue)
+
+    def remove(self, user_id: str, issue_id: str):
+        """Reflect a deleted issue in already built indexes"""
+        for key in (user_id, f"team:{user_id}"):
+            index = self._indexes.get(key)
+            if index is not None:
+                index.remove(issue_id)
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """Drop one user's indexes (or all) after writes that bypass IssueService"""
+        if user_id is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(user_id, None)
+            self._indexes.pop(f"team:{user_id}", None)
+
+
+# Global lexical service instance
+lexical_service = LexicalService(
+    max_users=settings.lexical_index_max_users,
+    ttl_seconds=settings.lexical_index_ttl_seconds
+)
@@ -4,6 +4,9 @@ from typing import List, TYPE_CHECKING
 import numpy as np
 import logging
 from app.config import settings
+from app.utils.fingerprint import normalize_stack_trace
+from app.utils.stacktrace import app_frames, frame_signature, parse_stack_trace
+from app.utils.vectors import parse_vector
 
 if TYPE_CHECKING:
     from sentence_transformers import SentenceTransformer
@@ -49,10 +52,14 @@ class MLService:
             f"Message: {issue_data.get('error_message', '')}"
         ]
         
-        # Add stack trace (top 5 lines only)
+        # Add stack trace: top 5 application frames when parseable, else top 5 normalized lines
         if issue_data.get('stack_trace'):
-            stack_lines = issue_data['stack_trace'].split('\n')[:5]
-            components.append(f"Stack: {' '.join(stack_lines)}")
+            frames = app_frames(parse_stack_trace(issue_data['stack_trace'], issue_data.get('language')))
+            if frames:
+                components.append(f"Frames: {' > '.join(frame_signature(f) for f in frames[:5])}")
+            else:
+                stack_lines = normalize_stack_trace(issue_data['stack_trace'])
+                components.append(f"Stack: {' '.join(stack_lines)}")
         
         # Add tags
         if issue_data.get('tags'):
@@ -102,23 +109,95 @@ class MLService:
             logger.warning("Returning zero vector as fallback")
             return [0.0] * 384
     
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embedding vectors for a batch of texts in a single encode call
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            List of embedding vectors, in input order
+        """
+        if not texts:
+            return []
+        
+        cleaned = []
+        for text in texts:
+            if not text or not isinstance(text, str):
+                text = "Empty error"
+            cleaned.append(str(text)[:5000].strip())
+        
+        try:
+            embeddings = self.model.encode(
+                cleaned,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+            return embeddings.tolist()
+        except Exception as e:
+            logger.error(f"❌ Failed to generate batch embeddings: {e}")
+            logger.warning("Returning zero vectors as fallback")
+            return [[0.0] * 384 for _ in texts]
+    
+    def cluster_duplicates(
+        self,
+        embeddings: List[List[float]],
+        threshold: float = 0.9,
+        block_size: int = 256
+    ) -> List[List[int]]:
+        """
+        Group near-identical items of a batch by pairwise cosine similarity
+        
+        The similarity matrix is computed one block of rows at a time so memory
+        stays at block_size x n. Items are assigned greedily in input order: the
+        first unassigned item of a cluster becomes its leader and absorbs every
+        unassigned item whose similarity to it is >= threshold.
+        
+        Args:
+            embeddings: Embedding vectors of the batch
+            threshold: Minimum cosine similarity for two items to be duplicates
+            block_size: Number of rows of the similarity matrix computed at once
+            
+        Returns:
+            Clusters as lists of input indices; the first index is the leader
+        """
+        n = len(embeddings)
+        if n == 0:
+            return []
+        
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+        
+        assigned = np.zeros(n, dtype=bool)
+        clusters = []
+        for start in range(0, n, block_size):
+            block = vectors[start:start + block_size] @ vectors.T
+            for offset, row in enumerate(block):
+                leader = start + offset
+                if assigned[leader]:
+                    continue
+                members = np.flatnonzero((row >= threshold) & ~assigned)
+                # Zero vectors (failed embeddings) only match themselves
+                if leader not in members:
+                    members = np.array([leader])
+                assigned[members] = True
+                clusters.append([leader] + [int(i) for i in members if i != leader])
+        
+        return clusters
+    
     def compute_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """
         Compute cosine similarity between two embeddings
-        Handles both float arrays and string representations
+        Handles float arrays, pgvector text and base64 vector_send() output
         """
         try:
-            # Convert from string if needed (Supabase stores as text)
-            if isinstance(embedding1, str):
-                import json
-                embedding1 = json.loads(embedding1)
-            if isinstance(embedding2, str):
-                import json
-                embedding2 = json.loads(embedding2)
-            
-            # Ensure we have float arrays
-            vec1 = np.array(embedding1, dtype=np.float32)
-            vec2 = np.array(embedding2, dtype=np.float32)
+            vec1 = parse_vector(embedding1)
+            vec2 = parse_vector(embedding2)
+            if vec1 is None or vec2 is None:
+                return 0.0
             
             # Cosine similarity
             dot_product = np.dot(vec1, vec2)
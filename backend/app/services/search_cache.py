@@ -0,0 +1,109 @@
+"""Per-user cache of search results, invalidated by the user's issue writes"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import logging
+import time
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query (every search mode ignores both)"""
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """
+    Bounded LRU of search results keyed by user and search parameters
+
+    Each entry is tagged with the user's write version at the time the search
+    started. Any issue create, update or delete by the user bumps the version,
+    so older entries stop matching at once without scanning the cache; they are
+    dropped when next read or evicted. Results for team scope also include
+    teammates' issues, whose writes are not seen here, so the TTL bounds how
+    stale those can get.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: int = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "expired": 0, "evictions": 0}
+
+    @staticmethod
+    def key(user_id: str, query: str, *params: Any) -> Tuple:
+        """
+        Cache key for a search
+
+        Args:
+            user_id: Authenticated user ID
+            query: Raw query text (normalized here)
+            params: Every other parameter that changes the results (threshold,
+                limit, mode, filters, ...); must be hashable
+
+        Returns:
+            Hashable key
+        """
+        return (user_id, normalize_query(query)) + params
+
+    def version(self, user_id: str) -> int:
+        """Current write version of a user; read before searching and pass to put()"""
+        return self._versions.get(user_id, 0)
+
+    def get(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """Cached results, or None on a miss, an expired entry or a newer write"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        version, expires_at, results = entry
+        if version != self.version(key[0]) or expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats["stale" if version != self.version(key[0]) else "expired"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return results
+
+    def put(self, key: Tuple, version: int, results: List[Dict[str, Any]]):
+        """
+        Store results computed at a write version
+
+        A write that landed while the search ran has already bumped the
+        version, so the entry is born stale and never served.
+        """
+        if version != self.version(key[0]):
+            return
+
+        self._entries[key] = (version, time.monotonic() + self.ttl_seconds, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def bump(self, user_id: str):
+        """Invalidate every cached search of a user (call after any issue write)"""
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Size, counters and hit rate for metrics"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global search cache instance
+search_cache = SearchCache(
+    max_entries=settings.search_cache_max_entries,
+    ttl_seconds=settings.search_cache_ttl_seconds
+)
@@ -0,0 +1,261 @@
+"""Streaming sketches of issue occurrences for approximate analytics"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from supabase import Client
+import asyncio
+import logging
+from app.config import settings
+from app.database import db
+from app.utils.sketches import HyperLogLog, SpaceSaving
+
+logger = logging.getLogger(__name__)
+
+# Compare-and-swap passes per flush; deltas still conflicting after them wait for the next flush
+MAX_FLUSH_ATTEMPTS = 5
+
+
+class OccurrenceSketch:
+    """Sketches of one user's occurrences in one UTC day"""
+
+    def __init__(self, k: int = 100, p: int = 12):
+        self.events = 0
+        self.error_types = SpaceSaving(k)
+        self.fingerprints = SpaceSaving(k)
+        self.distinct_fingerprints = HyperLogLog(p)
+        self.distinct_environments = HyperLogLog(p)
+
+    def add(self, issue: Dict[str, Any], count: int = 1):
+        """Record count occurrences of an issue"""
+        self.events += count
+        self.error_types.add(issue.get('error_type') or 'Unknown', count)
+        if issue.get('fingerprint'):
+            self.fingerprints.add(issue['fingerprint'], count)
+            self.distinct_fingerprints.add(issue['fingerprint'])
+        self.distinct_environments.add(issue.get('environment') or 'Unknown')
+
+    def merge(self, other: "OccurrenceSketch") -> "OccurrenceSketch":
+        """Sketch of both streams (e.g. several days, or stored state plus new deltas)"""
+        result = OccurrenceSketch.__new__(OccurrenceSketch)
+        result.events = self.events + other.events
+        result.error_types = self.error_types.merge(other.error_types)
+        result.fingerprints = self.fingerprints.merge(other.fingerprints)
+        result.distinct_fingerprints = self.distinct_fingerprints.merge(other.distinct_fingerprints)
+        result.distinct_environments = self.distinct_environments.merge(other.distinct_environments)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "error_types": self.error_types.to_dict(),
+            "fingerprints": self.fingerprints.to_dict(),
+            "distinct_fingerprints": self.distinct_fingerprints.to_dict(),
+            "distinct_environments": self.distinct_environments.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OccurrenceSketch":
+        sketch = cls.__new__(cls)
+        sketch.events = data["events"]
+        sketch.error_types = SpaceSaving.from_dict(data["error_types"])
+        sketch.fingerprints = SpaceSaving.from_dict(data["fingerprints"])
+        sketch.distinct_fingerprints = HyperLogLog.from_dict(data["distinct_fingerprints"])
+        sketch.distinct_environments = HyperLogLog.from_dict(data["distinct_environments"])
+        return sketch
+
+
+class SketchService:
+    """
+    Maintains per-user, per-day occurrence sketches and persists them
+
+    Ingest only updates in-memory deltas (O(k) at worst, usually O(1)). A
+    periodic flush merges the deltas into the analytics_sketches table with
+    the admin client and clears them, so memory holds at most one flush
+    interval of changes. Reads merge the stored days of the window with any
+    unflushed deltas.
+
+    Each stored row carries a version: a flush writes a merged row only if
+    the version it read is unchanged, and re-reads and re-merges on conflict,
+    so flushes from several processes never overwrite each other's deltas.
+    """
+
+    def __init__(self, top_k: int = 100, precision: int = 12, flush_seconds: float = 60, max_pending_users: int = 1000):
+        self.top_k = top_k
+        self.precision = precision
+        self.flush_seconds = flush_seconds
+        self.max_pending_users = max_pending_users
+        self._pending: Dict[Tuple[str, str], OccurrenceSketch] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._early_flush: Optional[asyncio.Task] = None
+
+    def record(self, user_id: str, issue: Dict[str, Any], count: int = 1):
+        """
+        Record occurrences of an issue (new or deduplicated)
+
+        Args:
+            user_id: Owner of the issue
+            issue: Stored issue row (error_type, fingerprint, environment)
+            count: Number of occurrences
+        """
+        day = datetime.now(timezone.utc).date().isoformat()
+        sketch = self._pending.get((user_id, day))
+        if sketch is None:
+            sketch = self._pending[(user_id, day)] = OccurrenceSketch(self.top_k, self.precision)
+        sketch.add(issue, count)
+
+        # Keep a reference to the early flush: the loop holds tasks only weakly
+        if len(self._pending) > self.max_pending_users and (self._early_flush is None or self._early_flush.done()):
+            self._early_flush = asyncio.get_running_loop().create_task(self.flush())
+
+    async def flush(self):
+        """Merge pending deltas into the stored sketches"""
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+
+            total = len(pending)
+            try:
+                admin = db.admin_client
+                for _ in range(MAX_FLUSH_ATTEMPTS):
+                    self._store(admin, pending)
+                    if not pending:
+                        break
+                logger.info(f"📊 Flushed {total - len(pending)} occurrence sketches")
+                if pending:
+                    logger.warning(f"⚠️ {len(pending)} occurrence sketches kept conflicting, retrying on the next flush")
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to flush occurrence sketches: {e}")
+
+            # Keep the deltas that were not stored for the next attempt
+            for key, delta in pending.items():
+                current = self._pending.get(key)
+                self._pending[key] = delta.merge(current) if current else delta
+
+    @staticmethod
+    def _store(admin: Client, pending: Dict[Tuple[str, str], OccurrenceSketch]):
+        """
+        One compare-and-swap pass over the pending deltas
+
+        New rows are inserted unless another writer created them first; stored
+        rows are updated only if their version is the one read. Stored deltas
+        are removed from pending, conflicting ones stay for another pass.
+        """
+        stored = admin.table("analytics_sketches")\
+            .select("user_id, bucket, state, version")\
+            .in_("user_id", sorted({user_id for user_id, _ in pending}))\
+            .in_("bucket", sorted({day for _, day in pending}))\
+            .execute()
+        stored_rows = {(row['user_id'], row['bucket']): row for row in stored.data}
+
+        now = datetime.now(timezone.utc).isoformat()
+        new_rows = [
+            {"user_id": user_id, "bucket": day, "state": delta.to_dict(), "updated_at": now}
+            for (user_id, day), delta in pending.items()
+            if (user_id, day) not in stored_rows
+        ]
+        if new_rows:
+            inserted = admin.table("analytics_sketches")\
+                .upsert(new_rows, ignore_duplicates=True)\
+                .execute()
+            for row in inserted.data:
+                pending.pop((row['user_id'], row['bucket']), None)
+
+        for key, row in stored_rows.items():
+            delta = pending.get(key)
+            if delta is None:
+                continue
+            merged = OccurrenceSketch.from_dict(row['state']).merge(delta)
+            updated = admin.table("analytics_sketches")\
+                .update({"state": merged.to_dict(), "version": row['version'] + 1, "updated_at": now})\
+                .eq("user_id", key[0])\
+                .eq("bucket", key[1])\
+                .eq("version", row['version'])\
+                .execute()
+            if updated.data:
+                del pending[key]
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    def start(self):
+        """Start the periodic flush (application startup)"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def stop(self):
+        """Stop the periodic flush and persist what is pending (application shutdown)"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    async def summarize(self, user_db: Client, user_id: str, days: int = 7, top: int = 10) -> Dict[str, Any]:
+        """
+        Approximate occurrence analytics for the last N days
+
+        Args:
+            user_db: User's client (reads stored sketches under RLS)
+            user_id: Authenticated user ID
+            days: Window in UTC days, including today
+            top: Heavy hitters to return
+
+        Returns:
+            Event total, top error types and fingerprints with count bounds,
+            distinct fingerprint and environment estimates, and the error bounds
+        """
+        start = (datetime.now(timezone.utc) - timedelta(days=days - 1)).date().isoformat()
+
+        result = user_db.table("analytics_sketches")\
+            .select("bucket, state")\
+            .eq("user_id", user_id)\
+            .gte("bucket", start)\
+            .execute()
+
+        sketch = OccurrenceSketch(self.top_k, self.precision)
+        buckets = set()
+        for row in result.data:
+            sketch = sketch.merge(OccurrenceSketch.from_dict(row['state']))
+            buckets.add(row['bucket'])
+        for (pending_user, day), delta in self._pending.items():
+            if pending_user == user_id and day >= start:
+                sketch = sketch.merge(delta)
+                buckets.add(day)
+
+        def heavy_hitters(summary: SpaceSaving) -> List[Dict[str, Any]]:
+            return [
+                {"value": item, "count": count, "min_count": count - error}
+                for item, count, error in summary.top(top)
+            ]
+
+        def distinct(hll: HyperLogLog) -> Dict[str, Any]:
+            return {"estimate": round(hll.count()), "relative_std_error": round(hll.relative_error, 4)}
+
+        return {
+            "days": days,
+            "since": min(buckets) if buckets else None,
+            "events": sketch.events,
+            "top_error_types": heavy_hitters(sketch.error_types),
+            "top_fingerprints": heavy_hitters(sketch.fingerprints),
+            "distinct_fingerprints": distinct(sketch.distinct_fingerprints),
+            "distinct_environments": distinct(sketch.distinct_environments),
+            "error_bounds": {
+                "top_counts": (
+                    "Space-Saving: each true count lies in [min_count, count]; the overestimate "
+                    f"is at most events / {sketch.error_types.k} = {round(sketch.error_types.max_error, 1)}, "
+                    "and every value occurring more often than that is listed"
+                ),
+                "distinct": f"HyperLogLog: relative standard error {sketch.distinct_environments.relative_error:.1%}",
+            },
+        }
+
+
+# Global sketch service instance
+sketch_service = SketchService(
+    top_k=settings.sketch_top_k,
+    precision=settings.sketch_hll_precision,
+    flush_seconds=settings.sketch_flush_seconds
+)
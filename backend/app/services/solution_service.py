@@ -5,6 +5,7 @@ from supabase import Client
 import logging
 from datetime import datetime
 from app.models.solution import SolutionCreate, SolutionUpdate, SolutionFeedback
+from app.services.analytics_cache import analytics_cache
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,7 @@ class SolutionService:
             if not result.data:
                 raise Exception("Failed to create solution")
             
+            analytics_cache.invalidate(user_id)
             logger.info(f"✅ Created solution: {result.data[0]['id']}")
             return result.data[0]
             
@@ -87,6 +89,7 @@ class SolutionService:
                 .eq("created_by", user_id)\
                 .execute()
             
+            analytics_cache.invalidate(user_id)
             return result.data[0] if result.data else None
             
         except Exception as e:
@@ -102,6 +105,7 @@ class SolutionService:
                 .eq("created_by", user_id)\
                 .execute()
             
+            analytics_cache.invalidate(user_id)
             return len(result.data) > 0
         except Exception as e:
             logger.error(f"❌ Failed to delete solution: {e}")
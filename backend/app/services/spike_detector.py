@@ -0,0 +1,228 @@
+"""Online detection of occurrence spikes and regressions of known issues"""
+
+from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from datetime import datetime, timezone
+import asyncio
+import logging
+import math
+import time
+from app.config import settings
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+SPIKE = "spike"
+REGRESSION = "regression"
+
+MAX_PENDING_EVENTS = 10000
+
+
+class _Rates:
+    """Exponentially decayed occurrence rates of one issue (events per second)"""
+
+    __slots__ = ("short", "long", "updated_at", "first_seen", "alerting")
+
+    def __init__(self, baseline: float, first_seen: float, now: float):
+        self.short = baseline
+        self.long = baseline
+        self.updated_at = now
+        self.first_seen = first_seen
+        self.alerting = False
+
+
+class SpikeDetector:
+    """
+    Flags issues whose occurrence rate jumps well above their own baseline
+
+    Each issue keeps two exponentially weighted rates, a short one (recent
+    rate) and a long one (baseline), updated in O(1) per occurrence. A spike is
+    reported when the short rate exceeds factor x the long rate with at least
+    min_events recent occurrences, once per excursion: the alert re-arms only
+    after the short rate falls back below half the trigger level. An issue
+    seen for the first time in this process is seeded with its historical
+    average rate (occurrences since first_occurred_at), so restarts do not
+    report every known issue as a spike.
+
+    Memory is bounded: issues are kept in LRU order, idle ones are
+    evicted after idle_seconds and the least recently seen beyond
+    max_issues.
+
+    observe() only classifies; the caller passes the returned event to
+    record() once the occurrences are stored, so a failed update neither
+    queues an event nor uses up the excursion's alert. Recorded events are
+    buffered and written to issue_events in bulk by a periodic flush.
+    """
+
+    def __init__(
+        self,
+        short_half_life: float = 300,
+        long_half_life: float = 86400,
+        factor: float = 5.0,
+        min_events: int = 5,
+        min_age_seconds: float = 3600,
+        max_issues: int = 100000,
+        idle_seconds: float = 7 * 86400,
+        flush_seconds: float = 60
+    ):
+        self.short_tau = short_half_life / math.log(2)
+        self.long_tau = long_half_life / math.log(2)
+        self.factor = factor
+        self.min_events = min_events
+        self.min_age_seconds = min_age_seconds
+        self.max_issues = max_issues
+        self.idle_seconds = idle_seconds
+        self.flush_seconds = flush_seconds
+        self._rates: "OrderedDict[str, _Rates]" = OrderedDict()
+        self._events: List[Dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"observed": 0, "spikes": 0, "regressions": 0, "evictions": 0}
+
+    @staticmethod
+    def _timestamp(value: Optional[str]) -> Optional[float]:
+        """Epoch seconds of a stored timestamp (naive values are UTC)"""
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
+    def _state(self, key: str, issue: Dict[str, Any], now: float) -> _Rates:
+        """Rates for an issue, seeded from the issue's history when new; evicts idle entries"""
+        state = self._rates.get(key)
+        if state is not None:
+            self._rates.move_to_end(key)
+        else:
+            first_seen = self._timestamp(issue.get('first_occurred_at') or issue.get('created_at')) or now
+            age = max(now - first_seen, 1.0)
+            state = self._rates[key] = _Rates((issue.get('occurrences') or 1) / age, first_seen, now)
+
+        while self._rates:
+            oldest = next(iter(self._rates.values()))
+            if len(self._rates) <= self.max_issues and now - oldest.updated_at < self.idle_seconds:
+                break
+            self._rates.popitem(last=False)
+            self.stats["evictions"] += 1
+        return state
+
+    def observe(self, issue: Dict[str, Any], count: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        Record occurrences of a stored issue and classify them
+
+        Args:
+            issue: Issue row before this update (id, user_id, status,
+                occurrences, first_occurred_at / created_at)
+            count: Number of new occurrences
+
+        Returns:
+            An issue_events row of kind "regression" if the issue was
+            resolved, "spike" on the first occurrence of a rate spike,
+            otherwise None. Pass it to record() once the update is stored.
+        """
+        now = time.time()
+        # A stored issue has one fingerprint, and rows found by vector search carry none
+        key = issue['id']
+        state = self._state(key, issue, now)
+        self.stats["observed"] += count
+
+        # Decay both rates to now, then add the new occurrences (O(1))
+        dt = max(now - state.updated_at, 0.0)
+        state.short = state.short * math.exp(-dt / self.short_tau) + count / self.short_tau
+        state.long = state.long * math.exp(-dt / self.long_tau) + count / self.long_tau
+        state.updated_at = now
+
+        trigger = self.factor * state.long
+        recent_events = state.short * self.short_tau
+        if state.alerting and state.short < trigger / 2:
+            state.alerting = False
+
+        kind = None
+        if issue.get('status') == 'resolved':
+            kind = REGRESSION
+        elif (
+            not state.alerting
+            and state.short > trigger
+            and recent_events >= self.min_events
+            and now - state.first_seen >= self.min_age_seconds
+        ):
+            kind = SPIKE
+
+        if not kind:
+            return None
+        return {
+            "issue_id": issue['id'],
+            "user_id": issue.get('user_id'),
+            "kind": kind,
+            "details": {
+                "count": count,
+                "recent_events": round(recent_events, 2),
+                "short_rate_per_hour": round(state.short * 3600, 4),
+                "baseline_rate_per_hour": round(state.long * 3600, 4),
+                "previous_status": issue.get('status')
+            },
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+
+    def record(self, event: Dict[str, Any]):
+        """Queue an event returned by observe() after the issue update succeeded"""
+        kind = event["kind"]
+        if kind == SPIKE:
+            # Fire once per excursion, re-armed when the short rate falls back
+            state = self._rates.get(event["issue_id"])
+            if state is not None:
+                state.alerting = True
+        self.stats["spikes" if kind == SPIKE else "regressions"] += 1
+        details = event["details"]
+        logger.warning(f"⚠️ {kind.capitalize()} of issue {event['issue_id']}: {details['recent_events']:.0f} recent occurrences, {details['short_rate_per_hour'] / max(details['baseline_rate_per_hour'], 1e-12):.1f}x baseline")
+        self._events.append(event)
+
+    async def flush(self):
+        """Write buffered events to issue_events in one insert"""
+        async with self._flush_lock:
+            events, self._events = self._events, []
+            if not events:
+                return
+            try:
+                db.admin_client.table("issue_events").insert(events).execute()
+                logger.info(f"📊 Stored {len(events)} issue events")
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to store issue events: {e}")
+                # Keep them for the next attempt, bounded while the database is unavailable
+                self._events = (events + self._events)[-MAX_PENDING_EVENTS:]
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    def start(self):
+        """Start the periodic event flush (application startup)"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def stop(self):
+        """Stop the periodic flush and store pending events (application shutdown)"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Tracked issues, pending events and counters for metrics"""
+        return {"issues": len(self._rates), "pending_events": len(self._events), **self.stats}
+
+
+# Global spike detector instance
+spike_detector = SpikeDetector(
+    short_half_life=settings.spike_short_half_life_seconds,
+    long_half_life=settings.spike_long_half_life_seconds,
+    factor=settings.spike_factor,
+    min_events=settings.spike_min_events,
+    max_issues=settings.spike_max_issues,
+    idle_seconds=settings.spike_idle_seconds
+)
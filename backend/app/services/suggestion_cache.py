@@ -0,0 +1,146 @@
+"""Per-user cache of AI solution suggestions, exact by fingerprint and semantic by embedding"""
+
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+import logging
+import time
+import numpy as np
+from app.config import settings
+from app.utils.vectors import cosine_similarities, parse_vector
+
+logger = logging.getLogger(__name__)
+
+EXACT = "exact"
+SEMANTIC = "semantic"
+
+
+class _Entry:
+    __slots__ = ("issue_id", "error_type", "embedding", "suggestion", "expires_at")
+
+    def __init__(self, issue: Dict[str, Any], embedding: Optional[np.ndarray], suggestion: Dict[str, Any], expires_at: float):
+        self.issue_id = issue.get('id')
+        self.error_type = issue.get('error_type')
+        self.embedding = embedding
+        self.suggestion = suggestion
+        self.expires_at = expires_at
+
+
+class SuggestionCache:
+    """
+    Reuses generated suggestions for the same or a near-identical issue
+
+    Exact tier: keyed by the issue fingerprint (the issue id when it has none),
+    so asking twice about one issue, or about a deduplicated recurrence, does
+    not call the LLM again. Semantic tier: on an exact miss, the user's cached
+    issues are compared by embedding and the best one at or above
+    similarity_threshold with the same error type is reused.
+
+    Entries are scoped to their user (suggestions quote the user's error
+    messages and code), expire after ttl_seconds, and are bounded per user and
+    in number of users, least recently used first.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 86400,
+        similarity_threshold: float = 0.95,
+        max_entries_per_user: int = 200,
+        max_users: int = 1000
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.max_entries_per_user = max_entries_per_user
+        self.max_users = max_users
+        self._users: "OrderedDict[str, OrderedDict[str, _Entry]]" = OrderedDict()
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    @staticmethod
+    def _key(issue: Dict[str, Any]) -> str:
+        return issue.get('fingerprint') or f"id:{issue['id']}"
+
+    def get(self, user_id: str, issue: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Cached suggestion for an issue
+
+        Args:
+            user_id: Authenticated user ID
+            issue: Issue row (id, fingerprint, error_type, embedding)
+
+        Returns:
+            (suggestion, "exact" or "semantic"), or None on a miss
+        """
+        entries = self._users.get(user_id)
+        if not entries:
+            self.stats["misses"] += 1
+            return None
+        self._users.move_to_end(user_id)
+
+        now = time.monotonic()
+        expired = [key for key, entry in entries.items() if entry.expires_at <= now]
+        for key in expired:
+            del entries[key]
+        self.stats["expired"] += len(expired)
+
+        key = self._key(issue)
+        entry = entries.get(key)
+        if entry is not None:
+            entries.move_to_end(key)
+            self.stats["exact_hits"] += 1
+            return entry.suggestion, EXACT
+
+        embedding = parse_vector(issue.get('embedding'))
+        candidates = [
+            (key, entry) for key, entry in entries.items()
+            if embedding is not None and entry.embedding is not None
+            and entry.error_type == issue.get('error_type') and entry.embedding.shape == embedding.shape
+        ]
+        if candidates:
+            scores = cosine_similarities(embedding, np.vstack([entry.embedding for _, entry in candidates]))
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity_threshold:
+                key, entry = candidates[best]
+                entries.move_to_end(key)
+                self.stats["semantic_hits"] += 1
+                logger.info(f"⚡ Reusing AI suggestion of issue {entry.issue_id} (similarity {scores[best]:.3f})")
+                return entry.suggestion, SEMANTIC
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, user_id: str, issue: Dict[str, Any], suggestion: Dict[str, Any]):
+        """Store a freshly generated suggestion for an issue"""
+        entries = self._users.get(user_id)
+        if entries is None:
+            entries = self._users[user_id] = OrderedDict()
+        self._users.move_to_end(user_id)
+
+        key = self._key(issue)
+        entries[key] = _Entry(issue, parse_vector(issue.get('embedding')), suggestion, time.monotonic() + self.ttl_seconds)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries_per_user:
+            entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        while len(self._users) > self.max_users:
+            _, dropped = self._users.popitem(last=False)
+            self.stats["evictions"] += len(dropped)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Size, counters and hit rates for metrics"""
+        hits = self.stats["exact_hits"] + self.stats["semantic_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            "users": len(self._users),
+            "entries": sum(len(entries) for entries in self._users.values()),
+            **self.stats,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "semantic_hit_rate": round(self.stats["semantic_hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global suggestion cache instance
+suggestion_cache = SuggestionCache(
+    ttl_seconds=settings.suggestion_cache_ttl_seconds,
+    similarity_threshold=settings.suggestion_cache_similarity_threshold,
+    max_entries_per_user=settings.suggestion_cache_max_entries_per_user,
+    max_users=settings.suggestion_cache_max_users
+)
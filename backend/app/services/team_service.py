@@ -0,0 +1,58 @@
+"""Team membership lookups for team-scoped queries"""
+
+from typing import Dict, List, Tuple
+from supabase import Client
+import logging
+import time
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TeamService:
+    """
+    Resolves the teams a user belongs to, cached per user for a short TTL
+
+    The API has no membership write paths (teams are managed in the database),
+    so joining or leaving a team shows up in team-scoped search after at most
+    ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: int = 300, max_users: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._cache: Dict[str, Tuple[float, List[str]]] = {}
+
+    async def get_team_ids(self, db: Client, user_id: str) -> List[str]:
+        """
+        Get the ids of the user's teams
+
+        One query per user per TTL; team-scoped searches then filter on
+        team_id = ANY(team_ids) instead of querying per member.
+        """
+        cached = self._cache.get(user_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        try:
+            result = db.table("team_members")\
+                .select("team_id")\
+                .eq("user_id", user_id)\
+                .execute()
+            team_ids = sorted({row['team_id'] for row in result.data})
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to resolve teams for user {user_id[:8]}: {e}")
+            return cached[1] if cached else []
+
+        if len(self._cache) >= self.max_users:
+            now = time.monotonic()
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            if len(self._cache) >= self.max_users:
+                self._cache.clear()
+
+        self._cache[user_id] = (time.monotonic() + self.ttl_seconds, team_ids)
+        return team_ids
+
+
+# Global team service instance
+team_service = TeamService(ttl_seconds=settings.team_cache_ttl_seconds)
@@ -0,0 +1,98 @@
+"""Circuit breaker for database calls that have a local fallback"""
+
+import logging
+import time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Every breaker by name, for the /metrics endpoint
+breakers: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitBreaker:
+    """
+    Remembers failures of a remote call and skips it during a cool-down
+
+    closed: calls go through; consecutive failures are counted.
+    open: after failure_threshold consecutive failures calls are skipped
+        (callers use their fallback) until reset_timeout seconds pass.
+    half_open: one trial call is let through; success closes the circuit,
+        failure opens it for another cool-down.
+
+    Only errors count as failures: a call that succeeds with no rows is a success.
+    Callers must report every attempted call: record_success, record_failure,
+    or abandon when it was cancelled, so a half-open trial never stays in flight.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+        self.stats = {"calls": 0, "failures": 0, "short_circuited": 0, "abandoned": 0}
+        self.transitions: Dict[str, int] = {}
+        breakers[name] = self
+
+    def _transition(self, state: str):
+        key = f"{self.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        if state == OPEN:
+            logger.warning(f"⚠️ Circuit {self.name} opened for {self.reset_timeout:.0f}s after {self.consecutive_failures} failures")
+        elif state == CLOSED:
+            logger.info(f"✅ Circuit {self.name} closed")
+        self.state = state
+
+    def allow_request(self) -> bool:
+        """True when the call should be attempted, False to go straight to the fallback"""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+
+        if self.state == CLOSED or (self.state == HALF_OPEN and not self._trial_in_flight):
+            self._trial_in_flight = self.state == HALF_OPEN
+            self.stats["calls"] += 1
+            return True
+
+        self.stats["short_circuited"] += 1
+        return False
+
+    def record_success(self):
+        """The call completed (with or without results)"""
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self):
+        """The call raised"""
+        self.consecutive_failures += 1
+        self.stats["failures"] += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != OPEN:
+                self._transition(OPEN)
+
+    def abandon(self):
+        """The call was cancelled (e.g. client disconnect) without an outcome"""
+        self.stats["abandoned"] += 1
+        if self.state == HALF_OPEN:
+            # Let the next caller run the trial instead
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State, counters and transition counts for metrics"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_for_seconds": round(time.monotonic() - self.opened_at, 1) if self.state != CLOSED and self.opened_at else 0,
+            **self.stats,
+            "transitions": dict(self.transitions),
+        }
@@ -0,0 +1,98 @@
+"""Error normalization and fingerprinting for exact-duplicate detection"""
+
+import hashlib
+import re
+from typing import List
+from app.utils.stacktrace import app_frames, frame_signature, parse_stack_trace
+
+# Number of stack lines that identify an error; deeper frames are mostly framework noise
+FINGERPRINT_FRAMES = 5
+
+_VOLATILE_PATTERNS = [
+    # Memory addresses and hex ids
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<addr>"),
+    # UUIDs
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<uuid>"),
+    # Absolute paths (POSIX and Windows): keep the file name only
+    (re.compile(r"(?<![\w.])(?:[A-Za-z]:)?(?:[\\/][\w.@~+-]+)+[\\/]([\w.@~+-]+)"), r"\1"),
+    # Line/column suffixes such as file.js:12:5
+    (re.compile(r"(\.\w+):\d+(?::\d+)?"), r"\1"),
+    # Python style "line 42"
+    (re.compile(r"\bline \d+", re.IGNORECASE), "line <n>"),
+]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Strip volatile tokens from an error message or stack line
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Text with addresses, ids, paths and line numbers replaced; other
+        numbers are kept, since status and error codes tell errors apart
+    """
+    if not text:
+        return ""
+
+    for pattern, replacement in _VOLATILE_PATTERNS:
+        text = pattern.sub(replacement, text)
+
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def normalize_stack_trace(stack_trace: str, max_lines: int = FINGERPRINT_FRAMES) -> List[str]:
+    """
+    Normalize the top lines of a stack trace
+
+    Args:
+        stack_trace: Raw stack trace
+        max_lines: Number of non-empty lines to keep
+
+    Returns:
+        Normalized stack lines
+    """
+    if not stack_trace:
+        return []
+
+    lines = []
+    for line in stack_trace.split('\n'):
+        normalized = normalize_text(line)
+        if normalized:
+            lines.append(normalized)
+        if len(lines) >= max_lines:
+            break
+
+    return lines
+
+
+def compute_fingerprint(issue_data: dict) -> str:
+    """
+    Compute a stable fingerprint for an issue
+
+    Issues with the same error type, normalized message and top stack frames
+    share a fingerprint regardless of paths, line numbers or addresses. Frames
+    are the signatures of the innermost application frames when the trace can
+    be parsed, otherwise the top normalized stack lines.
+
+    Args:
+        issue_data: Dictionary with issue fields
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    frames = app_frames(parse_stack_trace(issue_data.get('stack_trace'), issue_data.get('language')))
+    if frames:
+        stack = [frame_signature(frame) for frame in frames[:FINGERPRINT_FRAMES]]
+    else:
+        stack = normalize_stack_trace(issue_data.get('stack_trace') or '')
+
+    components = [
+        (issue_data.get('error_type') or '').strip(),
+        normalize_text(issue_data.get('error_message') or ''),
+        *stack
+    ]
+    return hashlib.sha256("\n".join(components).encode("utf-8")).hexdigest()
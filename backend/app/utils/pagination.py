@@ -0,0 +1,45 @@
+"""Opaque keyset cursors for paging issues by (created_at, id)"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Dict, Tuple
+
+
+def encode_cursor(issue: Dict) -> str:
+    """
+    Build the cursor pointing just after an issue
+
+    Args:
+        issue: Last issue of the current page (needs created_at and id)
+
+    Returns:
+        URL-safe opaque cursor
+    """
+    payload = json.dumps([issue['created_at'], issue['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode and validate a cursor
+
+    Args:
+        cursor: Cursor from a previous page
+
+    Returns:
+        (created_at, id) of the last issue already returned
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, issue_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        datetime.fromisoformat(str(created_at).replace('Z', '+00:00'))
+        uuid.UUID(str(issue_id))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+    return created_at, issue_id
@@ -0,0 +1,131 @@
+"""Mergeable streaming sketches: Space-Saving (top-K) and HyperLogLog (distinct counts)"""
+
+import base64
+import hashlib
+import math
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+
+class SpaceSaving:
+    """
+    Approximate top-K counts in O(k) memory (Metwally et al., Space-Saving)
+
+    Every tracked item has a count and an error: its true count lies in
+    [count - error, count]. error never exceeds total / k, and any item whose
+    true count is above total / k is guaranteed to be tracked.
+    """
+
+    def __init__(self, k: int = 100):
+        self.k = k
+        self.total = 0
+        self.counters: Dict[str, List[int]] = {}  # item -> [count, error]
+
+    def add(self, item: str, count: int = 1):
+        """Count count occurrences of item"""
+        self.total += count
+        counter = self.counters.get(item)
+        if counter is not None:
+            counter[0] += count
+            return
+        if len(self.counters) < self.k:
+            self.counters[item] = [count, 0]
+            return
+
+        # Replace the smallest counter; the newcomer inherits its count as error.
+        # O(k) scan: k is small and new items are rare once the heavy hitters settle
+        victim = min(self.counters, key=lambda key: self.counters[key][0])
+        floor = self.counters.pop(victim)[0]
+        self.counters[item] = [floor + count, floor]
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Combine with a summary of another stream (Agarwal et al., mergeable summaries)
+
+        An item missing from a full summary may still have occurred up to that
+        summary's smallest count, so that count is added to its count and error.
+        """
+        floor_self = min((c[0] for c in self.counters.values()), default=0) if len(self.counters) >= self.k else 0
+        floor_other = min((c[0] for c in other.counters.values()), default=0) if len(other.counters) >= other.k else 0
+
+        merged: Dict[str, List[int]] = {}
+        for item in self.counters.keys() | other.counters.keys():
+            a = self.counters.get(item, (floor_self, floor_self))
+            b = other.counters.get(item, (floor_other, floor_other))
+            merged[item] = [a[0] + b[0], a[1] + b[1]]
+
+        result = SpaceSaving(max(self.k, other.k))
+        result.total = self.total + other.total
+        # Ties broken by item, so the kept counters do not depend on merge order
+        result.counters = dict(sorted(merged.items(), key=lambda kv: (-kv[1][0], kv[0]))[:result.k])
+        return result
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        """The n largest counters as (item, count, error), largest first"""
+        return sorted(((item, c[0], c[1]) for item, c in self.counters.items()), key=lambda t: (-t[1], t[0]))[:n]
+
+    @property
+    def max_error(self) -> float:
+        """Upper bound on any reported count's overestimate"""
+        return self.total / self.k
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "total": self.total, "counters": self.counters}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        sketch = cls(data["k"])
+        sketch.total = data["total"]
+        sketch.counters = {item: list(counter) for item, counter in data["counters"].items()}
+        return sketch
+
+
+class HyperLogLog:
+    """
+    Approximate distinct count in 2^p bytes (Flajolet et al., with linear counting for small sets)
+
+    Relative standard error is 1.04 / sqrt(2^p): about 1.6% at p = 12.
+    """
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def add(self, value: str):
+        """Add one value (adding it again changes nothing)"""
+        h = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Sketch of the union of both sets (same p required)"""
+        result = HyperLogLog(self.p)
+        np.maximum(self.registers, other.registers, out=result.registers)
+        return result
+
+    def count(self) -> float:
+        """Estimated number of distinct values"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return float(estimate)
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of count()"""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"p": self.p, "registers": base64.b64encode(self.registers.tobytes()).decode()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(data["p"])
+        sketch.registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return sketch
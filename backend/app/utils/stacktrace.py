@@ -0,0 +1,186 @@
+"""Language-aware stack trace parsing into structured frames"""
+
+import re
+from typing import Dict, List, Optional
+
+# Frames kept in the structured column; deeper frames add size but rarely identify an error
+MAX_STORED_FRAMES = 50
+
+# Python: File "/app/services/user.py", line 42, in get_user
+_PYTHON_FRAME = re.compile(r'^\s*File "(?P<file>[^"]+)", line (?P<line>\d+)(?:, in (?P<function>.+?))?\s*$')
+
+# JavaScript/Node: at Foo.bar (/app/src/foo.js:12:5) | at /app/src/foo.js:12:5 | at async run (file:///x.mjs:1:2)
+_JS_FRAME = re.compile(
+    r'^\s*at (?:(?P<function>.+?) \()?(?P<file>(?:[a-z]+:(?://)?)?[^()\s]+?):(?P<line>\d+)(?::\d+)?\)?\s*$'
+)
+
+# Java/JVM: at com.acme.UserService.load(UserService.java:42) | at java.base/java.lang.Thread.run(Unknown Source)
+_JAVA_FRAME = re.compile(
+    r'^\s*at (?:[\w.$-]+(?:@[\w.-]+)?/)?(?P<qualified>[\w.$<>]+)\.(?P<function>[\w$<>]+)\((?P<file>[^:()]*)(?::(?P<line>\d+))?\)\s*$'
+)
+
+_LANGUAGE_ALIASES = {
+    'python': 'python',
+    'py': 'python',
+    'javascript': 'javascript',
+    'js': 'javascript',
+    'typescript': 'javascript',
+    'ts': 'javascript',
+    'node': 'javascript',
+    'nodejs': 'javascript',
+    'java': 'java',
+    'kotlin': 'java',
+    'scala': 'java',
+    'groovy': 'java',
+}
+
+_LIBRARY_MARKERS = (
+    'site-packages', 'dist-packages', '/lib/python', '<frozen ', 'node_modules', 'node:internal',
+    'java.', 'javax.', 'jdk.', 'sun.', 'kotlin.', 'scala.', 'org.springframework.',
+)
+
+# Generated names that differ between otherwise identical frames
+_ANONYMOUS_SUFFIX = re.compile(r'(\$\d+|\$\$Lambda\$[\w/$]*|\$lambda-\d+|\.<anonymous>)$')
+
+
+def _module_from_path(path: str) -> str:
+    """Derive a module name from a source path, relative to the package root when known"""
+    path = path.replace('\\', '/')
+    for marker in ('site-packages/', 'dist-packages/', 'node_modules/'):
+        if marker in path:
+            path = path.rsplit(marker, 1)[1]
+            break
+    else:
+        path = '/'.join(path.split('/')[-2:])
+
+    path = re.sub(r'^(?:file|node|webpack):/*', '', path)
+    path = re.sub(r'\.(py|js|mjs|cjs|ts|tsx|jsx)$', '', path)
+    return path.strip('/').replace('/', '.')
+
+
+def _file_name(path: str) -> str:
+    """Last path component without URL scheme"""
+    return re.sub(r'^[a-z]+:/*', '', path.replace('\\', '/')).rsplit('/', 1)[-1]
+
+
+def parse_python(stack_trace: str) -> List[Dict]:
+    """Parse a Python traceback; frames are returned innermost first"""
+    frames = []
+    for line in stack_trace.split('\n'):
+        match = _PYTHON_FRAME.match(line)
+        if match:
+            frames.append({
+                'module': _module_from_path(match['file']),
+                'function': match['function'] or '<module>',
+                'file': _file_name(match['file']),
+                'line': int(match['line']),
+                'library': any(m in match['file'] for m in _LIBRARY_MARKERS),
+            })
+    # Python prints the most recent call last
+    frames.reverse()
+    return frames
+
+
+def parse_javascript(stack_trace: str) -> List[Dict]:
+    """Parse a JavaScript/Node stack; frames are returned innermost first"""
+    frames = []
+    for line in stack_trace.split('\n'):
+        match = _JS_FRAME.match(line)
+        if match:
+            function = re.sub(r'^(?:async |new )+', '', match['function'] or '<anonymous>')
+            function = re.sub(r' \[as [^\]]+\]$', '', function)
+            frames.append({
+                'module': _module_from_path(match['file']),
+                'function': function,
+                'file': _file_name(match['file']),
+                'line': int(match['line']),
+                'library': any(m in match['file'] for m in _LIBRARY_MARKERS),
+            })
+    return frames
+
+
+def parse_java(stack_trace: str) -> List[Dict]:
+    """Parse a Java/JVM stack; frames are returned innermost first"""
+    frames = []
+    for line in stack_trace.split('\n'):
+        match = _JAVA_FRAME.match(line)
+        if match:
+            frames.append({
+                'module': match['qualified'],
+                'function': match['function'],
+                'file': match['file'] or None,
+                'line': int(match['line']) if match['line'] else None,
+                'library': match['qualified'].startswith(_LIBRARY_MARKERS),
+            })
+    return frames
+
+
+_PARSERS = {
+    'python': parse_python,
+    'javascript': parse_javascript,
+    'java': parse_java,
+}
+
+
+def parse_stack_trace(stack_trace: Optional[str], language: Optional[str] = None) -> List[Dict]:
+    """
+    Extract structured frames from a stack trace
+
+    Args:
+        stack_trace: Raw stack trace
+        language: Language hint; when missing or unknown every parser is tried
+
+    Returns:
+        Frames (module, function, file, line, library), innermost first
+    """
+    if not stack_trace:
+        return []
+
+    parser = _PARSERS.get(_LANGUAGE_ALIASES.get((language or '').strip().lower(), ''))
+    if parser:
+        frames = parser(stack_trace)
+        if frames:
+            return frames
+
+    # JS and Java frames both start with "at"; keep whichever parser understood more lines
+    return max((p(stack_trace) for p in _PARSERS.values()), key=len)
+
+
+def frame_signature(frame: Dict) -> str:
+    """Normalized "module:function" signature, stable across line numbers and generated names"""
+    module = _ANONYMOUS_SUFFIX.sub('', frame.get('module') or '')
+    function = _ANONYMOUS_SUFFIX.sub('', frame.get('function') or '')
+    function = re.sub(r'^lambda\$(\w+?)\$\d+$', r'lambda$\1', function)
+    return f"{module}:{function}"
+
+
+def app_frames(frames: List[Dict]) -> List[Dict]:
+    """Frames from application code; falls back to all frames when every frame is library code"""
+    return [f for f in frames if not f.get('library')] or frames
+
+
+def compact_frames(frames: List[Dict]) -> List[Dict]:
+    """Frames as stored in issues.stack_frames"""
+    return [
+        {k: frame[k] for k in ('module', 'function', 'file', 'line') if frame.get(k) is not None}
+        | ({'library': True} if frame.get('library') else {})
+        for frame in frames[:MAX_STORED_FRAMES]
+    ]
+
+
+def frame_columns(issue_data: dict) -> Dict:
+    """
+    Structured stack columns for an issue row
+
+    Args:
+        issue_data: Dictionary with issue fields
+
+    Returns:
+        Values for the stack_frames, frame_signatures and frame_files columns
+    """
+    frames = parse_stack_trace(issue_data.get('stack_trace'), issue_data.get('language'))[:MAX_STORED_FRAMES]
+    return {
+        'stack_frames': compact_frames(frames) or None,
+        'frame_signatures': sorted({frame_signature(f) for f in frames}) or None,
+        'frame_files': sorted({f['file'] for f in frames if f.get('file')}) or None,
+    }
@@ -0,0 +1,106 @@
+"""Compact embedding transport between the API and pgvector"""
+
+import base64
+import struct
+from typing import Any, Optional, Sequence
+import numpy as np
+
+# vector_send() layout: int16 dimensions, int16 unused, then big-endian float32 values
+_SEND_HEADER_BYTES = 4
+
+
+def to_pgvector(embedding: Sequence[float]) -> str:
+    """
+    Format an embedding as a pgvector text literal for inserts and RPC arguments
+
+    Seven significant digits keep float32 precision at about half the size of
+    a JSON float array, and PostgREST passes the string straight to vector_in.
+
+    Args:
+        embedding: Embedding values
+
+    Returns:
+        Literal such as "[0.01234568,-0.1]"
+    """
+    values = np.asarray(embedding, dtype=np.float32).tolist()
+    return "[" + ",".join(map("{:.7g}".format, values)) + "]"
+
+
+def encode_vector(embedding: Sequence[float]) -> bytes:
+    """
+    Encode an embedding in pgvector's binary wire format (vector_recv input)
+
+    Args:
+        embedding: Embedding values
+
+    Returns:
+        Header plus big-endian float32 values
+    """
+    values = np.asarray(embedding, dtype=">f4")
+    return struct.pack(">hh", values.size, 0) + values.tobytes()
+
+
+def decode_vector_bytes(data: bytes) -> np.ndarray:
+    """
+    Decode pgvector's binary wire format (vector_send output)
+
+    Args:
+        data: Raw bytes
+
+    Returns:
+        float32 array, decoded without per-element Python floats
+    """
+    return np.frombuffer(data, dtype=">f4", offset=_SEND_HEADER_BYTES).astype(np.float32)
+
+
+def decode_vector(encoded: str) -> np.ndarray:
+    """
+    Decode base64 vector_send() output (the embedding_b64 computed column)
+
+    Args:
+        encoded: Base64 text, newlines allowed
+
+    Returns:
+        float32 array
+    """
+    return decode_vector_bytes(base64.b64decode(encoded))
+
+
+def parse_vector(value: Any) -> Optional[np.ndarray]:
+    """
+    Convert any embedding representation to a float32 array
+
+    Args:
+        value: NumPy array, list of floats, or pgvector/JSON text "[...]"
+
+    Returns:
+        float32 array, or None when empty
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+        if text.startswith("["):
+            return np.fromstring(text[1:-1], sep=",", dtype=np.float32)
+        return decode_vector(text)
+    vector = np.asarray(value, dtype=np.float32)
+    return vector if vector.size else None
+
+
+def cosine_similarities(query: Sequence[float], matrix: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of one vector against every row of a matrix
+
+    Args:
+        query: Query embedding
+        matrix: (n, dim) embeddings
+
+    Returns:
+        n similarities; rows with zero norm score 0
+    """
+    query = np.asarray(query, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    scores = matrix @ query
+    return np.divide(scores, norms, out=np.zeros_like(scores), where=norms > 0)
@@ -0,0 +1,11 @@
+"""Shared test setup: make the app package importable and satisfy required settings"""
+
+from pathlib import Path
+import os
+import sys
+
+# Settings require the Supabase keys; tests never call Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
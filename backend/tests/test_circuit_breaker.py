@@ -0,0 +1,116 @@
+"""Circuit breaker state machine (no database needed)"""
+
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.utils import circuit_breaker
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Manual monotonic clock for the breaker module"""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def _opened(clock, name: str) -> CircuitBreaker:
+    breaker = CircuitBreaker(name, failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test_opens", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    # A success resets the count
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.consecutive_failures == 0
+
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert breaker.stats["short_circuited"] == 1
+
+    clock.value += 29
+    assert not breaker.allow_request()
+
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = _opened(clock, "test_single_trial")
+    clock.value += 30
+
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_trial_success_closes(clock):
+    breaker = _opened(clock, "test_trial_success")
+    clock.value += 30
+
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request() and breaker.allow_request()
+    assert breaker.transitions == {"closed->open": 1, "open->half_open": 1, "half_open->closed": 1}
+
+
+def test_trial_failure_reopens(clock):
+    breaker = _opened(clock, "test_trial_failure")
+    clock.value += 30
+
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+    clock.value += 30
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+
+
+def test_cancelled_trial_frees_the_slot(clock):
+    breaker = _opened(clock, "test_cancelled_trial")
+    clock.value += 30
+
+    async def guarded_call():
+        # Same reporting as IssueService.find_similar_issues
+        assert breaker.allow_request()
+        try:
+            await asyncio.sleep(3600)
+            breaker.record_success()
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.abandon()
+            raise
+
+    async def cancel_trial():
+        task = asyncio.create_task(guarded_call())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    assert breaker.state == HALF_OPEN
+    assert breaker.stats["abandoned"] == 1
+
+    # The next caller runs the trial, and its success closes the circuit
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
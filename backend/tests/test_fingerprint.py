@@ -0,0 +1,32 @@
+"""Fingerprint normalization: volatile tokens are dropped, error codes are kept"""
+
+from app.utils.fingerprint import compute_fingerprint, normalize_text
+
+
+def _issue(error_message: str, stack_trace: str = "", error_type: str = "HTTPError") -> dict:
+    return {"error_type": error_type, "error_message": error_message, "stack_trace": stack_trace}
+
+
+def test_status_codes_give_different_fingerprints():
+    assert compute_fingerprint(_issue("Request failed with status code 404")) != \
+        compute_fingerprint(_issue("Request failed with status code 500"))
+
+
+def test_error_codes_are_kept():
+    assert normalize_text("ORA-00942: table or view does not exist") == "ORA-00942: table or view does not exist"
+    assert compute_fingerprint(_issue("ORA-00942: table or view does not exist", error_type="DatabaseError")) != \
+        compute_fingerprint(_issue("ORA-01017: invalid username/password", error_type="DatabaseError"))
+
+
+def test_volatile_tokens_are_normalized():
+    first = 'File "/home/ci/build-17/app/services/user.py", line 42, in load at 0x7f3a2c10'
+    second = 'File "/srv/app/services/user.py", line 57, in load at 0x55d1e0f8'
+    assert normalize_text(first) == normalize_text(second)
+    assert normalize_text("at handler (/app/src/server.js:12:5)") == "at handler (server.js)"
+    assert normalize_text("user 123e4567-e89b-12d3-a456-426614174000 not found") == "user <uuid> not found"
+
+
+def test_same_error_at_other_lines_shares_a_fingerprint():
+    trace = 'Traceback (most recent call last):\n  File "/app/services/user.py", line {line}, in load\n'
+    assert compute_fingerprint(_issue("missing key", trace.format(line=42), "KeyError")) == \
+        compute_fingerprint(_issue("missing key", trace.format(line=57), "KeyError"))
@@ -0,0 +1,93 @@
+"""Space-Saving and HyperLogLog guarantees (no database needed)"""
+
+from collections import Counter
+from itertools import permutations
+import numpy as np
+import pytest
+from app.utils.sketches import HyperLogLog, SpaceSaving
+
+
+def _zipf_stream(n: int, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    return [f"E{value}" for value in rng.zipf(1.3, n) % 5000]
+
+
+def _space_saving(stream: list, k: int = 50) -> SpaceSaving:
+    sketch = SpaceSaving(k)
+    for item in stream:
+        sketch.add(item)
+    return sketch
+
+
+def _assert_bounds(sketch: SpaceSaving, truth: Counter):
+    assert sketch.total == sum(truth.values())
+    for item, count, error in sketch.top(sketch.k):
+        assert count - error <= truth[item] <= count
+        assert error <= sketch.max_error
+    # Every item occurring more often than total / k is tracked
+    tracked = set(sketch.counters)
+    assert {item for item, count in truth.items() if count > sketch.max_error} <= tracked
+
+
+def test_space_saving_bounds():
+    stream = _zipf_stream(20000, seed=1)
+    _assert_bounds(_space_saving(stream), Counter(stream))
+
+
+def test_space_saving_weighted_adds():
+    sketch, truth = SpaceSaving(3), Counter()
+    for item, count in [("a", 5), ("b", 2), ("c", 1), ("d", 4), ("a", 3), ("e", 1), ("b", 6)]:
+        sketch.add(item, count)
+        truth[item] += count
+    _assert_bounds(sketch, truth)
+
+
+def test_space_saving_merge_bounds_in_any_order():
+    parts = [_zipf_stream(8000, seed) for seed in (2, 3, 4)]
+    truth = Counter(item for part in parts for item in part)
+    sketches = [_space_saving(part) for part in parts]
+
+    for first, second, third in permutations(sketches):
+        _assert_bounds(first.merge(second).merge(third), truth)
+        _assert_bounds(first.merge(second.merge(third)), truth)
+
+
+def test_space_saving_merge_is_commutative():
+    a, b = _space_saving(_zipf_stream(8000, seed=5)), _space_saving(_zipf_stream(8000, seed=6))
+    assert a.merge(b).to_dict() == b.merge(a).to_dict()
+
+
+def test_space_saving_round_trip():
+    sketch = _space_saving(_zipf_stream(2000, seed=7))
+    assert SpaceSaving.from_dict(sketch.to_dict()).to_dict() == sketch.to_dict()
+
+
+@pytest.mark.parametrize("cardinality", [100, 1000, 50000])
+def test_hyperloglog_error_on_known_cardinality(cardinality):
+    hll = HyperLogLog(12)
+    for i in range(cardinality):
+        hll.add(f"fingerprint-{i}")
+        hll.add(f"fingerprint-{i}")  # duplicates do not count
+    assert abs(hll.count() - cardinality) <= 3 * hll.relative_error * cardinality
+
+
+def test_hyperloglog_merge_is_the_union():
+    a, b, union = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+    for i in range(20000):
+        a.add(str(i))
+        union.add(str(i))
+    for i in range(10000, 30000):
+        b.add(str(i))
+        union.add(str(i))
+
+    assert np.array_equal(a.merge(b).registers, union.registers)
+    assert np.array_equal(a.merge(b).registers, b.merge(a).registers)
+    assert abs(a.merge(b).count() - 30000) <= 3 * union.relative_error * 30000
+
+
+def test_hyperloglog_round_trip():
+    hll = HyperLogLog(10)
+    for i in range(500):
+        hll.add(str(i))
+    restored = HyperLogLog.from_dict(hll.to_dict())
+    assert restored.p == 10 and restored.count() == hll.count()
@@ -0,0 +1,6 @@
+-- Migration 001: issue fingerprints for exact-duplicate detection
+-- Fresh installs get this from schema.sql; run in Supabase SQL Editor to upgrade.
+-- Existing issues get a fingerprint via POST /api/v1/issues/regenerate-embeddings.
+ALTER TABLE issues
+ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(64);
+CREATE INDEX IF NOT EXISTS idx_issues_user_fingerprint ON issues(user_id, fingerprint);
@@ -0,0 +1,6 @@
+-- Migration 002: structured stack frames and frame signature index
+-- Existing issues get frames via POST /api/v1/issues/regenerate-embeddings.
+ALTER TABLE issues
+ADD COLUMN IF NOT EXISTS stack_frames JSONB,
+    ADD COLUMN IF NOT EXISTS frame_signatures TEXT [];
+CREATE INDEX IF NOT EXISTS idx_issues_frame_signatures ON issues USING GIN(frame_signatures);
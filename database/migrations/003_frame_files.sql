@@ -0,0 +1,5 @@
+-- Migration 003: file-level frame index
+-- Populate for existing issues via POST /api/v1/issues/frames/rebuild.
+ALTER TABLE issues
+ADD COLUMN IF NOT EXISTS frame_files TEXT [];
+CREATE INDEX IF NOT EXISTS idx_issues_frame_files ON issues USING GIN(frame_files);
@@ -0,0 +1,54 @@
+-- Migration 004: full-text search column, GIN index and search RPC
+-- The generated column is computed for existing rows when it is added (table rewrite).
+ALTER TABLE issues
+ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(error_type, '')), 'A') || setweight(to_tsvector('english', coalesce(error_message, '')), 'B') || setweight(to_tsvector('simple', coalesce(stack_trace, '')), 'C') || setweight(to_tsvector('english', coalesce(embedding_text, '')), 'D')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_issues_search_vector ON issues USING GIN(search_vector);
+-- Full-text search with ranking and highlighted snippets
+CREATE OR REPLACE FUNCTION search_issues_fulltext(
+        query_text text,
+        user_id_filter uuid,
+        match_count int
+    ) RETURNS TABLE (
+        id uuid,
+        user_id uuid,
+        error_type varchar,
+        error_message text,
+        language varchar,
+        framework varchar,
+        tags text [],
+        severity varchar,
+        status varchar,
+        occurrences integer,
+        created_at timestamp,
+        rank float,
+        snippet text
+    ) LANGUAGE sql STABLE AS $$ WITH q AS (
+        SELECT websearch_to_tsquery('english', query_text) || websearch_to_tsquery('simple', query_text) AS query
+    )
+SELECT i.id,
+    i.user_id,
+    i.error_type,
+    i.error_message,
+    i.language,
+    i.framework,
+    i.tags,
+    i.severity,
+    i.status,
+    i.occurrences,
+    i.created_at,
+    ts_rank_cd(i.search_vector, q.query)::float AS rank,
+    ts_headline(
+        'english',
+        i.error_message || ' ' || coalesce(left(i.stack_trace, 2000), ''),
+        q.query,
+        'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8'
+    ) AS snippet
+FROM issues i,
+    q
+WHERE i.user_id = user_id_filter
+    AND i.search_vector @@ q.query
+ORDER BY rank DESC
+LIMIT match_count;
+$$;
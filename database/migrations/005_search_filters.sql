@@ -0,0 +1,153 @@
+-- Migration 005: filter pushdown for match_issues and search_issues_fulltext
+-- Replaces both functions; their old signatures are dropped so PostgREST sees one overload.
+-- Create helper function for vector similarity search
+-- Optional filters are applied inside the vector query (NULL = no filter)
+DROP FUNCTION IF EXISTS match_issues(vector, float, int, uuid);
+CREATE OR REPLACE FUNCTION match_issues(
+        query_embedding vector(384),
+        match_threshold float,
+        match_count int,
+        user_id_filter uuid,
+        language_filter text [] DEFAULT NULL,
+        severity_filter text [] DEFAULT NULL,
+        status_filter text [] DEFAULT NULL,
+        tags_filter text [] DEFAULT NULL,
+        created_after timestamp DEFAULT NULL,
+        created_before timestamp DEFAULT NULL
+    ) RETURNS TABLE (
+        id uuid,
+        user_id uuid,
+        error_type varchar,
+        error_message text,
+        stack_trace text,
+        language varchar,
+        framework varchar,
+        tags text [],
+        severity varchar,
+        status varchar,
+        occurrences integer,
+        created_at timestamp,
+        distance float
+    ) LANGUAGE plpgsql AS $$ BEGIN RETURN QUERY
+SELECT i.id,
+    i.user_id,
+    i.error_type,
+    i.error_message,
+    i.stack_trace,
+    i.language,
+    i.framework,
+    i.tags,
+    i.severity,
+    i.status,
+    i.occurrences,
+    i.created_at,
+    (i.embedding <=> query_embedding) as distance
+FROM issues i
+WHERE i.user_id = user_id_filter
+    AND (i.embedding <=> query_embedding) < match_threshold
+    AND (
+        language_filter IS NULL
+        OR i.language = ANY(language_filter)
+    )
+    AND (
+        severity_filter IS NULL
+        OR i.severity = ANY(severity_filter)
+    )
+    AND (
+        status_filter IS NULL
+        OR i.status = ANY(status_filter)
+    )
+    AND (
+        tags_filter IS NULL
+        OR i.tags && tags_filter
+    )
+    AND (
+        created_after IS NULL
+        OR i.created_at >= created_after
+    )
+    AND (
+        created_before IS NULL
+        OR i.created_at <= created_before
+    )
+ORDER BY distance
+LIMIT match_count;
+END;
+$$;
+-- Full-text search with ranking and highlighted snippets
+DROP FUNCTION IF EXISTS search_issues_fulltext(text, uuid, int);
+CREATE OR REPLACE FUNCTION search_issues_fulltext(
+        query_text text,
+        user_id_filter uuid,
+        match_count int,
+        language_filter text [] DEFAULT NULL,
+        severity_filter text [] DEFAULT NULL,
+        status_filter text [] DEFAULT NULL,
+        tags_filter text [] DEFAULT NULL,
+        created_after timestamp DEFAULT NULL,
+        created_before timestamp DEFAULT NULL
+    ) RETURNS TABLE (
+        id uuid,
+        user_id uuid,
+        error_type varchar,
+        error_message text,
+        language varchar,
+        framework varchar,
+        tags text [],
+        severity varchar,
+        status varchar,
+        occurrences integer,
+        created_at timestamp,
+        rank float,
+        snippet text
+    ) LANGUAGE sql STABLE AS $$ WITH q AS (
+        SELECT websearch_to_tsquery('english', query_text) || websearch_to_tsquery('simple', query_text) AS query
+    )
+SELECT i.id,
+    i.user_id,
+    i.error_type,
+    i.error_message,
+    i.language,
+    i.framework,
+    i.tags,
+    i.severity,
+    i.status,
+    i.occurrences,
+    i.created_at,
+    ts_rank_cd(i.search_vector, q.query)::float AS rank,
+    ts_headline(
+        'english',
+        i.error_message || ' ' || coalesce(left(i.stack_trace, 2000), ''),
+        q.query,
+        'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8'
+    ) AS snippet
+FROM issues i,
+    q
+WHERE i.user_id = user_id_filter
+    AND i.search_vector @@ q.query
+    AND (
+        language_filter IS NULL
+        OR i.language = ANY(language_filter)
+    )
+    AND (
+        severity_filter IS NULL
+        OR i.severity = ANY(severity_filter)
+    )
+    AND (
+        status_filter IS NULL
+        OR i.status = ANY(status_filter)
+    )
+    AND (
+        tags_filter IS NULL
+        OR i.tags && tags_filter
+    )
+    AND (
+        created_after IS NULL
+        OR i.created_at >= created_after
+    )
+    AND (
+        created_before IS NULL
+        OR i.created_at <= created_before
+    )
+ORDER BY rank DESC
+LIMIT match_count;
+$$;
@@ -0,0 +1,104 @@
+-- Migration 006: move the embedding index from IVFFlat to HNSW and add per-query ef_search
+-- Requires pgvector >= 0.5.0. Building the index on a large table takes a while;
+-- raise maintenance_work_mem for the session to keep the graph build in memory.
+SET maintenance_work_mem = '512MB';
+DROP INDEX IF EXISTS idx_issues_embedding;
+CREATE INDEX IF NOT EXISTS idx_issues_embedding_hnsw ON issues USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+-- Create helper function for vector similarity search
+-- Optional filters are applied inside the vector query (NULL = no filter).
+-- ef_search trades recall for latency: it sets hnsw.ef_search for this query
+-- (pgvector default 40) and, on ivfflat deployments, ivfflat.probes = ef_search / 10.
+-- With pgvector >= 0.8 the HNSW scan is iterative, so tenant scoping and filters
+-- still fill match_count; on older versions raise ef_search when they are selective.
+DROP FUNCTION IF EXISTS match_issues(vector, float, int, uuid);
+DROP FUNCTION IF EXISTS match_issues(vector, float, int, uuid, text [], text [], text [], text [], timestamp, timestamp);
+CREATE OR REPLACE FUNCTION match_issues(
+        query_embedding vector(384),
+        match_threshold float,
+        match_count int,
+        user_id_filter uuid,
+        language_filter text [] DEFAULT NULL,
+        severity_filter text [] DEFAULT NULL,
+        status_filter text [] DEFAULT NULL,
+        tags_filter text [] DEFAULT NULL,
+        created_after timestamp DEFAULT NULL,
+        created_before timestamp DEFAULT NULL,
+        ef_search int DEFAULT NULL
+    ) RETURNS TABLE (
+        id uuid,
+        user_id uuid,
+        error_type varchar,
+        error_message text,
+        stack_trace text,
+        language varchar,
+        framework varchar,
+        tags text [],
+        severity varchar,
+        status varchar,
+        occurrences integer,
+        created_at timestamp,
+        distance float
+    ) LANGUAGE plpgsql AS $$ BEGIN IF ef_search IS NOT NULL THEN PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+PERFORM set_config(
+    'ivfflat.probes',
+    greatest(1, ef_search / 10)::text,
+    true
+);
+END IF;
+-- Keep walking the HNSW graph until match_count rows pass the tenant and filter
+-- predicates, instead of filtering only the first ef_search candidates
+-- (pgvector >= 0.8; older versions reject the setting and keep the plain scan)
+BEGIN PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+EXCEPTION
+WHEN undefined_object
+OR invalid_name THEN NULL;
+END;
+RETURN QUERY WITH candidates AS MATERIALIZED (
+    SELECT i.id,
+    i.user_id,
+    i.error_type,
+    i.error_message,
+    i.stack_trace,
+    i.language,
+    i.framework,
+    i.tags,
+    i.severity,
+    i.status,
+    i.occurrences,
+    i.created_at,
+    (i.embedding <=> query_embedding) as distance
+FROM issues i
+WHERE i.user_id = user_id_filter
+    AND (i.embedding <=> query_embedding) < match_threshold
+    AND (
+        language_filter IS NULL
+        OR i.language = ANY(language_filter)
+    )
+    AND (
+        severity_filter IS NULL
+        OR i.severity = ANY(severity_filter)
+    )
+    AND (
+        status_filter IS NULL
+        OR i.status = ANY(status_filter)
+    )
+    AND (
+        tags_filter IS NULL
+        OR i.tags && tags_filter
+    )
+    AND (
+        created_after IS NULL
+        OR i.created_at >= created_after
+    )
+    AND (
+        created_before IS NULL
+        OR i.created_at <= created_before
+    )
+ORDER BY distance
+LIMIT match_count
+) -- relaxed_order may return rows slightly out of order: sort them again
+SELECT *
+FROM candidates c
+ORDER BY c.distance;
+END;
+$$;
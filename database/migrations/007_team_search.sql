@@ -0,0 +1,200 @@
+-- Migration 007: team-scoped search
+-- match_issues and search_issues_fulltext accept team_ids_filter so a search can
+-- cover the user's issues and their teams' issues in one query.
+-- team_members has had RLS enabled without a SELECT policy, so users could not
+-- read their own memberships and team-scoped search found no teams.
+DROP POLICY IF EXISTS team_members_select_policy ON team_members;
+CREATE POLICY team_members_select_policy ON team_members FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+-- Create helper function for vector similarity search
+-- Optional filters are applied inside the vector query (NULL = no filter).
+-- ef_search trades recall for latency: it sets hnsw.ef_search for this query
+-- (pgvector default 40) and, on ivfflat deployments, ivfflat.probes = ef_search / 10.
+-- With pgvector >= 0.8 the HNSW scan is iterative, so tenant scoping and filters
+-- still fill match_count; on older versions raise ef_search when they are selective.
+-- team_ids_filter widens the search to those teams' issues in the same query;
+-- the function runs as the caller, so RLS still limits rows to teams the user is in.
+DROP FUNCTION IF EXISTS match_issues(vector, float, int, uuid);
+DROP FUNCTION IF EXISTS match_issues(vector, float, int, uuid, text [], text [], text [], text [], timestamp, timestamp);
+DROP FUNCTION IF EXISTS match_issues(vector, float, int, uuid, text [], text [], text [], text [], timestamp, timestamp, int);
+CREATE OR REPLACE FUNCTION match_issues(
+        query_embedding vector(384),
+        match_threshold float,
+        match_count int,
+        user_id_filter uuid,
+        language_filter text [] DEFAULT NULL,
+        severity_filter text [] DEFAULT NULL,
+        status_filter text [] DEFAULT NULL,
+        tags_filter text [] DEFAULT NULL,
+        created_after timestamp DEFAULT NULL,
+        created_before timestamp DEFAULT NULL,
+        ef_search int DEFAULT NULL,
+        team_ids_filter uuid [] DEFAULT NULL
+    ) RETURNS TABLE (
+        id uuid,
+        user_id uuid,
+        error_type varchar,
+        error_message text,
+        stack_trace text,
+        language varchar,
+        framework varchar,
+        tags text [],
+        severity varchar,
+        status varchar,
+        occurrences integer,
+        created_at timestamp,
+        distance float
+    ) LANGUAGE plpgsql AS $$ BEGIN IF ef_search IS NOT NULL THEN PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+PERFORM set_config(
+    'ivfflat.probes',
+    greatest(1, ef_search / 10)::text,
+    true
+);
+END IF;
+-- Keep walking the HNSW graph until match_count rows pass the tenant and filter
+-- predicates, instead of filtering only the first ef_search candidates
+-- (pgvector >= 0.8; older versions reject the setting and keep the plain scan)
+BEGIN PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+EXCEPTION
+WHEN undefined_object
+OR invalid_name THEN NULL;
+END;
+RETURN QUERY WITH candidates AS MATERIALIZED (
+    SELECT i.id,
+    i.user_id,
+    i.error_type,
+    i.error_message,
+    i.stack_trace,
+    i.language,
+    i.framework,
+    i.tags,
+    i.severity,
+    i.status,
+    i.occurrences,
+    i.created_at,
+    (i.embedding <=> query_embedding) as distance
+FROM issues i
+WHERE (
+        i.user_id = user_id_filter
+        OR i.team_id = ANY(team_ids_filter)
+    )
+    AND (i.embedding <=> query_embedding) < match_threshold
+    AND (
+        language_filter IS NULL
+        OR i.language = ANY(language_filter)
+    )
+    AND (
+        severity_filter IS NULL
+        OR i.severity = ANY(severity_filter)
+    )
+    AND (
+        status_filter IS NULL
+        OR i.status = ANY(status_filter)
+    )
+    AND (
+        tags_filter IS NULL
+        OR i.tags && tags_filter
+    )
+    AND (
+        created_after IS NULL
+        OR i.created_at >= created_after
+    )
+    AND (
+        created_before IS NULL
+        OR i.created_at <= created_before
+    )
+ORDER BY distance
+LIMIT match_count
+) -- relaxed_order may return rows slightly out of order: sort them again
+SELECT *
+FROM candidates c
+ORDER BY c.distance;
+END;
+$$;
+-- Full-text search with ranking and highlighted snippets
+DROP FUNCTION IF EXISTS search_issues_fulltext(text, uuid, int);
+DROP FUNCTION IF EXISTS search_issues_fulltext(text, uuid, int, text [], text [], text [], text [], timestamp, timestamp);
+CREATE OR REPLACE FUNCTION search_issues_fulltext(
+        query_text text,
+        user_id_filter uuid,
+        match_count int,
+        language_filter text [] DEFAULT NULL,
+        severity_filter text [] DEFAULT NULL,
+        status_filter text [] DEFAULT NULL,
+        tags_filter text [] DEFAULT NULL,
+        created_after timestamp DEFAULT NULL,
+        created_before timestamp DEFAULT NULL,
+        team_ids_filter uuid [] DEFAULT NULL
+    ) RETURNS TABLE (
+        id uuid,
+        user_id uuid,
+        error_type varchar,
+        error_message text,
+        language varchar,
+        framework varchar,
+        tags text [],
+        severity varchar,
+        status varchar,
+        occurrences integer,
+        created_at timestamp,
+        rank float,
+        snippet text
+    ) LANGUAGE sql STABLE AS $$ WITH q AS (
+        SELECT websearch_to_tsquery('english', query_text) || websearch_to_tsquery('simple', query_text) AS query
+    )
+SELECT i.id,
+    i.user_id,
+    i.error_type,
+    i.error_message,
+    i.language,
+    i.framework,
+    i.tags,
+    i.severity,
+    i.status,
+    i.occurrences,
+    i.created_at,
+    ts_rank_cd(i.search_vector, q.query)::float AS rank,
+    ts_headline(
+        'english',
+        i.error_message || ' ' || coalesce(left(i.stack_trace, 2000), ''),
+        q.query,
+        'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8'
+    ) AS snippet
+FROM issues i,
+    q
+WHERE (
+        i.user_id = user_id_filter
+        OR i.team_id = ANY(team_ids_filter)
+    )
+    AND i.search_vector @@ q.query
+    AND (
+        language_filter IS NULL
+        OR i.language = ANY(language_filter)
+    )
+    AND (
+        severity_filter IS NULL
+        OR i.severity = ANY(severity_filter)
+    )
+    AND (
+        status_filter IS NULL
+        OR i.status = ANY(status_filter)
+    )
+    AND (
+        tags_filter IS NULL
+        OR i.tags && tags_filter
+    )
+    AND (
+        created_after IS NULL
+        OR i.created_at >= created_after
+    )
+    AND (
+        created_before IS NULL
+        OR i.created_at <= created_before
+    )
+ORDER BY rank DESC
+LIMIT match_count;
+$$;
@@ -0,0 +1,179 @@
+-- Migration 008: faster RLS policies
+-- Replaces per-row auth.uid() calls and nested-RLS subqueries with helper
+-- functions evaluated once per statement. Access rules are unchanged
+-- (team_members_select_policy, added in migration 007, is recreated as is).
+-- Benchmark: database/benchmarks/rls_policies.sql
+DROP POLICY IF EXISTS team_members_select_policy ON team_members;
+DROP POLICY IF EXISTS issues_select_policy ON issues;
+DROP POLICY IF EXISTS issues_insert_policy ON issues;
+DROP POLICY IF EXISTS issues_update_policy ON issues;
+DROP POLICY IF EXISTS issues_delete_policy ON issues;
+DROP POLICY IF EXISTS solutions_select_policy ON solutions;
+DROP POLICY IF EXISTS solutions_insert_policy ON solutions;
+DROP POLICY IF EXISTS solutions_update_policy ON solutions;
+DROP POLICY IF EXISTS solutions_delete_policy ON solutions;
+DROP POLICY IF EXISTS solution_feedback_select_policy ON solution_feedback;
+DROP POLICY IF EXISTS solution_feedback_insert_policy ON solution_feedback;
+DROP POLICY IF EXISTS solution_feedback_update_policy ON solution_feedback;
+DROP POLICY IF EXISTS error_occurrences_select_policy ON error_occurrences;
+DROP POLICY IF EXISTS error_occurrences_insert_policy ON error_occurrences;
+DROP POLICY IF EXISTS "Users can view comments on their issues" ON comments;
+DROP POLICY IF EXISTS "Users can create comments on their issues" ON comments;
+DROP POLICY IF EXISTS "Users can update their own comments" ON comments;
+DROP POLICY IF EXISTS "Users can delete their own comments" ON comments;
+-- RLS helper functions
+-- Policies call these wrapped in (SELECT ...), so each runs once per statement
+-- as an InitPlan instead of once per row. SECURITY DEFINER lets them read
+-- team_members/issues without re-entering those tables' own policies. They live
+-- in a private schema so PostgREST does not expose them as RPCs.
+CREATE SCHEMA IF NOT EXISTS private;
+GRANT USAGE ON SCHEMA private TO authenticated;
+CREATE OR REPLACE FUNCTION private.user_team_ids() RETURNS uuid [] LANGUAGE sql STABLE SECURITY DEFINER
+SET search_path = '' AS $$
+SELECT coalesce(array_agg(team_id), '{}')
+FROM public.team_members
+WHERE user_id = (
+        SELECT auth.uid()
+    );
+$$;
+CREATE OR REPLACE FUNCTION private.user_admin_team_ids() RETURNS uuid [] LANGUAGE sql STABLE SECURITY DEFINER
+SET search_path = '' AS $$
+SELECT coalesce(array_agg(team_id), '{}')
+FROM public.team_members
+WHERE user_id = (
+        SELECT auth.uid()
+    )
+    AND role IN ('admin', 'owner');
+$$;
+CREATE OR REPLACE FUNCTION private.user_issue_ids() RETURNS SETOF uuid LANGUAGE sql STABLE SECURITY DEFINER
+SET search_path = '' AS $$
+SELECT id
+FROM public.issues
+WHERE user_id = (
+        SELECT auth.uid()
+    );
+$$;
+-- Supporting indexes: membership lookup by user, and an index-only scan for user_issue_ids()
+CREATE INDEX IF NOT EXISTS idx_team_members_user_id ON team_members(user_id) INCLUDE (team_id, role);
+CREATE INDEX IF NOT EXISTS idx_issues_user_id_id ON issues(user_id, id);
+-- RLS Policies for team_members (users see their own memberships; used by team-scoped search)
+CREATE POLICY team_members_select_policy ON team_members FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+-- RLS Policies for issues
+CREATE POLICY issues_select_policy ON issues FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+        OR team_id = ANY (
+            (
+                SELECT private.user_team_ids()
+            )
+        )
+    );
+CREATE POLICY issues_insert_policy ON issues FOR
+INSERT WITH CHECK (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+CREATE POLICY issues_update_policy ON issues FOR
+UPDATE USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+        OR team_id = ANY (
+            (
+                SELECT private.user_admin_team_ids()
+            )
+        )
+    );
+CREATE POLICY issues_delete_policy ON issues FOR DELETE USING (
+    user_id = (
+        SELECT auth.uid()
+    )
+);
+-- RLS Policies for solutions
+CREATE POLICY solutions_select_policy ON solutions FOR
+SELECT USING (
+        issue_id IN (
+            SELECT private.user_issue_ids()
+        )
+    );
+CREATE POLICY solutions_insert_policy ON solutions FOR
+INSERT WITH CHECK (
+        created_by = (
+            SELECT auth.uid()
+        )
+    );
+CREATE POLICY solutions_update_policy ON solutions FOR
+UPDATE USING (
+        created_by = (
+            SELECT auth.uid()
+        )
+    );
+CREATE POLICY solutions_delete_policy ON solutions FOR DELETE USING (
+    created_by = (
+        SELECT auth.uid()
+    )
+);
+-- RLS Policies for solution_feedback
+CREATE POLICY solution_feedback_select_policy ON solution_feedback FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+CREATE POLICY solution_feedback_insert_policy ON solution_feedback FOR
+INSERT WITH CHECK (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+CREATE POLICY solution_feedback_update_policy ON solution_feedback FOR
+UPDATE USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+-- RLS Policies for error_occurrences
+CREATE POLICY error_occurrences_select_policy ON error_occurrences FOR
+SELECT USING (
+        issue_id IN (
+            SELECT private.user_issue_ids()
+        )
+    );
+CREATE POLICY error_occurrences_insert_policy ON error_occurrences FOR
+INSERT WITH CHECK (
+        issue_id IN (
+            SELECT private.user_issue_ids()
+        )
+    );
+-- RLS Policies for comments
+CREATE POLICY "Users can view comments on their issues" ON comments FOR
+SELECT USING (
+        issue_id IN (
+            SELECT private.user_issue_ids()
+        )
+    );
+CREATE POLICY "Users can create comments on their issues" ON comments FOR
+INSERT WITH CHECK (
+        issue_id IN (
+            SELECT private.user_issue_ids()
+        )
+    );
+CREATE POLICY "Users can update their own comments" ON comments FOR
+UPDATE USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+CREATE POLICY "Users can delete their own comments" ON comments FOR DELETE USING (
+    user_id = (
+        SELECT auth.uid()
+    )
+);
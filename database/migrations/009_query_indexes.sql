@@ -0,0 +1,15 @@
+-- Migration 009: composite and partial indexes matching the issue list queries
+-- Replaces single-column indexes that forced sorts or bitmap merges; the
+-- dropped ones are prefixes of the new indexes or never used alone.
+-- Verify plans with database/checks/query_plans.sql.
+CREATE INDEX IF NOT EXISTS idx_issues_user_created ON issues(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_issues_user_status_created ON issues(user_id, status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_issues_user_severity_created ON issues(user_id, severity, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_issues_user_open ON issues(user_id, severity, created_at DESC)
+WHERE status = 'open';
+CREATE INDEX IF NOT EXISTS idx_issues_user_recurring ON issues(user_id, severity, created_at DESC)
+WHERE status = 'recurring';
+DROP INDEX IF EXISTS idx_issues_user_id;
+DROP INDEX IF EXISTS idx_issues_status;
+DROP INDEX IF EXISTS idx_issues_severity;
+DROP INDEX IF EXISTS idx_issues_created_at;
@@ -0,0 +1,5 @@
+-- Migration 010: keyset pagination for issue lists
+-- GET /api/v1/issues pages by (created_at, id); with id in the index each page
+-- is an index seek past the cursor, with no sort on created_at ties.
+DROP INDEX IF EXISTS idx_issues_user_created;
+CREATE INDEX IF NOT EXISTS idx_issues_user_created ON issues(user_id, created_at DESC, id DESC);
@@ -0,0 +1,109 @@
+-- Migration 011: truncated stack_trace / code_snippet previews for list views
+-- Issue lists and search results select these instead of the full text columns.
+-- Truncated text for list views, selectable through PostgREST as computed
+-- columns (e.g. select=stack_trace:stack_trace_preview)
+CREATE OR REPLACE FUNCTION stack_trace_preview(issues) RETURNS text LANGUAGE sql IMMUTABLE AS $$
+SELECT CASE
+        WHEN length($1.stack_trace) > 500 THEN left($1.stack_trace, 500) || '…'
+        ELSE $1.stack_trace
+    END $$;
+CREATE OR REPLACE FUNCTION code_snippet_preview(issues) RETURNS text LANGUAGE sql IMMUTABLE AS $$
+SELECT CASE
+        WHEN length($1.code_snippet) > 500 THEN left($1.code_snippet, 500) || '…'
+        ELSE $1.code_snippet
+    END $$;
+-- Semantic search results carry the preview too (same as lexical hits and lists)
+CREATE OR REPLACE FUNCTION match_issues(
+        query_embedding vector(384),
+        match_threshold float,
+        match_count int,
+        user_id_filter uuid,
+        language_filter text [] DEFAULT NULL,
+        severity_filter text [] DEFAULT NULL,
+        status_filter text [] DEFAULT NULL,
+        tags_filter text [] DEFAULT NULL,
+        created_after timestamp DEFAULT NULL,
+        created_before timestamp DEFAULT NULL,
+        ef_search int DEFAULT NULL,
+        team_ids_filter uuid [] DEFAULT NULL
+    ) RETURNS TABLE (
+        id uuid,
+        user_id uuid,
+        error_type varchar,
+        error_message text,
+        stack_trace text,
+        language varchar,
+        framework varchar,
+        tags text [],
+        severity varchar,
+        status varchar,
+        occurrences integer,
+        created_at timestamp,
+        distance float
+    ) LANGUAGE plpgsql AS $$ BEGIN IF ef_search IS NOT NULL THEN PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+PERFORM set_config(
+    'ivfflat.probes',
+    greatest(1, ef_search / 10)::text,
+    true
+);
+END IF;
+-- Keep walking the HNSW graph until match_count rows pass the tenant and filter
+-- predicates, instead of filtering only the first ef_search candidates
+-- (pgvector >= 0.8; older versions reject the setting and keep the plain scan)
+BEGIN PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+EXCEPTION
+WHEN undefined_object
+OR invalid_name THEN NULL;
+END;
+RETURN QUERY WITH candidates AS MATERIALIZED (
+    SELECT i.id,
+    i.user_id,
+    i.error_type,
+    i.error_message,
+    stack_trace_preview(i) AS stack_trace,
+    i.language,
+    i.framework,
+    i.tags,
+    i.severity,
+    i.status,
+    i.occurrences,
+    i.created_at,
+    (i.embedding <=> query_embedding) as distance
+FROM issues i
+WHERE (
+        i.user_id = user_id_filter
+        OR i.team_id = ANY(team_ids_filter)
+    )
+    AND (i.embedding <=> query_embedding) < match_threshold
+    AND (
+        language_filter IS NULL
+        OR i.language = ANY(language_filter)
+    )
+    AND (
+        severity_filter IS NULL
+        OR i.severity = ANY(severity_filter)
+    )
+    AND (
+        status_filter IS NULL
+        OR i.status = ANY(status_filter)
+    )
+    AND (
+        tags_filter IS NULL
+        OR i.tags && tags_filter
+    )
+    AND (
+        created_after IS NULL
+        OR i.created_at >= created_after
+    )
+    AND (
+        created_before IS NULL
+        OR i.created_at <= created_before
+    )
+ORDER BY distance
+LIMIT match_count
+) -- relaxed_order may return rows slightly out of order: sort them again
+SELECT *
+FROM candidates c
+ORDER BY c.distance;
+END;
+$$;
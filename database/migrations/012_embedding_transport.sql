@@ -0,0 +1,7 @@
+-- Migration 012: compact binary embedding reads
+-- The Python similarity fallback selects embedding:embedding_b64 instead of the
+-- JSON text form of the vector.
+-- Embedding as base64 vector_send() bytes (dims, unused, big-endian float32s):
+-- about a quarter of the JSON text size, decoded with NumPy without parsing floats
+CREATE OR REPLACE FUNCTION embedding_b64(issues) RETURNS text LANGUAGE sql IMMUTABLE AS $$
+SELECT encode(vector_send($1.embedding), 'base64') $$;
@@ -0,0 +1,77 @@
+-- Migration 013: grouped issue counts for analytics breakdowns
+-- GET /api/v1/analytics/breakdown and the language distribution call this
+-- instead of counting full rows in Python.
+-- Grouped issue counts for analytics breakdowns: top_n values by count, then one
+-- is_other row summing the rest (top_n NULL = every value). dimension is one of
+-- language, framework, environment, os, error_type, severity, status or tag
+-- (an issue counts once per tag); missing values group as 'Unknown'.
+CREATE OR REPLACE FUNCTION issue_group_counts(
+        user_id_filter uuid,
+        dimension text,
+        top_n int DEFAULT NULL,
+        status_filter text [] DEFAULT NULL,
+        created_after timestamp DEFAULT NULL,
+        created_before timestamp DEFAULT NULL
+    ) RETURNS TABLE (
+        value text,
+        count bigint,
+        is_other boolean
+    ) LANGUAGE sql STABLE AS $$ WITH grouped AS (
+        SELECT coalesce(d.value, 'Unknown') AS value,
+            count(*) AS count
+        FROM issues i
+            CROSS JOIN LATERAL unnest(
+                CASE
+                    WHEN dimension = 'tag' THEN i.tags
+                    ELSE ARRAY [CASE dimension
+                        WHEN 'language' THEN i.language
+                        WHEN 'framework' THEN i.framework
+                        WHEN 'environment' THEN i.environment
+                        WHEN 'os' THEN i.os
+                        WHEN 'error_type' THEN i.error_type
+                        WHEN 'severity' THEN i.severity
+                        WHEN 'status' THEN i.status
+                    END::text]
+                END
+            ) AS d(value)
+        WHERE i.user_id = user_id_filter
+            AND (
+                status_filter IS NULL
+                OR i.status = ANY(status_filter)
+            )
+            AND (
+                created_after IS NULL
+                OR i.created_at >= created_after
+            )
+            AND (
+                created_before IS NULL
+                OR i.created_at <= created_before
+            )
+        GROUP BY 1
+    ),
+    ranked AS (
+        SELECT value,
+            count,
+            row_number() OVER (
+                ORDER BY count DESC,
+                    value
+            ) AS position
+        FROM grouped
+    )
+SELECT value,
+    count,
+    false AS is_other
+FROM ranked
+WHERE top_n IS NULL
+    OR position <= top_n
+UNION ALL
+SELECT NULL,
+    sum(count)::bigint,
+    true
+FROM ranked
+WHERE position > top_n
+HAVING count(*) > 0
+ORDER BY is_other,
+    count DESC,
+    value;
+$$;
@@ -0,0 +1,18 @@
+-- Migration 014: persisted occurrence sketches for GET /api/v1/analytics/approximate
+-- Streaming occurrence sketches (Space-Saving top-K, HyperLogLog distinct counts),
+-- one row per user per UTC day. Written by the API's periodic flush with the
+-- service role; users can only read their own rows.
+CREATE TABLE IF NOT EXISTS analytics_sketches (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    bucket DATE NOT NULL,
+    state JSONB NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, bucket)
+);
+ALTER TABLE analytics_sketches ENABLE ROW LEVEL SECURITY;
+CREATE POLICY analytics_sketches_select_policy ON analytics_sketches FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
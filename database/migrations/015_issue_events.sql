@@ -0,0 +1,20 @@
+-- Migration 015: spike and regression events for recurring issues
+-- Spike and regression events from the API's occurrence detector, inserted in
+-- bulk with the service role; users read events for their own issues.
+CREATE TABLE IF NOT EXISTS issue_events (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    issue_id UUID NOT NULL REFERENCES issues(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('spike', 'regression')),
+    details JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_issue_events_user_created ON issue_events(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_issue_events_issue_id ON issue_events(issue_id);
+ALTER TABLE issue_events ENABLE ROW LEVEL SECURITY;
+CREATE POLICY issue_events_select_policy ON issue_events FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
@@ -0,0 +1,106 @@
+-- Migration 016: resolution timestamps and incremental MTTR aggregates
+ALTER TABLE issues
+ADD COLUMN IF NOT EXISTS resolved_at TIMESTAMP;
+-- Incremental time-to-resolution aggregates per user, error type and severity:
+-- count, total seconds and a log2 histogram (bucket i counts durations in
+-- [2^i, 2^(i+1)) seconds, bucket 0 also holds anything under a second), so MTTR
+-- and percentiles never scan the issue history.
+CREATE TABLE IF NOT EXISTS resolution_stats (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    error_type VARCHAR(100) NOT NULL,
+    severity VARCHAR(20) NOT NULL,
+    resolved_count BIGINT NOT NULL DEFAULT 0,
+    total_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    histogram BIGINT [] NOT NULL DEFAULT array_fill(0::bigint, ARRAY [32]),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, error_type, severity)
+);
+ALTER TABLE resolution_stats ENABLE ROW LEVEL SECURITY;
+CREATE POLICY resolution_stats_select_policy ON resolution_stats FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+-- Add n resolutions of the same duration to the aggregates (runs with the caller's
+-- rights: only record_resolution and migrations, which own the table, can write)
+CREATE OR REPLACE FUNCTION private.add_resolution(
+        p_user_id uuid,
+        p_error_type text,
+        p_severity text,
+        p_seconds float8,
+        p_count bigint DEFAULT 1
+    ) RETURNS void LANGUAGE plpgsql
+SET search_path = '' AS $$
+DECLARE bucket int := least(floor(log(2, greatest(p_seconds, 1)::numeric))::int, 31) + 1;
+BEGIN p_severity := coalesce(p_severity, 'medium');
+INSERT INTO public.resolution_stats (user_id, error_type, severity)
+VALUES (p_user_id, p_error_type, p_severity) ON CONFLICT DO NOTHING;
+UPDATE public.resolution_stats s
+SET resolved_count = s.resolved_count + p_count,
+    total_seconds = s.total_seconds + p_seconds * p_count,
+    histogram [bucket] = s.histogram [bucket] + p_count,
+    updated_at = now()
+WHERE s.user_id = p_user_id
+    AND s.error_type = p_error_type
+    AND s.severity = p_severity;
+END;
+$$;
+-- Stamp resolved_at on the caller's newly resolved issues and add their time to
+-- resolution (first occurrence to now) to resolution_stats. Issues already
+-- stamped are skipped, so calling it twice never double counts; reopening an
+-- issue clears resolved_at so its next resolution counts again.
+CREATE OR REPLACE FUNCTION record_resolution(issue_ids uuid []) RETURNS TABLE (issue_id uuid, resolved_at timestamp) LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = '' AS $$
+#variable_conflict use_column
+DECLARE r record;
+BEGIN FOR r IN
+UPDATE public.issues i
+SET resolved_at = timezone('utc', now())
+WHERE i.id = ANY(issue_ids)
+    AND i.user_id = (
+        SELECT auth.uid()
+    )
+    AND i.status = 'resolved'
+    AND i.resolved_at IS NULL
+RETURNING i.id,
+    i.user_id,
+    i.error_type,
+    i.severity,
+    i.resolved_at,
+    greatest(
+        extract(
+            epoch
+            FROM i.resolved_at - coalesce(i.first_occurred_at, i.created_at)
+        ),
+        0
+    )::float8 AS seconds LOOP PERFORM private.add_resolution(r.user_id, r.error_type, r.severity, r.seconds);
+issue_id := r.id;
+resolved_at := r.resolved_at;
+RETURN NEXT;
+END LOOP;
+END;
+$$;
+-- Backfill: issues resolved before this migration count as resolved at their last
+-- update (the closest recorded time)
+UPDATE issues
+SET resolved_at = updated_at
+WHERE status = 'resolved'
+    AND resolved_at IS NULL;
+DO $$
+DECLARE r record;
+BEGIN FOR r IN
+SELECT user_id,
+    error_type,
+    severity,
+    greatest(
+        extract(
+            epoch
+            FROM resolved_at - coalesce(first_occurred_at, created_at)
+        ),
+        0
+    )::float8 AS seconds
+FROM issues
+WHERE status = 'resolved' LOOP PERFORM private.add_resolution(r.user_id, r.error_type, r.severity, r.seconds);
+END LOOP;
+END $$;
@@ -0,0 +1,5 @@
+-- Migration 017: optimistic versions for analytics_sketches
+-- Bumped on every write; flushes update a row only at the version they merged,
+-- so concurrent flushes (several API processes) no longer overwrite each other
+ALTER TABLE analytics_sketches
+ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0;
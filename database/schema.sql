@@ -51,9 +51,20 @@ CREATE TABLE IF NOT EXISTS issues (
     occurrences INTEGER DEFAULT 1,
     first_occurred_at TIMESTAMP DEFAULT NOW(),
     last_occurred_at TIMESTAMP DEFAULT NOW(),
+    -- Set by record_resolution when the issue is resolved, cleared when reopened
+    resolved_at TIMESTAMP,
     -- ML Fields
     embedding vector(384),
     embedding_text TEXT,
+    fingerprint VARCHAR(64),
+    -- Parsed stack frames (innermost first), their "module:function" signatures and file names
+    stack_frames JSONB,
+    frame_signatures TEXT [],
+    frame_files TEXT [],
+    -- Full-text search document (error type and stack unstemmed, prose stemmed)
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(error_type, '')), 'A') || setweight(to_tsvector('english', coalesce(error_message, '')), 'B') || setweight(to_tsvector('simple', coalesce(stack_trace, '')), 'C') || setweight(to_tsvector('english', coalesce(embedding_text, '')), 'D')
+    ) STORED,
     -- Audit
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW(),
@@ -111,16 +122,29 @@ CREATE TABLE IF NOT EXISTS error_occurrences (
     resolved_with_solution_id UUID REFERENCES solutions(id)
 );
 -- Create indexes
-CREATE INDEX IF NOT EXISTS idx_issues_user_id ON issues(user_id);
 CREATE INDEX IF NOT EXISTS idx_issues_team_id ON issues(team_id);
 CREATE INDEX IF NOT EXISTS idx_issues_error_type ON issues(error_type);
 CREATE INDEX IF NOT EXISTS idx_issues_language ON issues(language);
-CREATE INDEX IF NOT EXISTS idx_issues_status ON issues(status);
-CREATE INDEX IF NOT EXISTS idx_issues_severity ON issues(severity);
 CREATE INDEX IF NOT EXISTS idx_issues_tags ON issues USING GIN(tags);
-CREATE INDEX IF NOT EXISTS idx_issues_created_at ON issues(created_at DESC);
--- Vector similarity search index (IVFFlat)
-CREATE INDEX IF NOT EXISTS idx_issues_embedding ON issues USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+-- Issue lists: every query filters on user_id (optionally status/severity) and
+-- pages by created_at, so these return rows in order without a sort (id breaks
+-- ties for keyset pagination on (created_at, id))
+CREATE INDEX IF NOT EXISTS idx_issues_user_created ON issues(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_issues_user_status_created ON issues(user_id, status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_issues_user_severity_created ON issues(user_id, severity, created_at DESC);
+-- Triage views (open or recurring issues by severity) stay small as issues get resolved
+CREATE INDEX IF NOT EXISTS idx_issues_user_open ON issues(user_id, severity, created_at DESC)
+WHERE status = 'open';
+CREATE INDEX IF NOT EXISTS idx_issues_user_recurring ON issues(user_id, severity, created_at DESC)
+WHERE status = 'recurring';
+-- Exact-duplicate lookup by normalized fingerprint
+CREATE INDEX IF NOT EXISTS idx_issues_user_fingerprint ON issues(user_id, fingerprint);
+-- Frame-level inverted index: issues passing through a given function
+CREATE INDEX IF NOT EXISTS idx_issues_frame_signatures ON issues USING GIN(frame_signatures);
+CREATE INDEX IF NOT EXISTS idx_issues_frame_files ON issues USING GIN(frame_files);
+CREATE INDEX IF NOT EXISTS idx_issues_search_vector ON issues USING GIN(search_vector);
+-- Vector similarity search index (HNSW; recall/latency tuned per query via match_issues ef_search)
+CREATE INDEX IF NOT EXISTS idx_issues_embedding_hnsw ON issues USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
 CREATE INDEX IF NOT EXISTS idx_solutions_issue_id ON solutions(issue_id);
 CREATE INDEX IF NOT EXISTS idx_solutions_created_by ON solutions(created_by);
 CREATE INDEX IF NOT EXISTS idx_solutions_effectiveness ON solutions(effectiveness_score DESC);
@@ -128,6 +152,22 @@ CREATE INDEX IF NOT EXISTS idx_solutions_verified ON solutions(verified);
 CREATE INDEX IF NOT EXISTS idx_solution_feedback_solution_id ON solution_feedback(solution_id);
 CREATE INDEX IF NOT EXISTS idx_error_occurrences_issue_id ON error_occurrences(issue_id);
 CREATE INDEX IF NOT EXISTS idx_error_occurrences_occurred_at ON error_occurrences(occurred_at DESC);
+-- Truncated text for list views, selectable through PostgREST as computed
+-- columns (e.g. select=stack_trace:stack_trace_preview)
+CREATE OR REPLACE FUNCTION stack_trace_preview(issues) RETURNS text LANGUAGE sql IMMUTABLE AS $$
+SELECT CASE
+        WHEN length($1.stack_trace) > 500 THEN left($1.stack_trace, 500) || '…'
+        ELSE $1.stack_trace
+    END $$;
+CREATE OR REPLACE FUNCTION code_snippet_preview(issues) RETURNS text LANGUAGE sql IMMUTABLE AS $$
+SELECT CASE
+        WHEN length($1.code_snippet) > 500 THEN left($1.code_snippet, 500) || '…'
+        ELSE $1.code_snippet
+    END $$;
+-- Embedding as base64 vector_send() bytes (dims, unused, big-endian float32s):
+-- about a quarter of the JSON text size, decoded with NumPy without parsing floats
+CREATE OR REPLACE FUNCTION embedding_b64(issues) RETURNS text LANGUAGE sql IMMUTABLE AS $$
+SELECT encode(vector_send($1.embedding), 'base64') $$;
 -- Enable Row Level Security
 ALTER TABLE issues ENABLE ROW LEVEL SECURITY;
 ALTER TABLE solutions ENABLE ROW LEVEL SECURITY;
@@ -135,73 +175,162 @@ ALTER TABLE teams ENABLE ROW LEVEL SECURITY;
 ALTER TABLE team_members ENABLE ROW LEVEL SECURITY;
 ALTER TABLE solution_feedback ENABLE ROW LEVEL SECURITY;
 ALTER TABLE error_occurrences ENABLE ROW LEVEL SECURITY;
+-- RLS helper functions
+-- Policies call these wrapped in (SELECT ...), so each runs once per statement
+-- as an InitPlan instead of once per row. SECURITY DEFINER lets them read
+-- team_members/issues without re-entering those tables' own policies. They live
+-- in a private schema so PostgREST does not expose them as RPCs.
+CREATE SCHEMA IF NOT EXISTS private;
+GRANT USAGE ON SCHEMA private TO authenticated;
+CREATE OR REPLACE FUNCTION private.user_team_ids() RETURNS uuid [] LANGUAGE sql STABLE SECURITY DEFINER
+SET search_path = '' AS $$
+SELECT coalesce(array_agg(team_id), '{}')
+FROM public.team_members
+WHERE user_id = (
+        SELECT auth.uid()
+    );
+$$;
+CREATE OR REPLACE FUNCTION private.user_admin_team_ids() RETURNS uuid [] LANGUAGE sql STABLE SECURITY DEFINER
+SET search_path = '' AS $$
+SELECT coalesce(array_agg(team_id), '{}')
+FROM public.team_members
+WHERE user_id = (
+        SELECT auth.uid()
+    )
+    AND role IN ('admin', 'owner');
+$$;
+CREATE OR REPLACE FUNCTION private.user_issue_ids() RETURNS SETOF uuid LANGUAGE sql STABLE SECURITY DEFINER
+SET search_path = '' AS $$
+SELECT id
+FROM public.issues
+WHERE user_id = (
+        SELECT auth.uid()
+    );
+$$;
+-- Supporting indexes: membership lookup by user, and an index-only scan for user_issue_ids()
+CREATE INDEX IF NOT EXISTS idx_team_members_user_id ON team_members(user_id) INCLUDE (team_id, role);
+CREATE INDEX IF NOT EXISTS idx_issues_user_id_id ON issues(user_id, id);
+-- RLS Policies for team_members (users see their own memberships; used by team-scoped search)
+CREATE POLICY team_members_select_policy ON team_members FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
 -- RLS Policies for issues
 CREATE POLICY issues_select_policy ON issues FOR
 SELECT USING (
-        user_id = auth.uid()
-        OR team_id IN (
-            SELECT team_id
-            FROM team_members
-            WHERE user_id = auth.uid()
+        user_id = (
+            SELECT auth.uid()
+        )
+        OR team_id = ANY (
+            (
+                SELECT private.user_team_ids()
+            )
         )
     );
 CREATE POLICY issues_insert_policy ON issues FOR
-INSERT WITH CHECK (user_id = auth.uid());
+INSERT WITH CHECK (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
 CREATE POLICY issues_update_policy ON issues FOR
 UPDATE USING (
-        user_id = auth.uid()
-        OR team_id IN (
-            SELECT team_id
-            FROM team_members
-            WHERE user_id = auth.uid()
-                AND role IN ('admin', 'owner')
+        user_id = (
+            SELECT auth.uid()
+        )
+        OR team_id = ANY (
+            (
+                SELECT private.user_admin_team_ids()
+            )
         )
     );
-CREATE POLICY issues_delete_policy ON issues FOR DELETE USING (user_id = auth.uid());
+CREATE POLICY issues_delete_policy ON issues FOR DELETE USING (
+    user_id = (
+        SELECT auth.uid()
+    )
+);
 -- RLS Policies for solutions
 CREATE POLICY solutions_select_policy ON solutions FOR
 SELECT USING (
         issue_id IN (
-            SELECT id
-            FROM issues
-            WHERE user_id = auth.uid()
+            SELECT private.user_issue_ids()
         )
     );
 CREATE POLICY solutions_insert_policy ON solutions FOR
-INSERT WITH CHECK (created_by = auth.uid());
+INSERT WITH CHECK (
+        created_by = (
+            SELECT auth.uid()
+        )
+    );
 CREATE POLICY solutions_update_policy ON solutions FOR
-UPDATE USING (created_by = auth.uid());
-CREATE POLICY solutions_delete_policy ON solutions FOR DELETE USING (created_by = auth.uid());
+UPDATE USING (
+        created_by = (
+            SELECT auth.uid()
+        )
+    );
+CREATE POLICY solutions_delete_policy ON solutions FOR DELETE USING (
+    created_by = (
+        SELECT auth.uid()
+    )
+);
 -- RLS Policies for solution_feedback
 CREATE POLICY solution_feedback_select_policy ON solution_feedback FOR
-SELECT USING (user_id = auth.uid());
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
 CREATE POLICY solution_feedback_insert_policy ON solution_feedback FOR
-INSERT WITH CHECK (user_id = auth.uid());
+INSERT WITH CHECK (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
 CREATE POLICY solution_feedback_update_policy ON solution_feedback FOR
-UPDATE USING (user_id = auth.uid());
+UPDATE USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
 -- RLS Policies for error_occurrences
 CREATE POLICY error_occurrences_select_policy ON error_occurrences FOR
 SELECT USING (
         issue_id IN (
-            SELECT id
-            FROM issues
-            WHERE user_id = auth.uid()
+            SELECT private.user_issue_ids()
         )
     );
 CREATE POLICY error_occurrences_insert_policy ON error_occurrences FOR
 INSERT WITH CHECK (
         issue_id IN (
-            SELECT id
-            FROM issues
-            WHERE user_id = auth.uid()
+            SELECT private.user_issue_ids()
         )
     );
 -- Create helper function for vector similarity search
+-- Optional filters are applied inside the vector query (NULL = no filter).
+-- ef_search trades recall for latency: it sets hnsw.ef_search for this query
+-- (pgvector default 40) and, on ivfflat deployments, ivfflat.probes = ef_search / 10.
+-- With pgvector >= 0.8 the HNSW scan is iterative, so tenant scoping and filters
+-- still fill match_count; on older versions raise ef_search when they are selective.
+-- team_ids_filter widens the search to those teams' issues in the same query;
+-- the function runs as the caller, so RLS still limits rows to teams the user is in.
+DROP FUNCTION IF EXISTS match_issues(vector, float, int, uuid);
+DROP FUNCTION IF EXISTS match_issues(vector, float, int, uuid, text [], text [], text [], text [], timestamp, timestamp);
+DROP FUNCTION IF EXISTS match_issues(vector, float, int, uuid, text [], text [], text [], text [], timestamp, timestamp, int);
 CREATE OR REPLACE FUNCTION match_issues(
         query_embedding vector(384),
         match_threshold float,
         match_count int,
-        user_id_filter uuid
+        user_id_filter uuid,
+        language_filter text [] DEFAULT NULL,
+        severity_filter text [] DEFAULT NULL,
+        status_filter text [] DEFAULT NULL,
+        tags_filter text [] DEFAULT NULL,
+        created_after timestamp DEFAULT NULL,
+        created_before timestamp DEFAULT NULL,
+        ef_search int DEFAULT NULL,
+        team_ids_filter uuid [] DEFAULT NULL
     ) RETURNS TABLE (
         id uuid,
         user_id uuid,
@@ -213,28 +342,233 @@ CREATE OR REPLACE FUNCTION match_issues(
         tags text [],
         severity varchar,
         status varchar,
+        occurrences integer,
         created_at timestamp,
         distance float
-    ) LANGUAGE plpgsql AS $$ BEGIN RETURN QUERY
-SELECT i.id,
+    ) LANGUAGE plpgsql AS $$ BEGIN IF ef_search IS NOT NULL THEN PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+PERFORM set_config(
+    'ivfflat.probes',
+    greatest(1, ef_search / 10)::text,
+    true
+);
+END IF;
+-- Keep walking the HNSW graph until match_count rows pass the tenant and filter
+-- predicates, instead of filtering only the first ef_search candidates
+-- (pgvector >= 0.8; older versions reject the setting and keep the plain scan)
+BEGIN PERFORM set_config('hnsw.iterative_scan', 'relaxed_order', true);
+EXCEPTION
+WHEN undefined_object
+OR invalid_name THEN NULL;
+END;
+RETURN QUERY WITH candidates AS MATERIALIZED (
+    SELECT i.id,
     i.user_id,
     i.error_type,
     i.error_message,
-    i.stack_trace,
+    stack_trace_preview(i) AS stack_trace,
     i.language,
     i.framework,
     i.tags,
     i.severity,
     i.status,
+    i.occurrences,
     i.created_at,
     (i.embedding <=> query_embedding) as distance
 FROM issues i
-WHERE i.user_id = user_id_filter
+WHERE (
+        i.user_id = user_id_filter
+        OR i.team_id = ANY(team_ids_filter)
+    )
     AND (i.embedding <=> query_embedding) < match_threshold
+    AND (
+        language_filter IS NULL
+        OR i.language = ANY(language_filter)
+    )
+    AND (
+        severity_filter IS NULL
+        OR i.severity = ANY(severity_filter)
+    )
+    AND (
+        status_filter IS NULL
+        OR i.status = ANY(status_filter)
+    )
+    AND (
+        tags_filter IS NULL
+        OR i.tags && tags_filter
+    )
+    AND (
+        created_after IS NULL
+        OR i.created_at >= created_after
+    )
+    AND (
+        created_before IS NULL
+        OR i.created_at <= created_before
+    )
 ORDER BY distance
-LIMIT match_count;
+LIMIT match_count
+) -- relaxed_order may return rows slightly out of order: sort them again
+SELECT *
+FROM candidates c
+ORDER BY c.distance;
 END;
 $$;
+-- Full-text search with ranking and highlighted snippets
+DROP FUNCTION IF EXISTS search_issues_fulltext(text, uuid, int);
+DROP FUNCTION IF EXISTS search_issues_fulltext(text, uuid, int, text [], text [], text [], text [], timestamp, timestamp);
+CREATE OR REPLACE FUNCTION search_issues_fulltext(
+        query_text text,
+        user_id_filter uuid,
+        match_count int,
+        language_filter text [] DEFAULT NULL,
+        severity_filter text [] DEFAULT NULL,
+        status_filter text [] DEFAULT NULL,
+        tags_filter text [] DEFAULT NULL,
+        created_after timestamp DEFAULT NULL,
+        created_before timestamp DEFAULT NULL,
+        team_ids_filter uuid [] DEFAULT NULL
+    ) RETURNS TABLE (
+        id uuid,
+        user_id uuid,
+        error_type varchar,
+        error_message text,
+        language varchar,
+        framework varchar,
+        tags text [],
+        severity varchar,
+        status varchar,
+        occurrences integer,
+        created_at timestamp,
+        rank float,
+        snippet text
+    ) LANGUAGE sql STABLE AS $$ WITH q AS (
+        SELECT websearch_to_tsquery('english', query_text) || websearch_to_tsquery('simple', query_text) AS query
+    )
+SELECT i.id,
+    i.user_id,
+    i.error_type,
+    i.error_message,
+    i.language,
+    i.framework,
+    i.tags,
+    i.severity,
+    i.status,
+    i.occurrences,
+    i.created_at,
+    ts_rank_cd(i.search_vector, q.query)::float AS rank,
+    ts_headline(
+        'english',
+        i.error_message || ' ' || coalesce(left(i.stack_trace, 2000), ''),
+        q.query,
+        'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8'
+    ) AS snippet
+FROM issues i,
+    q
+WHERE (
+        i.user_id = user_id_filter
+        OR i.team_id = ANY(team_ids_filter)
+    )
+    AND i.search_vector @@ q.query
+    AND (
+        language_filter IS NULL
+        OR i.language = ANY(language_filter)
+    )
+    AND (
+        severity_filter IS NULL
+        OR i.severity = ANY(severity_filter)
+    )
+    AND (
+        status_filter IS NULL
+        OR i.status = ANY(status_filter)
+    )
+    AND (
+        tags_filter IS NULL
+        OR i.tags && tags_filter
+    )
+    AND (
+        created_after IS NULL
+        OR i.created_at >= created_after
+    )
+    AND (
+        created_before IS NULL
+        OR i.created_at <= created_before
+    )
+ORDER BY rank DESC
+LIMIT match_count;
+$$;
+-- Grouped issue counts for analytics breakdowns: top_n values by count, then one
+-- is_other row summing the rest (top_n NULL = every value). dimension is one of
+-- language, framework, environment, os, error_type, severity, status or tag
+-- (an issue counts once per tag); missing values group as 'Unknown'.
+CREATE OR REPLACE FUNCTION issue_group_counts(
+        user_id_filter uuid,
+        dimension text,
+        top_n int DEFAULT NULL,
+        status_filter text [] DEFAULT NULL,
+        created_after timestamp DEFAULT NULL,
+        created_before timestamp DEFAULT NULL
+    ) RETURNS TABLE (
+        value text,
+        count bigint,
+        is_other boolean
+    ) LANGUAGE sql STABLE AS $$ WITH grouped AS (
+        SELECT coalesce(d.value, 'Unknown') AS value,
+            count(*) AS count
+        FROM issues i
+            CROSS JOIN LATERAL unnest(
+                CASE
+                    WHEN dimension = 'tag' THEN i.tags
+                    ELSE ARRAY [CASE dimension
+                        WHEN 'language' THEN i.language
+                        WHEN 'framework' THEN i.framework
+                        WHEN 'environment' THEN i.environment
+                        WHEN 'os' THEN i.os
+                        WHEN 'error_type' THEN i.error_type
+                        WHEN 'severity' THEN i.severity
+                        WHEN 'status' THEN i.status
+                    END::text]
+                END
+            ) AS d(value)
+        WHERE i.user_id = user_id_filter
+            AND (
+                status_filter IS NULL
+                OR i.status = ANY(status_filter)
+            )
+            AND (
+                created_after IS NULL
+                OR i.created_at >= created_after
+            )
+            AND (
+                created_before IS NULL
+                OR i.created_at <= created_before
+            )
+        GROUP BY 1
+    ),
+    ranked AS (
+        SELECT value,
+            count,
+            row_number() OVER (
+                ORDER BY count DESC,
+                    value
+            ) AS position
+        FROM grouped
+    )
+SELECT value,
+    count,
+    false AS is_other
+FROM ranked
+WHERE top_n IS NULL
+    OR position <= top_n
+UNION ALL
+SELECT NULL,
+    sum(count)::bigint,
+    true
+FROM ranked
+WHERE position > top_n
+HAVING count(*) > 0
+ORDER BY is_other,
+    count DESC,
+    value;
+$$;
 -- Comments table for issue discussions
 CREATE TABLE IF NOT EXISTS comments (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -253,19 +587,141 @@ ALTER TABLE comments ENABLE ROW LEVEL SECURITY;
 CREATE POLICY "Users can view comments on their issues" ON comments FOR
 SELECT USING (
         issue_id IN (
-            SELECT id
-            FROM issues
-            WHERE user_id = auth.uid()
+            SELECT private.user_issue_ids()
         )
     );
 CREATE POLICY "Users can create comments on their issues" ON comments FOR
 INSERT WITH CHECK (
         issue_id IN (
-            SELECT id
-            FROM issues
-            WHERE user_id = auth.uid()
+            SELECT private.user_issue_ids()
         )
     );
 CREATE POLICY "Users can update their own comments" ON comments FOR
-UPDATE USING (user_id = auth.uid());
-CREATE POLICY "Users can delete their own comments" ON comments FOR DELETE USING (user_id = auth.uid());
\ No newline at end of file
+UPDATE USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+CREATE POLICY "Users can delete their own comments" ON comments FOR DELETE USING (
+    user_id = (
+        SELECT auth.uid()
+    )
+);
+-- Streaming occurrence sketches (Space-Saving top-K, HyperLogLog distinct counts),
+-- one row per user per UTC day. Written by the API's periodic flush with the
+-- service role; users can only read their own rows.
+CREATE TABLE IF NOT EXISTS analytics_sketches (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    bucket DATE NOT NULL,
+    state JSONB NOT NULL,
+    -- Bumped on every write; flushes update a row only at the version they merged
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, bucket)
+);
+ALTER TABLE analytics_sketches ENABLE ROW LEVEL SECURITY;
+CREATE POLICY analytics_sketches_select_policy ON analytics_sketches FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+-- Spike and regression events from the API's occurrence detector, inserted in
+-- bulk with the service role; users read events for their own issues.
+CREATE TABLE IF NOT EXISTS issue_events (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    issue_id UUID NOT NULL REFERENCES issues(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('spike', 'regression')),
+    details JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_issue_events_user_created ON issue_events(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_issue_events_issue_id ON issue_events(issue_id);
+ALTER TABLE issue_events ENABLE ROW LEVEL SECURITY;
+CREATE POLICY issue_events_select_policy ON issue_events FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+-- Incremental time-to-resolution aggregates per user, error type and severity:
+-- count, total seconds and a log2 histogram (bucket i counts durations in
+-- [2^i, 2^(i+1)) seconds, bucket 0 also holds anything under a second), so MTTR
+-- and percentiles never scan the issue history.
+CREATE TABLE IF NOT EXISTS resolution_stats (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    error_type VARCHAR(100) NOT NULL,
+    severity VARCHAR(20) NOT NULL,
+    resolved_count BIGINT NOT NULL DEFAULT 0,
+    total_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    histogram BIGINT [] NOT NULL DEFAULT array_fill(0::bigint, ARRAY [32]),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, error_type, severity)
+);
+ALTER TABLE resolution_stats ENABLE ROW LEVEL SECURITY;
+CREATE POLICY resolution_stats_select_policy ON resolution_stats FOR
+SELECT USING (
+        user_id = (
+            SELECT auth.uid()
+        )
+    );
+-- Add n resolutions of the same duration to the aggregates (runs with the caller's
+-- rights: only record_resolution and migrations, which own the table, can write)
+CREATE OR REPLACE FUNCTION private.add_resolution(
+        p_user_id uuid,
+        p_error_type text,
+        p_severity text,
+        p_seconds float8,
+        p_count bigint DEFAULT 1
+    ) RETURNS void LANGUAGE plpgsql
+SET search_path = '' AS $$
+DECLARE bucket int := least(floor(log(2, greatest(p_seconds, 1)::numeric))::int, 31) + 1;
+BEGIN p_severity := coalesce(p_severity, 'medium');
+INSERT INTO public.resolution_stats (user_id, error_type, severity)
+VALUES (p_user_id, p_error_type, p_severity) ON CONFLICT DO NOTHING;
+UPDATE public.resolution_stats s
+SET resolved_count = s.resolved_count + p_count,
+    total_seconds = s.total_seconds + p_seconds * p_count,
+    histogram [bucket] = s.histogram [bucket] + p_count,
+    updated_at = now()
+WHERE s.user_id = p_user_id
+    AND s.error_type = p_error_type
+    AND s.severity = p_severity;
+END;
+$$;
+-- Stamp resolved_at on the caller's newly resolved issues and add their time to
+-- resolution (first occurrence to now) to resolution_stats. Issues already
+-- stamped are skipped, so calling it twice never double counts; reopening an
+-- issue clears resolved_at so its next resolution counts again.
+CREATE OR REPLACE FUNCTION record_resolution(issue_ids uuid []) RETURNS TABLE (issue_id uuid, resolved_at timestamp) LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = '' AS $$
+#variable_conflict use_column
+DECLARE r record;
+BEGIN FOR r IN
+UPDATE public.issues i
+SET resolved_at = timezone('utc', now())
+WHERE i.id = ANY(issue_ids)
+    AND i.user_id = (
+        SELECT auth.uid()
+    )
+    AND i.status = 'resolved'
+    AND i.resolved_at IS NULL
+RETURNING i.id,
+    i.user_id,
+    i.error_type,
+    i.severity,
+    i.resolved_at,
+    greatest(
+        extract(
+            epoch
+            FROM i.resolved_at - coalesce(i.first_occurred_at, i.created_at)
+        ),
+        0
+    )::float8 AS seconds LOOP PERFORM private.add_resolution(r.user_id, r.error_type, r.severity, r.seconds);
+issue_id := r.id;
+resolved_at := r.resolved_at;
+RETURN NEXT;
+END LOOP;
+END;
+$$;
@@ -2,7 +2,7 @@
 
 import requests
 import streamlit as st
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from config import API_URL, SESSION_TOKEN_KEY
 
 
@@ -34,23 +34,69 @@ class APIClient:
         response.raise_for_status()
         return response.json()
     
-    def search_issues(self, query: str, threshold: float = 0.7, limit: int = 10) -> List[Dict]:
-        """Search issues"""
+    def search_issues(
+        self,
+        query: str,
+        threshold: float = 0.7,
+        limit: int = 10,
+        mode: str = "auto",
+        filters: Optional[Dict[str, Any]] = None,
+        scope: str = "user"
+    ) -> List[Dict]:
+        """
+        Search issues (mode: auto, semantic, lexical, fulltext or hybrid;
+        scope: user or team)
+        
+        filters may contain language, severity, status, tags (lists) and
+        created_after, created_before (ISO timestamps); they are applied server-side.
+        """
+        params = {"q": query, "threshold": threshold, "limit": limit, "mode": mode, "scope": scope}
+        if filters:
+            params.update({k: v for k, v in filters.items() if v})
+        
         response = self.session.get(
             f"{self.base_url}/api/v1/issues/search",
-            params={"q": query, "threshold": threshold, "limit": limit},
+            params=params,
             headers=self._get_headers()
         )
         response.raise_for_status()
         return response.json()
     
-    def list_issues(self, status: Optional[str] = None, severity: Optional[str] = None) -> List[Dict]:
-        """List all issues"""
-        params = {}
+    def list_issues(
+        self,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> List[Dict]:
+        """List issues, newest first"""
+        return self.list_issues_page(status, severity, limit, offset, cursor)[0]
+    
+    def list_issues_page(
+        self,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        List one page of issues
+        
+        Returns:
+            (issues, next_cursor); pass next_cursor back to get the following
+            page, None when there are no more issues
+        """
+        params = {"limit": limit}
         if status:
             params["status"] = status
         if severity:
             params["severity"] = severity
+        if cursor:
+            params["cursor"] = cursor
+        elif offset:
+            params["offset"] = offset
         
         response = self.session.get(
             f"{self.base_url}/api/v1/issues",
@@ -58,7 +104,7 @@ class APIClient:
             headers=self._get_headers()
         )
         response.raise_for_status()
-        return response.json()
+        return response.json(), response.headers.get("X-Next-Cursor")
     
     def get_issue(self, issue_id: str) -> Dict:
         """Get issue by ID"""
@@ -247,6 +293,29 @@ class APIClient:
         response.raise_for_status()
         return response.json()
     
+    def get_analytics_overview(self, days: int = 7) -> Dict:
+        """Get dashboard stats, trends and language distribution in one request"""
+        response = self.session.get(
+            f"{self.base_url}/api/v1/analytics/overview",
+            params={"days": days},
+            headers=self._get_headers()
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def get_breakdown(self, dimension: str, top: int = 10, status: Optional[List[str]] = None) -> Dict:
+        """Get issue counts grouped by a dimension (language, framework, environment, os, error_type, severity, status, tag)"""
+        params = {"dimension": dimension, "top": top}
+        if status:
+            params["status"] = status
+        response = self.session.get(
+            f"{self.base_url}/api/v1/analytics/breakdown",
+            params=params,
+            headers=self._get_headers()
+        )
+        response.raise_for_status()
+        return response.json()
+    
     def get_trends(self, days: int = 7) -> List[Dict]:
         """Get error trends"""
         response = self.session.get(
@@ -5,6 +5,7 @@ Search Page - Clean Semantic Search Interface
 import streamlit as st
 from api_client import api_client
 from config import SESSION_TOKEN_KEY
+from datetime import datetime, timedelta
 import plotly.graph_objects as go
 
 st.set_page_config(page_title="Search - IssueSense", page_icon="🔍", layout="wide")
@@ -102,6 +103,11 @@ st.markdown("""
         color: #b91c1c;
     }
     
+    .similarity-keyword {
+        background: #dbeafe;
+        color: #1d4ed8;
+    }
+    
     .result-title {
         font-family: 'Inter', sans-serif;
         font-size: 1rem;
@@ -194,16 +200,14 @@ with st.expander("Advanced Filters", expanded=False):
 if query:
     with st.spinner("🧠 Neural network analyzing..."):
         try:
-            results = api_client.search_issues(query, threshold=threshold)
-            
-            # Apply filters
-            if results:
-                if filter_language:
-                    results = [r for r in results if r['issue'].get('language') in filter_language]
-                if filter_severity:
-                    results = [r for r in results if r['issue'].get('severity') in filter_severity]
-                if filter_status != "all":
-                    results = [r for r in results if r['issue'].get('status') == filter_status]
+            # Filters are applied by the backend inside the search query
+            filters = {
+                "language": filter_language,
+                "severity": filter_severity,
+                "status": [filter_status] if filter_status != "all" else None,
+                "created_after": (datetime.utcnow() - timedelta(days=filter_days)).isoformat() if filter_days else None
+            }
+            results = api_client.search_issues(query, threshold=threshold, filters=filters)
             
             if results:
                 st.markdown(f"""
@@ -216,11 +220,15 @@ if query:
                 
                 for idx, item in enumerate(results):
                     issue = item['issue']
-                    similarity = item['similarity']
-                    sim_percent = int(similarity * 100)
+                    similarity = item.get('similarity')
                     
-                    # Determine similarity class
-                    if similarity >= 0.85:
+                    # Determine similarity class (keyword-only hits have a rank, not a similarity)
+                    if similarity is None:
+                        sim_percent = 100
+                        sim_class = "similarity-keyword"
+                        sim_value = "FT" if item.get('match') == 'fulltext' else "KW"
+                        sim_label = "KEYWORD MATCH"
+                    elif similarity >= 0.85:
                         sim_class = "similarity-high"
                         sim_label = "HIGH MATCH"
                     elif similarity >= 0.7:
@@ -229,6 +237,9 @@ if query:
                     else:
                         sim_class = "similarity-low"
                         sim_label = "PARTIAL"
+                    if similarity is not None:
+                        sim_percent = int(similarity * 100)
+                        sim_value = f"{sim_percent}%"
                     
                     severity = issue.get('severity', 'medium')
                     
@@ -240,7 +251,7 @@ if query:
                                 <div class="similarity-ring {sim_class}" style="--percent: {sim_percent}%;">
                                     <div style="background: #0a0a0f; width: 60px; height: 60px; border-radius: 50%; 
                                          display: flex; align-items: center; justify-content: center; flex-direction: column;">
-                                        <span style="font-size: 1rem;">{sim_percent}%</span>
+                                        <span style="font-size: 1rem;">{sim_value}</span>
                                         <span style="font-size: 0.5rem; opacity: 0.7;">{sim_label}</span>
                                     </div>
                                 </div>
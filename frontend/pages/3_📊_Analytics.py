@@ -151,10 +151,10 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 try:
-    # Fetch data
-    stats = api_client.get_dashboard_stats()
-    trends = api_client.get_trends(days=7)
-    languages = api_client.get_language_distribution()
+    # Fetch data (one request for every chart)
+    stats = api_client.get_analytics_overview(days=7)
+    trends = stats['trends']
+    languages = stats['languages']
     
     # Stat Orbs Row
     cols = st.columns(4)